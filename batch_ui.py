@@ -6,11 +6,13 @@ import threading
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, scrolledtext
-from typing import Dict, List, Tuple
+from typing import Dict, List
 
 from edi_parser import (
     ENCODING_DEFAULT,
     OUTPUT_ENCODING_DEFAULT,
+    PARSE_CACHE_DIR_DEFAULT,
+    ClaimParseCache,
     EDIClaimParser,
     export_results,
 )
@@ -24,6 +26,8 @@ class BatchParserUI:
         self.output_var = tk.StringVar(value=str(Path("parsed_output").resolve()))
         self.encoding_var = tk.StringVar(value=ENCODING_DEFAULT)
         self.output_encoding_var = tk.StringVar(value=OUTPUT_ENCODING_DEFAULT)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        self.dedupe_var = tk.BooleanVar(value=True)
         self._build_layout()
 
     def _build_layout(self) -> None:
@@ -39,9 +43,15 @@ class BatchParserUI:
 
         tk.Label(self.root, text="Encoding").grid(row=2, column=0, sticky="e", **padding)
         tk.Entry(self.root, textvariable=self.encoding_var, width=20).grid(row=2, column=1, sticky="w", **padding)
+        tk.Checkbutton(self.root, text="Use parse cache", variable=self.use_cache_var).grid(
+            row=2, column=2, sticky="w", **padding
+        )
 
         tk.Label(self.root, text="CSV encoding").grid(row=3, column=0, sticky="e", **padding)
         tk.Entry(self.root, textvariable=self.output_encoding_var, width=20).grid(row=3, column=1, sticky="w", **padding)
+        tk.Checkbutton(self.root, text="Skip duplicate folders", variable=self.dedupe_var).grid(
+            row=3, column=2, sticky="w", **padding
+        )
 
         self.run_button = tk.Button(self.root, text="Run Batch", command=self._run_batch)
         self.run_button.grid(row=4, column=0, columnspan=3, sticky="ew", padx=8, pady=8)
@@ -94,21 +104,32 @@ class BatchParserUI:
 
     def _execute_batch(self, source: Path, output: Path) -> None:
         try:
-            parser = EDIClaimParser(source, encoding=self.encoding_var.get())
-            claim_dirs = parser.discover_claim_dirs()
-            if not claim_dirs:
+            cache = ClaimParseCache(PARSE_CACHE_DIR_DEFAULT) if self.use_cache_var.get() else None
+            parser = EDIClaimParser(
+                source,
+                encoding=self.encoding_var.get(),
+                cache=cache,
+                dedupe=self.dedupe_var.get(),
+            )
+            discovery = parser.discover()
+            if not discovery.claim_dirs:
                 raise FileNotFoundError("해당 폴더에서 K020/C110 파일을 찾을 수 없습니다.")
-            empty_children = self._find_empty_children(source, claim_dirs)
-            if empty_children:
+            if discovery.empty_children:
                 self._log("추출 대상이 없는 하위 폴더:")
-                for child in empty_children:
+                for child in discovery.empty_children:
                     self._log(f" - {child}")
-            encounters, successes, failures, month_map = parser.parse_with_status()
+            if discovery.duplicates:
+                self._log(f"내용이 동일한 중복 폴더 {len(discovery.duplicates)}개 제외:")
+                for duplicate, original in discovery.duplicates.items():
+                    self._log(f" - {duplicate} (= {original})")
+            encounters, successes, failures, month_map = parser.parse_claim_dirs(discovery.claim_dirs)
             self._log(f"추출 완료 폴더: {len(successes)}개")
             if failures:
                 self._log(f"실패한 폴더: {len(failures)}개")
                 for path, reason in failures.items():
                     self._log(f" - {path}: {reason}")
+            if cache is not None:
+                self._log(f"파싱 캐시: 재사용 {cache.hits}개 폴더, 신규 파싱 {cache.misses}개 폴더")
             self._log("청구월 요약:")
             summary_lines = self._format_month_summary(month_map)
             for line in summary_lines:
@@ -139,27 +160,6 @@ class BatchParserUI:
 
         self.root.after(0, append)
 
-    def _find_empty_children(self, source: Path, claim_dirs: List[Tuple[Path, object]]) -> List[Path]:
-        claim_paths = [path for path, _ in claim_dirs]
-        empty: List[Path] = []
-        try:
-            children = [child for child in source.iterdir() if child.is_dir()]
-        except FileNotFoundError:
-            return empty
-        for child in children:
-            has_claim = any(self._is_subpath(claim_path, child) for claim_path in claim_paths)
-            if not has_claim:
-                empty.append(child)
-        return empty
-
-    @staticmethod
-    def _is_subpath(path: Path, parent: Path) -> bool:
-        try:
-            path.relative_to(parent)
-            return True
-        except ValueError:
-            return False
-
     @staticmethod
     def _format_month_summary(month_map: Dict[str, List[str]]) -> List[str]:
         buckets: Dict[str, List[str]] = {"건보": [], "자보": []}
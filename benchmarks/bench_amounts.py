@@ -0,0 +1,93 @@
+"""Micro-benchmark the K020.3 daily-amount parse/format paths.
+
+Usage example::
+
+    python benchmarks/bench_amounts.py --lines 500000
+
+The script writes a synthetic K020.3 file, slices the 5+2 implied-decimal
+daily amount out of every line and times parsing plus CSV formatting with the
+integer-cents path (``_parse_scaled_int`` / ``_format_scaled_int``) against the
+previous ``Decimal`` divide-and-quantize path.  Both must render identical
+"x.xx" strings.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from edi_parser import ITEM_FIELDS, EDIClaimParser, _format_scaled_int, _parse_scaled_int  # noqa: E402
+
+
+def _decimal_parse(value: str) -> Optional[Decimal]:
+    raw = value.strip()
+    if not raw:
+        return None
+    return (Decimal(raw) / Decimal(100)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def _decimal_format(value: Optional[Decimal]) -> str:
+    if value is None:
+        return ""
+    return format(value.quantize(Decimal("0.01")), ".2f")
+
+
+def write_item_file(path: Path, lines: int, seed: int) -> None:
+    rng = random.Random(seed)
+    with path.open("wb") as handle:
+        for index in range(lines):
+            amount = f"{rng.randint(0, 9_999_999):07d}"
+            line = f"{202509000500000 + index // 50:015d}0101{index % 9999 + 1:4d} A{index:08d}            {amount}  1"
+            handle.write(line.ljust(184).encode("ascii") + b"\r\n")
+
+
+def run(lines: int, repeat: int, seed: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "K020.3"
+        write_item_file(path, lines, seed)
+        parser = EDIClaimParser(Path(tmp))
+        extract = parser._extractor(ITEM_FIELDS).extract
+        amounts: List[str] = [extract(line).daily_amount for line in parser._iter_lines(path)]
+    size_mb = lines * 186 / (1024 * 1024)
+    print(f"{lines} K020.3 lines (~{size_mb:.1f} MB)")
+
+    cents_best = decimal_best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cents_rows = [_format_scaled_int(_parse_scaled_int(value, 2), 2) for value in amounts]
+        cents_best = min(cents_best, time.perf_counter() - started)
+
+        started = time.perf_counter()
+        decimal_rows = [_decimal_format(_decimal_parse(value)) for value in amounts]
+        decimal_best = min(decimal_best, time.perf_counter() - started)
+    if cents_rows != decimal_rows:
+        raise SystemExit("integer-cents output differs from the Decimal path")
+    print(f"{'path':<14} {'seconds':>9} {'ns/line':>9}")
+    print(f"{'Decimal':<14} {decimal_best:>9.3f} {decimal_best / lines * 1e9:>9.0f}")
+    print(f"{'integer cents':<14} {cents_best:>9.3f} {cents_best / lines * 1e9:>9.0f}")
+    print(f"speedup: {decimal_best / cents_best:.1f}x")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compare Decimal and integer-cents daily amount handling")
+    parser.add_argument("--lines", type=int, default=200_000, help="Synthetic K020.3 line count (default: 200000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions (default: 3)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the amounts")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    run(args.lines, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark the K020.3/K020.4 item-detail join on one large inpatient encounter.
+
+Usage example::
+
+    python benchmarks/bench_detail_join.py --sizes 250 1000 4000
+
+For every size the script writes a synthetic encounter with that many K020.3
+item lines and one K020.4 line-level detail per item, then times
+``EDIClaimParser._attach_items`` + ``_attach_details`` against the previous
+linear ``next(item for item in items ...)`` lookup.  The indexed join should
+stay flat per detail row while the linear scan grows with the item count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from edi_parser import DETAIL_FIELDS, EDIClaimParser, EncounterRecord  # noqa: E402
+
+ENCOUNTER_NO = "202509000500001"
+
+
+def _fixed_width(fields: List[Tuple[int, str]], width: int) -> bytes:
+    buffer = bytearray(b" " * width)
+    for start, value in fields:
+        raw = value.encode("ascii")
+        buffer[start - 1 : start - 1 + len(raw)] = raw
+    return bytes(buffer)
+
+
+def write_encounter(directory: Path, item_count: int) -> None:
+    item_lines = []
+    detail_lines = []
+    for index in range(1, item_count + 1):
+        line_no = f"{index:04d}"
+        item_lines.append(
+            _fixed_width(
+                [(1, ENCOUNTER_NO), (20, line_no), (25, f"A{index:08d}"), (46, "0123400"), (53, "  1")],
+                184,
+            )
+        )
+        detail_lines.append(
+            _fixed_width([(1, ENCOUNTER_NO), (16, "2"), (17, line_no), (26, f"DETAIL {index}")], 725)
+        )
+    (directory / "K020.3").write_bytes(b"\r\n".join(item_lines) + b"\r\n")
+    (directory / "K020.4").write_bytes(b"\r\n".join(detail_lines) + b"\r\n")
+
+
+def _linear_attach_details(parser: EDIClaimParser, encounters: Dict[str, EncounterRecord], path: Path) -> None:
+    extract = parser._extractor(DETAIL_FIELDS).extract
+    for line in parser._iter_lines(path):
+        row = extract(line)
+        if not row.encounter_no or row.occurrence_scope != "2":
+            continue
+        record = encounters[row.encounter_no]
+        target_item = next((item for item in record.items if item.line_no == row.line_no), None)
+        if target_item:
+            target_item.add_detail_text(row.detail_text.rstrip())
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    print(f"{'items':>8} {'indexed (s)':>12} {'linear (s)':>12} {'indexed us/row':>15} {'linear us/row':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        parser = EDIClaimParser(directory)
+        for size in sizes:
+            write_encounter(directory, size)
+            indexed = linear = float("inf")
+            for _ in range(repeat):
+                encounters: Dict[str, EncounterRecord] = {}
+                started = time.perf_counter()
+                item_index = parser._attach_items(encounters, directory / "K020.3")
+                parser._attach_details(encounters, directory / "K020.4", DETAIL_FIELDS, item_index)
+                indexed = min(indexed, time.perf_counter() - started)
+
+                encounters = {}
+                started = time.perf_counter()
+                parser._attach_items(encounters, directory / "K020.3")
+                _linear_attach_details(parser, encounters, directory / "K020.4")
+                linear = min(linear, time.perf_counter() - started)
+            print(
+                f"{size:>8} {indexed:>12.4f} {linear:>12.4f} "
+                f"{indexed / size * 1e6:>15.2f} {linear / size * 1e6:>14.2f}"
+            )
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the item/detail join for a large encounter")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[250, 500, 1000, 2000, 4000], help="Item counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per size (default: 3)")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Report the retained memory of parsed encounters (bytes per encounter / item).
+
+Usage example::
+
+    python benchmarks/bench_memory.py --encounters 20000 --items 12
+    python benchmarks/bench_memory.py --encounters 20000 --item-store columnar
+
+A synthetic K020.* claim folder is generated, parsed with ``EDIClaimParser``
+and the memory still allocated by the resulting encounter dict is measured
+with ``tracemalloc``.  ``--item-store columnar`` moves the items into
+``ItemColumns`` before measuring.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import write_claim_dir  # noqa: E402
+
+from edi_parser import EDIClaimParser, ItemColumns  # noqa: E402
+
+
+def run(encounters: int, items: int, detail_ratio: float, item_store: str) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        claim_dir = Path(tmp) / "202509"
+        item_lines, detail_lines = write_claim_dir(
+            claim_dir,
+            encounters=encounters,
+            items_per_encounter=items,
+            detail_ratio=detail_ratio,
+        )
+        parser = EDIClaimParser(Path(tmp))
+        gc.collect()
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        parsed = parser.parse()
+        columns = ItemColumns.from_encounters(parsed) if item_store == "columnar" else None
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    retained -= baseline
+    print(f"item store: {item_store}{f' ({len(columns)} rows)' if columns is not None else ''}")
+    print(f"encounters: {len(parsed)}  items: {item_lines}  details: {detail_lines}")
+    print(f"retained:   {retained / (1024 * 1024):.1f} MiB (peak {(peak - baseline) / (1024 * 1024):.1f} MiB)")
+    print(f"per encounter: {retained / max(len(parsed), 1):,.0f} bytes")
+    print(f"per item:      {retained / max(item_lines, 1):,.0f} bytes (encounter overhead included)")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure memory held by parsed encounter records")
+    parser.add_argument("--encounters", type=int, default=10_000, help="Synthetic encounters (default: 10000)")
+    parser.add_argument("--items", type=int, default=8, help="Mean K020.3 items per encounter (default: 8)")
+    parser.add_argument("--detail-ratio", type=float, default=0.2, help="Share of items with a K020.4 detail")
+    parser.add_argument("--item-store", choices=("objects", "columnar"), default="objects", help="Item backend to measure")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    run(args.encounters, args.items, args.detail_ratio, args.item_store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Parser throughput: lines/sec, MB/sec and peak RSS for parse and export.
+
+Usage example::
+
+    python benchmarks/bench_throughput.py --months 3 --encounters 20000
+    python benchmarks/bench_throughput.py --source data/test_source --workers 4
+
+Without ``--source`` a synthetic tree is generated with ``synthetic.py`` into a
+temporary directory (or ``--keep`` it in a named one).  The parse phase runs
+``EDIClaimParser.parse()``; the export phase runs ``export_results`` into a
+temporary output directory.  Peak RSS is sampled by a background thread during
+each phase, so the two figures are reported separately even though both
+phases share one process (the export figure includes the parsed encounters it
+is writing out).  ``psutil`` is used for RSS when installed, ``/proc`` otherwise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from synthetic import write_source_tree  # noqa: E402
+
+from edi_parser import (  # noqa: E402
+    COMPRESSION_SUFFIXES,
+    EXPORT_MODES,
+    EXPORT_TARGETS,
+    PARSER_ENGINES,
+    EDIClaimParser,
+    export_results,
+)
+
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or ``None`` if unavailable."""
+    try:
+        import psutil  # type: ignore[import-not-found]
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class PeakRSSSampler:
+    """Track the highest RSS seen while the ``with`` block runs."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> None:
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self) -> "PeakRSSSampler":
+        self._sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def count_source(claim_dirs: list) -> Tuple[int, int]:
+    """Lines and bytes of the claim files the parser reads (headers excluded)."""
+    lines = size = 0
+    for claim_dir, layout in claim_dirs:
+        for name in (layout.patient_file, layout.dx_file, layout.item_file, layout.detail_file):
+            path = claim_dir / name
+            if path.exists():
+                data = path.read_bytes()
+                size += len(data)
+                lines += data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+    return lines, size
+
+
+def count_output(output_dir: Path, file_stats: list) -> Tuple[int, int]:
+    """Data rows and uncompressed bytes written to ``output_dir``.
+
+    CSV sizes come from the export stats (before compression); a SQLite
+    database is measured on disk, including its WAL file.
+    """
+    rows = sum(stat.rows for stat in file_stats)
+    size = sum(stat.raw_bytes for stat in file_stats)
+    for path in output_dir.glob("*.sqlite3*"):
+        size += path.stat().st_size
+    return rows, size
+
+
+def timed(label: str, action: Callable[[], object]) -> Tuple[object, float, Optional[int]]:
+    gc.collect()
+    with PeakRSSSampler() as sampler:
+        started = time.perf_counter()
+        result = action()
+        elapsed = time.perf_counter() - started
+    logging.debug("%s finished in %.3fs", label, elapsed)
+    return result, elapsed, sampler.peak
+
+
+def report(label: str, lines: int, size: int, elapsed: float, peak_rss: Optional[int]) -> None:
+    rate = lines / elapsed if elapsed else 0.0
+    throughput = size / (1024 * 1024) / elapsed if elapsed else 0.0
+    rss = f"{peak_rss / (1024 * 1024):,.1f} MiB" if peak_rss is not None else "n/a"
+    print(
+        f"{label:<7} {elapsed:8.3f}s  {lines:>11,} lines  {rate:>12,.0f} lines/s  "
+        f"{size / (1024 * 1024):9.1f} MiB  {throughput:8.2f} MiB/s  peak RSS {rss}"
+    )
+
+
+def run(source: Path, args: argparse.Namespace) -> None:
+    parser = EDIClaimParser(
+        source,
+        workers=args.workers,
+        engine=args.engine,
+        use_mmap=args.mmap,
+        intern_strings=not args.no_intern,
+    )
+    claim_dirs = parser.discover_claim_dirs()
+    source_lines, source_bytes = count_source(claim_dirs)
+    print(f"source: {source} ({len(claim_dirs)} claim folders)")
+    encounters, parse_elapsed, parse_peak = timed("parse", parser.parse)
+    report("parse", source_lines, source_bytes, parse_elapsed, parse_peak)
+    with tempfile.TemporaryDirectory() as output_tmp:
+        output_dir = Path(output_tmp)
+        file_stats, export_elapsed, export_peak = timed(
+            "export",
+            lambda: export_results(
+                encounters,
+                output_dir,
+                output_encoding=args.output_encoding,
+                mode=args.export_mode,
+                target=args.target,
+                compression=args.compress,
+                compression_level=args.compress_level,
+            ),
+        )
+        output_rows, output_bytes = count_output(output_dir, file_stats)
+    report("export", output_rows, output_bytes, export_elapsed, export_peak)
+    for stat in file_stats:
+        ratio = f"  {stat.bytes / stat.raw_bytes:6.1%} of {stat.raw_bytes / (1024 * 1024):.1f} MiB" if args.compress else ""
+        print(
+            f"  {stat.name:<24} {stat.seconds:8.3f}s  {stat.rows:>11,} rows  "
+            f"{stat.bytes / (1024 * 1024):9.1f} MiB{ratio}"
+        )
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure parse and export throughput of edi_parser")
+    parser.add_argument("--source", default=None, help="Existing claim source tree (default: generate one)")
+    parser.add_argument("--keep", default=None, help="Generate the synthetic tree into this directory and keep it")
+    parser.add_argument("--months", type=int, default=1, help="Synthetic claim months (default: 1)")
+    parser.add_argument("--encounters", type=int, default=10_000, help="Synthetic encounters per month")
+    parser.add_argument("--items", type=int, default=8, help="Mean K020.3 items per encounter (default: 8)")
+    parser.add_argument("--detail-ratio", type=float, default=0.2, help="Share of items with a K020.4 detail")
+    parser.add_argument("--korean-name-ratio", type=float, default=1.0, help="Share of patients with Korean names")
+    parser.add_argument("--auto-ratio", type=float, default=0.1, help="Share of encounters in C110 folders")
+    parser.add_argument("--workers", type=int, default=1, help="Parser worker processes (default: 1)")
+    parser.add_argument("--engine", choices=PARSER_ENGINES, default="python", help="Item file engine")
+    parser.add_argument("--mmap", action="store_true", help="Use the memory-mapped line reader")
+    parser.add_argument("--no-intern", action="store_true", help="Disable the string intern pool")
+    parser.add_argument("--target", choices=EXPORT_TARGETS, default="csv", help="Export to CSV files or SQLite")
+    parser.add_argument("--compress", choices=tuple(COMPRESSION_SUFFIXES), default=None, help="Compress the CSV files")
+    parser.add_argument("--compress-level", type=int, default=None, help="Compression level")
+    parser.add_argument("--export-mode", choices=EXPORT_MODES, default="serial", help="How the CSV files are written")
+    parser.add_argument("--output-encoding", default="cp949", help="CSV encoding for the export phase")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+    if args.source:
+        run(Path(args.source), args)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(args.keep) if args.keep else Path(tmp)
+        totals = write_source_tree(
+            root,
+            months=args.months,
+            encounters_per_month=args.encounters,
+            items_per_encounter=args.items,
+            detail_ratio=args.detail_ratio,
+            korean_name_ratio=args.korean_name_ratio,
+            auto_ratio=args.auto_ratio,
+        )
+        print(f"generated {totals['encounters']:,} encounters, {totals['item_lines']:,} item lines")
+        run(root, args)
+
+
+if __name__ == "__main__":
+    main()
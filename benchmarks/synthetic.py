@@ -0,0 +1,266 @@
+"""Synthetic fixed-width claim files for the benchmark scripts.
+
+Lines are assembled from the same ``FieldSpec`` tables the parser uses, so the
+generated files always line up with the offsets in ``edi_parser``.
+
+Run as a script to write a whole source tree (``mi/YYYYMM`` K020.* folders and
+``ta/YYYYMM`` C110.* folders, each with its H010/C010 header)::
+
+    python benchmarks/synthetic.py --output bench_source --months 3 --encounters 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from edi_parser import AUTO_LAYOUT, ENCODING_DEFAULT, MI_LAYOUT, ClaimFileLayout, FieldSpec  # noqa: E402
+
+PATIENT_LINE_WIDTH = 325
+DX_LINE_WIDTH = 43
+ITEM_LINE_WIDTH = 184
+DETAIL_LINE_WIDTH = 725
+# H010/C010 are single-record claim headers without a line terminator.  The
+# parser does not read them; the offsets below follow the shipped samples
+# closely enough to produce realistic folders for copying and hashing.
+HEADER_FILES = {MI_LAYOUT.patient_file: ("H010", 2096), AUTO_LAYOUT.patient_file: ("C010", 1901)}
+HEADER_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec("record_type", 1, 5),
+    FieldSpec("claim_no", 6, 10),
+    FieldSpec("form_no", 16, 4),
+    FieldSpec("provider_code", 20, 8),
+    FieldSpec("claim_month", 38, 6),
+    FieldSpec("encounter_count", 48, 4),
+    FieldSpec("total_amount", 52, 12),
+    FieldSpec("representative_name", 216, 20),
+    FieldSpec("writer_name", 236, 20),
+)
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+GIVEN_SYLLABLES = "민서지현수영준호연우진하은도윤성경희정아"
+
+
+def fixed_width_line(
+    fields: Iterable[FieldSpec],
+    values: Dict[str, str],
+    *,
+    width: int,
+    encoding: str = ENCODING_DEFAULT,
+) -> bytes:
+    """Place every value at its field's byte offset, space padded to ``width``."""
+    buffer = bytearray(b" " * width)
+    for spec in fields:
+        value = values.get(spec.name)
+        if value is None:
+            continue
+        raw = value.encode(encoding)[: spec.length]
+        begin = spec.start - 1
+        buffer[begin : begin + len(raw)] = raw
+    return bytes(buffer)
+
+
+def _korean_name(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + "".join(rng.choice(GIVEN_SYLLABLES) for _ in range(2))
+
+
+def write_claim_dir(
+    directory: Path,
+    *,
+    layout: ClaimFileLayout = MI_LAYOUT,
+    encounters: int = 1000,
+    items_per_encounter: int = 8,
+    detail_ratio: float = 0.2,
+    korean_name_ratio: float = 1.0,
+    claim_no: str = "2025090005",
+    seed: int = 0,
+    encoding: str = ENCODING_DEFAULT,
+) -> Tuple[int, int]:
+    """Write the four claim files of ``layout`` (and its H010/C010 header) into ``directory``.
+
+    Returns ``(item_lines, detail_lines)`` so callers can compute throughput.
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    item_count = detail_count = 0
+    with (
+        (directory / layout.patient_file).open("wb") as patient_handle,
+        (directory / layout.dx_file).open("wb") as dx_handle,
+        (directory / layout.item_file).open("wb") as item_handle,
+        (directory / layout.detail_file).open("wb") as detail_handle,
+    ):
+        for index in range(1, encounters + 1):
+            statement_no = f"{index:05d}"
+            encounter_no = f"{claim_no}{statement_no}"
+            name = _korean_name(rng) if rng.random() < korean_name_ratio else f"PATIENT{index:05d}"
+            birth = f"{rng.randint(40, 99):02d}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+            identity = f"{birth}{rng.choice('1234')}{rng.randint(0, 999999):06d}"
+            items = max(1, int(rng.expovariate(1 / items_per_encounter))) if items_per_encounter else 0
+            patient_values = {
+                "claim_no": claim_no,
+                "statement_no": statement_no,
+                "form_no": "H021",
+                "provider_code": "12345678",
+                "payer_code": f"{rng.randint(0, 99999999999):011d}",
+                "claim_type": "1",
+                "subscriber_name": name,
+                "nhis_no": f"{rng.randint(0, 99999999999):011d}",
+                "patient_name": name,
+                "identity": identity,
+                "treatment_days": f"{rng.randint(1, 30):03d}",
+                "inpatient_days": "000",
+                "visit_days": f"{rng.randint(1, 30):03d}",
+                "result_code": "1",
+                "invoice_sum": f"{rng.randint(0, 999999):010d}",
+                "patient_burden": f"{rng.randint(0, 99999):010d}",
+                "nhis_burden": f"{rng.randint(0, 999999):010d}",
+                "total_cost": f"{rng.randint(0, 999999):010d}",
+                "patient_payment": f"{rng.randint(0, 99999):010d}",
+                "claim_amount": f"{rng.randint(0, 999999):010d}",
+                "insurer_code": "08",
+                "accident_no": f"2025-{rng.randint(0, 9999999999):010d}",
+            }
+            patient_handle.write(
+                fixed_width_line(layout.patient_fields, patient_values, width=PATIENT_LINE_WIDTH, encoding=encoding)
+                + b"\r\n"
+            )
+            for dx_index in range(rng.randint(1, 3)):
+                dx_values = {
+                    "encounter_no": encounter_no,
+                    "dx_type_code": "1" if dx_index == 0 else "2",
+                    "kcd_code": rng.choice(["M5456", "S134", "G540", "M6268", "S3350"]),
+                    "department_code": "80",
+                    "encounter_date": f"{claim_no[:6]}{rng.randint(1, 28):02d}",
+                    "license_type_code": "3",
+                    "license_no": f"{rng.randint(0, 99999):010d}",
+                }
+                dx_handle.write(fixed_width_line(layout.dx_fields, dx_values, width=DX_LINE_WIDTH) + b"\r\n")
+            for line in range(1, items + 1):
+                line_no = f"{line:4d}"
+                item_values = {
+                    "encounter_no": encounter_no,
+                    "line_no": line_no,
+                    "item_code": rng.choice(["10200", "40012", "40080", "40091", "655006120", "A10100"]),
+                    "daily_amount": f"{rng.randint(0, 300):05d}00",
+                    "days": f"{rng.randint(1, 7):3d}",
+                }
+                item_handle.write(fixed_width_line(layout.item_fields, item_values, width=ITEM_LINE_WIDTH) + b"\r\n")
+                item_count += 1
+                if rng.random() < detail_ratio:
+                    detail_values = {
+                        "encounter_no": encounter_no,
+                        "occurrence_scope": "2",
+                        "line_no": line_no,
+                        "detail_text": f"GV{rng.randint(0, 99):03d}/GB{rng.randint(0, 99):03d}",
+                    }
+                    detail_handle.write(
+                        fixed_width_line(layout.detail_fields, detail_values, width=DETAIL_LINE_WIDTH) + b"\r\n"
+                    )
+                    detail_count += 1
+    header_file, header_width = HEADER_FILES[layout.patient_file]
+    header_values = {
+        "record_type": "09109",
+        "claim_no": claim_no,
+        "form_no": header_file,
+        "provider_code": "12345678",
+        "claim_month": claim_no[:6],
+        "encounter_count": f"{encounters:4d}",
+        "total_amount": f"{rng.randint(0, 10**11):12d}",
+        "representative_name": _korean_name(rng),
+        "writer_name": _korean_name(rng),
+    }
+    (directory / header_file).write_bytes(
+        fixed_width_line(HEADER_FIELDS, header_values, width=header_width, encoding=encoding)
+    )
+    return item_count, detail_count
+
+
+def month_sequence(first_month: str, count: int) -> Iterable[str]:
+    """``count`` consecutive ``YYYYMM`` strings starting at ``first_month``."""
+    year, month = int(first_month[:4]), int(first_month[4:6])
+    for _ in range(count):
+        yield f"{year:04d}{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def write_source_tree(
+    root: Path,
+    *,
+    months: int = 1,
+    first_month: str = "202501",
+    encounters_per_month: int = 1000,
+    items_per_encounter: int = 8,
+    detail_ratio: float = 0.2,
+    korean_name_ratio: float = 1.0,
+    auto_ratio: float = 0.1,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """Write ``mi/YYYYMM`` (K020.*) and ``ta/YYYYMM`` (C110.*) folders under ``root``.
+
+    Each month gets ``encounters_per_month`` encounters, ``auto_ratio`` of them
+    in the auto-insurance folder.  Returns folder, encounter and line counts.
+    """
+    totals = {"claim_dirs": 0, "encounters": 0, "item_lines": 0, "detail_lines": 0}
+    for offset, month in enumerate(month_sequence(first_month, months)):
+        auto_encounters = round(encounters_per_month * auto_ratio)
+        for kind, layout, count in (
+            ("mi", MI_LAYOUT, encounters_per_month - auto_encounters),
+            ("ta", AUTO_LAYOUT, auto_encounters),
+        ):
+            if count <= 0:
+                continue
+            item_lines, detail_lines = write_claim_dir(
+                root / kind / month,
+                layout=layout,
+                encounters=count,
+                items_per_encounter=items_per_encounter,
+                detail_ratio=detail_ratio,
+                korean_name_ratio=korean_name_ratio,
+                claim_no=f"{month}{'0005' if layout is MI_LAYOUT else '0007'}",
+                seed=seed * 1000 + offset * 2 + (layout is AUTO_LAYOUT),
+            )
+            totals["claim_dirs"] += 1
+            totals["encounters"] += count
+            totals["item_lines"] += item_lines
+            totals["detail_lines"] += detail_lines
+    return totals
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Write a synthetic K020/C110 claim source tree")
+    parser.add_argument("--output", required=True, help="Directory to create the mi/ and ta/ folders in")
+    parser.add_argument("--months", type=int, default=1, help="Claim months to generate (default: 1)")
+    parser.add_argument("--first-month", default="202501", help="First claim month as YYYYMM (default: 202501)")
+    parser.add_argument("--encounters", type=int, default=1000, help="Encounters per month (default: 1000)")
+    parser.add_argument("--items", type=int, default=8, help="Mean K020.3 items per encounter (default: 8)")
+    parser.add_argument("--detail-ratio", type=float, default=0.2, help="Share of items with a K020.4 detail")
+    parser.add_argument("--korean-name-ratio", type=float, default=1.0, help="Share of patients with Korean names")
+    parser.add_argument("--auto-ratio", type=float, default=0.1, help="Share of encounters in C110 (auto) folders")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    return parser
+
+
+def main() -> None:
+    args = build_arg_parser().parse_args()
+    totals = write_source_tree(
+        Path(args.output),
+        months=args.months,
+        first_month=args.first_month,
+        encounters_per_month=args.encounters,
+        items_per_encounter=args.items,
+        detail_ratio=args.detail_ratio,
+        korean_name_ratio=args.korean_name_ratio,
+        auto_ratio=args.auto_ratio,
+        seed=args.seed,
+    )
+    print(
+        f"wrote {totals['claim_dirs']} claim folders, {totals['encounters']} encounters, "
+        f"{totals['item_lines']} item lines, {totals['detail_lines']} detail lines to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -35,14 +35,51 @@ parser therefore slices byte positions rather than Python character offsets.
 from __future__ import annotations
 
 import argparse
+from array import array
+import codecs
 import csv
+import gzip
+import hashlib
+import heapq
+import io
+import json
 import logging
+import mmap
+import multiprocessing
+import os
+import pickle
+import posixpath
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import traceback
+import zipfile
+from bisect import bisect_left
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
+try:  # Optional: only needed for ``--engine numpy``.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+try:  # Optional: only needed for ``--compress zstd``.
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Bump whenever a change alters the parsed records so that on-disk parse caches
+# built by earlier versions are invalidated.
+PARSER_VERSION = "3"
 ENCODING_DEFAULT = "cp949"
 OUTPUT_ENCODING_DEFAULT = "cp949"
 DX_TYPE_LABELS = {"1": "primary", "2": "secondary"}
@@ -77,6 +114,103 @@ AUTO_INSURER_COMPANIES = {
 }
 
 
+@dataclass(frozen=True)
+class FieldSpec:
+    """Fixed-width field definition using the 1-based byte offsets of the specification."""
+
+    name: str
+    start: int
+    length: int
+    strip: bool = True
+    # Low-cardinality code columns are shared through ``StringInternPool``
+    # (only honoured for stripped fields).
+    intern: bool = False
+
+
+DX_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec("encounter_no", 1, 15),
+    FieldSpec("dx_type_code", 16, 1, intern=True),
+    FieldSpec("kcd_code", 17, 6, intern=True),
+    FieldSpec("department_code", 23, 2, intern=True),
+    FieldSpec("encounter_date", 25, 8),
+    FieldSpec("license_type_code", 33, 1, intern=True),
+    FieldSpec("license_no", 34, 10, intern=True),
+)
+
+ITEM_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec("encounter_no", 1, 15),
+    FieldSpec("line_no", 20, 4, intern=True),
+    FieldSpec("item_code", 25, 9, intern=True),
+    FieldSpec("daily_amount", 46, 7, strip=False),
+    FieldSpec("days", 53, 3),
+)
+
+DETAIL_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec("encounter_no", 1, 15),
+    FieldSpec("occurrence_scope", 16, 1, intern=True),
+    FieldSpec("line_no", 17, 4, intern=True),
+    FieldSpec("detail_text", 26, 700, strip=False),
+)
+
+MI_PATIENT_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec("claim_no", 1, 10),
+    FieldSpec("statement_no", 11, 5),
+    FieldSpec("form_no", 16, 4, intern=True),
+    FieldSpec("provider_code", 20, 8, intern=True),
+    FieldSpec("payer_code", 28, 11, intern=True),
+    FieldSpec("medical_aid_code", 39, 1, intern=True),
+    FieldSpec("special_code", 40, 1, intern=True),
+    FieldSpec("copay_code", 41, 1, intern=True),
+    FieldSpec("claim_type", 42, 23, intern=True),
+    FieldSpec("subscriber_name", 65, 20),
+    FieldSpec("nhis_no", 85, 20),
+    FieldSpec("patient_name", 105, 20),
+    FieldSpec("identity", 125, 13),
+    FieldSpec("treatment_days", 138, 3),
+    FieldSpec("inpatient_days", 141, 3),
+    FieldSpec("result_code", 175, 1, intern=True),
+    FieldSpec("invoice_sum", 176, 10),
+    FieldSpec("patient_burden", 186, 10),
+    FieldSpec("patient_max_excess", 196, 10),
+    FieldSpec("nhis_burden", 206, 10),
+    FieldSpec("subsidy", 216, 10),
+    FieldSpec("disabled_support", 226, 10),
+)
+
+AUTO_PATIENT_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec("claim_no", 1, 10),
+    FieldSpec("statement_no", 11, 5),
+    FieldSpec("form_no", 16, 4, intern=True),
+    FieldSpec("provider_code", 20, 8, intern=True),
+    FieldSpec("claim_type", 28, 23, intern=True),
+    FieldSpec("accident_no", 51, 30),
+    FieldSpec("guarantee_no", 81, 17),
+    FieldSpec("patient_name", 98, 20),
+    FieldSpec("identity", 118, 13),
+    FieldSpec("visit_days", 131, 3),
+    FieldSpec("inpatient_days", 134, 3),
+    FieldSpec("result_code", 137, 1, intern=True),
+    FieldSpec("total_cost", 138, 10),
+    FieldSpec("patient_payment", 148, 10),
+    FieldSpec("claim_amount", 158, 10),
+    FieldSpec("insurer_code", 168, 2, intern=True),
+)
+
+# patients.csv schema extension for AUTO (C110.1) rows; the columns are added
+# to the file when any exported patient carries ``extra_fields``.
+AUTO_PATIENT_EXTRA_COLUMNS: Tuple[str, ...] = (
+    "auto_accident_no",
+    "auto_guarantee_no",
+    "auto_visit_days",
+    "auto_inpatient_days",
+    "auto_result_code",
+    "auto_total_cost",
+    "auto_patient_payment",
+    "auto_claim_amount",
+    "auto_insurer_code",
+)
+
+
 @dataclass(frozen=True)
 class ClaimFileLayout:
     patient_file: str
@@ -87,6 +221,10 @@ class ClaimFileLayout:
     patient_name_length: int
     patient_identity_start: int
     patient_identity_length: int
+    patient_fields: Tuple[FieldSpec, ...]
+    dx_fields: Tuple[FieldSpec, ...] = DX_FIELDS
+    item_fields: Tuple[FieldSpec, ...] = ITEM_FIELDS
+    detail_fields: Tuple[FieldSpec, ...] = DETAIL_FIELDS
 
 
 MI_LAYOUT = ClaimFileLayout(
@@ -98,6 +236,7 @@ MI_LAYOUT = ClaimFileLayout(
     patient_name_length=20,
     patient_identity_start=125,
     patient_identity_length=13,
+    patient_fields=MI_PATIENT_FIELDS,
 )
 
 AUTO_LAYOUT = ClaimFileLayout(
@@ -109,10 +248,300 @@ AUTO_LAYOUT = ClaimFileLayout(
     patient_name_length=20,
     patient_identity_start=118,
     patient_identity_length=13,
+    patient_fields=AUTO_PATIENT_FIELDS,
 )
 
 SUPPORTED_LAYOUTS = [MI_LAYOUT, AUTO_LAYOUT]
 
+PARSE_CACHE_DIR_DEFAULT = Path.home() / ".edi_parser_cache"
+PARSE_CACHE_MAX_BYTES_DEFAULT = 512 * 1024 * 1024
+STREAM_BUFFER_DEFAULT = 100_000
+# Folder names that never hold claim files; callers may pass them as prune_dirs.
+NON_CLAIM_DIR_NAMES = frozenset({".git", "__pycache__", "parse_cache", "parsed_output", "zip", "enc"})
+STREAM_MERGE_FAN_IN = 64
+# Files with these suffixes (case-insensitive) are read as claim archives.
+ARCHIVE_SUFFIXES = (".zip",)
+ARCHIVE_READ_CHUNK = 1024 * 1024
+MMAP_ASCII_BLOCK = 64 * 1024
+# Rows handed to ``csv.writer.writerows`` at a time, and the file buffer size.
+CSV_WRITE_BATCH_ROWS = 10_000
+CSV_WRITE_BUFFER_BYTES = 1024 * 1024
+# ``--compress`` codecs: file suffix and default level (gzip's own default of 9
+# costs several times the CPU of 6 for a few percent smaller files).
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+COMPRESSION_DEFAULT_LEVELS = {"gzip": 6, "zstd": 3}
+# How ``export_results`` spreads the six tables: one after another, one thread
+# per table, or one forked process per table.
+EXPORT_MODES = ("serial", "threads", "processes")
+EXPORT_TABLES = (
+    "patients.csv",
+    "encounters.csv",
+    "encounter_dx.csv",
+    "encounter_items.csv",
+    "insurances.csv",
+    "invoices.csv",
+)
+EXPORT_TARGETS = ("csv", "sqlite")
+SQLITE_DEFAULT_NAME = "edi_claims.sqlite3"
+# ``--partition`` layout: <output>/<claim month>/<kind>/<table>.csv, with the
+# digest of every partition kept in PARTITION_MANIFEST_NAME at the top.
+PARTITION_MANIFEST_NAME = "partitions.json"
+PARTITION_MANIFEST_VERSION = 1
+PARTITION_UNKNOWN = "unknown"
+# Stored in ``PRAGMA user_version``; bump when the table layout changes.
+SQLITE_SCHEMA_VERSION = 1
+# Export columns that are not TEXT in SQLite: ``integer`` columns hold ints,
+# ``flag`` (Y/N) columns 0/1, and ``cents`` amounts are stored as integer
+# cents in a ``<column>_cents`` column.
+SQLITE_COLUMN_KINDS = {
+    "has_dx": "flag",
+    "has_items": "flag",
+    "is_gongsang": "flag",
+    "treatment_days": "integer",
+    "inpatient_days": "integer",
+    "daily_amount": "cents",
+    "days": "integer",
+    "invoice_sum": "integer",
+    "invoice_insurance_sum": "integer",
+    "invoice_insurance_patient_burden": "integer",
+    "invoice_insurance_nhis_burden": "integer",
+    "invoice_subsidy": "integer",
+    "invoice_is_fixed_patient_burden": "flag",
+    "invoice_patient_max_excess": "integer",
+    "invoice_disabled_support": "integer",
+}
+# Upsert key of every SQLite table.  Diagnoses and items get an extra
+# SQLITE_SEQUENCE_COLUMN holding the row's 1-based position within its
+# encounter, because an encounter merged from several claim folders repeats
+# its line numbers.
+SQLITE_SEQUENCE_COLUMN = "seq"
+SQLITE_TABLE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "patients": ("encounter_no",),
+    "encounters": ("encounter_no",),
+    "encounter_dx": ("encounter_no", SQLITE_SEQUENCE_COLUMN),
+    "encounter_items": ("encounter_no", SQLITE_SEQUENCE_COLUMN),
+    "insurances": ("encounter_no",),
+    "invoices": ("encounter_no",),
+}
+# Claim folders submitted to the worker pool per worker ahead of the consumer,
+# so parsed results never pile up faster than they are merged.
+PARSE_WINDOW_PER_WORKER = 2
+# ``python`` extracts every line with ``RecordExtractor``; ``numpy`` cuts the
+# K020.3/C110.3 item files column-wise (see ``_item_columns_numpy``).
+PARSER_ENGINES = ("python", "numpy")
+
+
+# Stateless, ASCII-compatible codecs for which decoding a whole line and slicing
+# the text yields exactly what decoding each byte range separately would.
+# euc_kr is not one of them: it reads 8-byte KS X 1001 composed-jamo sequences
+# as a single character that does not re-encode to the same bytes.
+DECODE_ONCE_CODECS = frozenset({"cp949", "utf-8", "ascii", "iso8859-1"})
+_NON_ASCII_CHAR = re.compile(r"[^\x00-\x7f]")
+_NON_ASCII_BYTE = re.compile(rb"[\x80-\xff]")
+
+# A claim-file line without its terminator: ``bytes``, or a read-only
+# ``memoryview`` into a memory-mapped file (see ``EDIClaimParser._iter_lines``).
+Line = Union[bytes, memoryview]
+
+
+class StringInternPool:
+    """Shared ``str`` objects for repeated code fields, keyed by their raw bytes.
+
+    A hit returns the string decoded for the same bytes earlier, so neither the
+    decode nor the new string object happens again.  With ``max_entries`` the
+    pool stops admitting new values once full (existing entries keep hitting).
+    Values are the ``errors="ignore"`` decode of the slice, stripped, which is
+    what every extraction path produces for a stripped field.
+
+    With ``--workers`` every claim folder is parsed with its own pool in a
+    worker process, so strings are shared within one folder only; the parent
+    pool folds in the workers' counters, entry counts included.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self._values: Dict[bytes, Tuple[str, int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+        self.worker_entries = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def intern(self, raw: Line, encoding: str) -> str:
+        entry = self._values.get(raw)
+        if entry is not None:
+            self.hits += 1
+            self.saved_bytes += entry[1]
+            return entry[0]
+        self.misses += 1
+        value = str(raw, encoding, "ignore").strip()
+        if self.max_entries is None or len(self._values) < self.max_entries:
+            # Empty and single-character strings are already shared by CPython.
+            self._values[bytes(raw)] = (value, sys.getsizeof(value) if len(value) > 1 else 0)
+        return value
+
+    def intern_repeated(self, raw: Line, encoding: str, count: int) -> str:
+        """``intern`` for ``count`` occurrences of the same bytes, looked up once."""
+        value = self.intern(raw, encoding)
+        if count > 1:
+            entry = self._values.get(raw)
+            self.hits += count - 1
+            self.saved_bytes += (count - 1) * (entry[1] if entry is not None else 0)
+        return value
+
+    def add_counts(self, hits: int, misses: int, saved_bytes: int, entries: int = 0) -> None:
+        """Fold in the counters of a pool used by a worker process."""
+        self.hits += hits
+        self.misses += misses
+        self.saved_bytes += saved_bytes
+        self.worker_entries += entries
+
+    def counts(self) -> Tuple[int, int, int, int]:
+        return self.hits, self.misses, self.saved_bytes, len(self._values)
+
+    @property
+    def entries(self) -> int:
+        """Entries held by this pool plus those of the worker pools folded in."""
+        return len(self._values) + self.worker_entries
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.entries} entries, {self.hits} hit(s), {self.misses} miss(es), "
+            f"{self.hit_rate:.1%} hit rate, ~{self.saved_bytes / (1024 * 1024):.1f} MiB of duplicate strings avoided"
+        )
+
+
+class RecordExtractor:
+    """A field-spec table compiled once into precomputed byte slices.
+
+    ``extract`` returns a named tuple whose attributes follow the ``FieldSpec``
+    names, so every line is cut with a single pass over the prepared slices
+    instead of recomputing offsets for each field.
+
+    In decode-once mode each line is decoded a single time: ASCII-only lines go
+    through ``bytes.decode("ascii")`` and are sliced directly, while lines with
+    double-byte characters are decoded once and sliced through a byte-to-char
+    offset map.  Fields whose byte range splits a character (or lines that do
+    not decode cleanly) fall back to the per-field ``errors="ignore"`` decode so
+    the output stays identical.
+
+    When a ``StringInternPool`` is passed to ``extract``, fields declared with
+    ``intern=True`` are looked up by their raw bytes instead of being sliced
+    from the decoded line.
+    """
+
+    def __init__(self, fields: Sequence[FieldSpec], encoding: str, *, decode_once: bool = True) -> None:
+        self.fields = tuple(fields)
+        self.encoding = encoding
+        self.decode_once = decode_once and codecs.lookup(encoding).name in DECODE_ONCE_CODECS
+        self.record_type = namedtuple("ExtractedRecord", [spec.name for spec in self.fields])
+        self._plan = tuple(
+            (
+                slice(max(spec.start - 1, 0), max(spec.start - 1, 0) + spec.length),
+                spec.strip,
+                spec.intern and spec.strip,
+            )
+            for spec in self.fields
+        )
+        self._char_widths: Dict[str, int] = {}
+
+    def extract(self, line: Line, pool: Optional[StringInternPool] = None) -> Any:
+        if not self.decode_once:
+            return self._extract_per_field(line, pool)
+        if line.__class__ is memoryview:
+            # ``_iter_lines`` only hands out views for ASCII lines; anything else
+            # is copied and takes the regular path.
+            try:
+                text = str(line, "ascii")
+            except UnicodeDecodeError:
+                return self.extract(bytes(line), pool)
+        elif line.isascii():
+            text = line.decode("ascii")
+        else:
+            try:
+                text = line.decode(self.encoding)
+            except UnicodeDecodeError:
+                return self._extract_per_field(line, pool)
+            return self._extract_mapped(line, text, pool)
+        values = []
+        for field_slice, strip, interned in self._plan:
+            if interned and pool is not None:
+                values.append(pool.intern(line[field_slice], "ascii"))
+                continue
+            chunk = text[field_slice]
+            values.append(chunk.strip() if strip else chunk)
+        return self.record_type._make(values)
+
+    def _extract_per_field(self, line: Line, pool: Optional[StringInternPool] = None) -> Any:
+        encoding = self.encoding
+        values = []
+        for field_slice, strip, interned in self._plan:
+            if interned and pool is not None:
+                values.append(pool.intern(line[field_slice], encoding))
+                continue
+            text = str(line[field_slice], encoding, "ignore")
+            values.append(text.strip() if strip else text)
+        return self.record_type._make(values)
+
+    def _extract_mapped(self, line: bytes, text: str, pool: Optional[StringInternPool] = None) -> Any:
+        # Byte offset of every multi-byte character plus the running count of
+        # extra bytes they contribute; any byte offset that is not inside a
+        # character maps to ``offset - extra bytes before it``.
+        byte_starts: List[int] = []
+        byte_ends: List[int] = []
+        extras = [0]
+        widths = self._char_widths
+        extra = 0
+        for match in _NON_ASCII_CHAR.finditer(text):
+            char = match.group()
+            width = widths.get(char)
+            if width is None:
+                width = widths[char] = len(char.encode(self.encoding))
+            byte_start = match.start() + extra
+            byte_starts.append(byte_start)
+            byte_ends.append(byte_start + width)
+            extra += width - 1
+            extras.append(extra)
+
+        line_length = len(line)
+        if len(text) + extra != line_length:
+            # Some character did not re-encode to the bytes it came from, so
+            # the offset map would be off for every later field.
+            return self._extract_per_field(line, pool)
+
+        def char_offset(byte_offset: int) -> Optional[int]:
+            index = bisect_left(byte_starts, byte_offset)
+            if index and byte_ends[index - 1] > byte_offset:
+                return None
+            return byte_offset - extras[index]
+
+        values = []
+        for field_slice, strip, interned in self._plan:
+            if interned and pool is not None:
+                values.append(pool.intern(line[field_slice], self.encoding))
+                continue
+            begin = char_offset(min(field_slice.start, line_length))
+            end = char_offset(min(field_slice.stop, line_length))
+            if begin is None or end is None:
+                chunk = line[field_slice].decode(self.encoding, errors="ignore")
+            else:
+                chunk = text[begin:end]
+            values.append(chunk.strip() if strip else chunk)
+        return self.record_type._make(values)
+
+
+@lru_cache(maxsize=None)
+def compile_extractor(fields: Tuple[FieldSpec, ...], encoding: str, decode_once: bool = True) -> RecordExtractor:
+    """Return the (cached) compiled extractor for a field-spec table."""
+    return RecordExtractor(fields, encoding, decode_once=decode_once)
+
 
 def _parse_gender(identity_suffix: str) -> Optional[str]:
     if not identity_suffix:
@@ -149,11 +578,30 @@ def _parse_decimal(value: str, scale: int) -> Optional[Decimal]:
     return (quant / scale_factor).quantize(Decimal(1) / (Decimal(10) ** scale), rounding=ROUND_HALF_UP)
 
 
-def _format_decimal(value: Optional[Decimal], places: int = 2) -> str:
+def _parse_scaled_int(value: str, scale: int) -> Optional[int]:
+    """Parse an implied-decimal field into an integer count of ``10**-scale`` units.
+
+    Plain digit strings (the normal case for fixed-width amounts) are converted
+    with ``int`` directly; anything else goes through ``_parse_decimal`` so the
+    rounding of unusual inputs is unchanged.
+    """
+    raw = value.strip()
+    if not raw:
+        return None
+    if raw.isascii() and raw.isdigit():
+        return int(raw)
+    parsed = _parse_decimal(raw, scale)
+    if parsed is None or not parsed.is_finite():
+        return None
+    return int(parsed.scaleb(scale))
+
+
+def _format_scaled_int(value: Optional[int], places: int = 2) -> str:
     if value is None:
         return ""
-    quant = Decimal(1) / (Decimal(10) ** places)
-    return format(value.quantize(quant), f".{places}f")
+    whole, fraction = divmod(abs(value), 10**places)
+    sign = "-" if value < 0 else ""
+    return f"{sign}{whole}.{fraction:0{places}d}"
 
 
 def _parse_int(value: str) -> Optional[int]:
@@ -194,7 +642,7 @@ def _derive_insurance_nhis_type(medical_code: str, special_code: str) -> str:
     return mapping.get(medical_code, medical_code or "1")
 
 
-@dataclass
+@dataclass(slots=True)
 class PatientRecord:
     encounter_no: str
     claim_no: str
@@ -203,24 +651,39 @@ class PatientRecord:
     patient_identity_prefix: str
     patient_identity_suffix: str
     patient_gender: Optional[str]
-    extra_fields: Dict[str, str] = field(default_factory=dict)
+    # Only AUTO (C110.1) rows carry extra columns; MI rows leave this unset.
+    extra_fields: Optional[Dict[str, str]] = None
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "encounter_no",
+        "patient_name",
+        "patient_identity_prefix",
+        "patient_identity_suffix",
+        "patient_gender",
+    )
 
-    def to_row(self) -> Dict[str, str]:
-        base = {
-            "encounter_no": self.encounter_no,
-            "patient_name": self.patient_name,
-            "patient_identity_prefix": self.patient_identity_prefix,
-            "patient_identity_suffix": self.patient_identity_suffix,
-            "patient_gender": self.patient_gender or "",
-        }
-        if not self.extra_fields:
+    def to_tuple(self, extra_columns: Sequence[str] = ()) -> Tuple[str, ...]:
+        """Row for ``COLUMNS + extra_columns`` (missing extra values are blank)."""
+        base = (
+            self.encounter_no,
+            self.patient_name,
+            self.patient_identity_prefix,
+            self.patient_identity_suffix,
+            self.patient_gender or "",
+        )
+        if not extra_columns:
             return base
-        enriched = dict(base)
-        enriched.update(self.extra_fields)
-        return enriched
+        extra = self.extra_fields or {}
+        return base + tuple(extra.get(column, "") for column in extra_columns)
 
+    def to_row(self) -> Dict[str, str]:
+        row = dict(zip(self.COLUMNS, self.to_tuple()))
+        if self.extra_fields:
+            row.update(self.extra_fields)
+        return row
 
-@dataclass
+
+@dataclass(slots=True)
 class InsuranceRecord:
     encounter_no: str
     insurance_type_code: str = ""
@@ -241,30 +704,54 @@ class InsuranceRecord:
     insurance_ta_company_code: str = ""
     insurance_ta_company_name: str = ""
 
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "encounter_no",
+        "insurance_type_code",
+        "insurance_nhis_type",
+        "insurance_nhis_no",
+        "insurance_form_no",
+        "insurance_provider_code",
+        "insurance_payer_code",
+        "insurance_claim_type",
+        "insurance_subscriber_name",
+        "insurance_medical_aid_code",
+        "insurance_special_code",
+        "insurance_copay_code",
+        "claim_no",
+        "statement_no",
+        "insurance_ta_reg_no",
+        "insurance_ta_ins_no",
+        "insurance_ta_company_code",
+        "insurance_ta_company_name",
+    )
+
+    def to_tuple(self) -> Tuple[str, ...]:
+        return (
+            self.encounter_no,
+            self.insurance_type_code,
+            self.insurance_nhis_type,
+            self.insurance_nhis_no,
+            self.insurance_form_no,
+            self.insurance_provider_code,
+            self.insurance_payer_code,
+            self.insurance_claim_type,
+            self.insurance_subscriber_name,
+            self.insurance_medical_aid_code,
+            self.insurance_special_code,
+            self.insurance_copay_code,
+            self.claim_no,
+            self.statement_no,
+            self.insurance_ta_reg_no,
+            self.insurance_ta_ins_no,
+            self.insurance_ta_company_code,
+            self.insurance_ta_company_name,
+        )
+
     def to_row(self) -> Dict[str, str]:
-        return {
-            "encounter_no": self.encounter_no,
-            "insurance_type_code": self.insurance_type_code,
-            "insurance_nhis_type": self.insurance_nhis_type,
-            "insurance_nhis_no": self.insurance_nhis_no,
-            "insurance_form_no": self.insurance_form_no,
-            "insurance_provider_code": self.insurance_provider_code,
-            "insurance_payer_code": self.insurance_payer_code,
-            "insurance_claim_type": self.insurance_claim_type,
-            "insurance_subscriber_name": self.insurance_subscriber_name,
-            "insurance_medical_aid_code": self.insurance_medical_aid_code,
-            "insurance_special_code": self.insurance_special_code,
-            "insurance_copay_code": self.insurance_copay_code,
-            "claim_no": self.claim_no,
-            "statement_no": self.statement_no,
-            "insurance_ta_reg_no": self.insurance_ta_reg_no,
-            "insurance_ta_ins_no": self.insurance_ta_ins_no,
-            "insurance_ta_company_code": self.insurance_ta_company_code,
-            "insurance_ta_company_name": self.insurance_ta_company_name,
-        }
+        return dict(zip(self.COLUMNS, self.to_tuple()))
 
 
-@dataclass
+@dataclass(slots=True)
 class InvoiceRecord:
     encounter_no: str
     invoice_sum: int = 0
@@ -276,62 +763,107 @@ class InvoiceRecord:
     invoice_patient_max_excess: int = 0
     invoice_disabled_support: int = 0
 
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "encounter_no",
+        "invoice_sum",
+        "invoice_insurance_sum",
+        "invoice_insurance_patient_burden",
+        "invoice_insurance_nhis_burden",
+        "invoice_subsidy",
+        "invoice_is_fixed_patient_burden",
+        "invoice_patient_max_excess",
+        "invoice_disabled_support",
+    )
+
+    def to_tuple(self) -> Tuple[str, ...]:
+        return (
+            self.encounter_no,
+            str(self.invoice_sum),
+            str(self.invoice_insurance_sum),
+            str(self.invoice_insurance_patient_burden),
+            str(self.invoice_insurance_nhis_burden),
+            str(self.invoice_subsidy),
+            "Y" if self.invoice_is_fixed_patient_burden else "N",
+            str(self.invoice_patient_max_excess),
+            str(self.invoice_disabled_support),
+        )
+
     def to_row(self) -> Dict[str, str]:
-        return {
-            "encounter_no": self.encounter_no,
-            "invoice_sum": str(self.invoice_sum),
-            "invoice_insurance_sum": str(self.invoice_insurance_sum),
-            "invoice_insurance_patient_burden": str(self.invoice_insurance_patient_burden),
-            "invoice_insurance_nhis_burden": str(self.invoice_insurance_nhis_burden),
-            "invoice_subsidy": str(self.invoice_subsidy),
-            "invoice_is_fixed_patient_burden": "Y" if self.invoice_is_fixed_patient_burden else "N",
-            "invoice_patient_max_excess": str(self.invoice_patient_max_excess),
-            "invoice_disabled_support": str(self.invoice_disabled_support),
-        }
+        return dict(zip(self.COLUMNS, self.to_tuple()))
 
 
-@dataclass
+@dataclass(slots=True)
 class EncounterDxRecord:
     encounter_no: str
     dx_type_code: str
     kcd_code: str
 
+    COLUMNS: ClassVar[Tuple[str, ...]] = ("encounter_no", "dx_type_code", "dx_type_label", "kcd_code")
+
+    def to_tuple(self) -> Tuple[str, ...]:
+        return (
+            self.encounter_no,
+            self.dx_type_code,
+            DX_TYPE_LABELS.get(self.dx_type_code, ""),
+            self.kcd_code,
+        )
+
     def to_row(self) -> Dict[str, str]:
-        return {
-            "encounter_no": self.encounter_no,
-            "dx_type_code": self.dx_type_code,
-            "dx_type_label": DX_TYPE_LABELS.get(self.dx_type_code, ""),
-            "kcd_code": self.kcd_code,
-        }
+        return dict(zip(self.COLUMNS, self.to_tuple()))
 
 
-@dataclass
+@dataclass(slots=True)
 class EncounterItemRecord:
     encounter_no: str
     line_no: str
     item_code: str
-    daily_amount: Optional[Decimal]
+    # Daily amount in cents (the K020.3 field is 5 digits + 2 implied decimals).
+    daily_amount_cents: Optional[int]
     days: Optional[int]
-    detail_texts: List[str] = field(default_factory=list)
+    # Created on the first K020.4 detail; most items never get one.
+    detail_texts: Optional[List[str]] = None
+
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "encounter_no",
+        "line_no",
+        "encounter_item_number",
+        "item_code",
+        "daily_amount",
+        "days",
+        "detail_text",
+    )
+
+    @property
+    def daily_amount(self) -> Optional[Decimal]:
+        if self.daily_amount_cents is None:
+            return None
+        return Decimal(self.daily_amount_cents).scaleb(-2)
+
+    def to_tuple(self) -> Tuple[str, ...]:
+        return (
+            self.encounter_no,
+            self.line_no,
+            f"{self.encounter_no}{self.line_no}",
+            self.item_code,
+            _format_scaled_int(self.daily_amount_cents, 2),
+            str(self.days) if self.days is not None else "",
+            " | ".join(self.detail_texts) if self.detail_texts else "",
+        )
 
     def to_row(self) -> Dict[str, str]:
-        return {
-            "encounter_no": self.encounter_no,
-            "line_no": self.line_no,
-            "encounter_item_number": f"{self.encounter_no}{self.line_no}",
-            "item_code": self.item_code,
-            "daily_amount": _format_decimal(self.daily_amount, 2),
-            "days": str(self.days) if self.days is not None else "",
-            "detail_text": " | ".join(self.detail_texts),
-        }
+        return dict(zip(self.COLUMNS, self.to_tuple()))
 
     def add_detail_text(self, text: str) -> None:
         cleaned = text.strip()
-        if cleaned:
+        if not cleaned:
+            return
+        if self.detail_texts is None:
+            self.detail_texts = [cleaned]
+        else:
             self.detail_texts.append(cleaned)
 
 
-@dataclass
+@dataclass(slots=True)
 class EncounterRecord:
     encounter_no: str
     patient: Optional[PatientRecord] = None
@@ -349,26 +881,453 @@ class EncounterRecord:
     insurance: Optional[InsuranceRecord] = None
     invoice: Optional[InvoiceRecord] = None
 
-    def to_row(self) -> Dict[str, str]:
-        return {
-            "encounter_no": self.encounter_no,
-            "patient_encounter_no": self.patient.encounter_no if self.patient else "",
-            "encounter_date": self.encounter_date.isoformat() if self.encounter_date else "",
-            "license_no": self.license_no,
-            "has_dx": "Y" if self.dx_list else "N",
-            "has_items": "Y" if self.items else "N",
-            "treatment_days": str(self.treatment_days) if self.treatment_days is not None else "",
-            "inpatient_days": str(self.inpatient_days) if self.inpatient_days is not None else "",
-            "result_code": self.result_code,
-            "is_gongsang": "Y" if self.is_gongsang else "N",
-            "copay_type_code": self.copay_type_code,
-        }
+    COLUMNS: ClassVar[Tuple[str, ...]] = (
+        "encounter_no",
+        "patient_encounter_no",
+        "encounter_date",
+        "license_no",
+        "has_dx",
+        "has_items",
+        "treatment_days",
+        "inpatient_days",
+        "result_code",
+        "is_gongsang",
+        "copay_type_code",
+    )
+
+    def to_tuple(self, *, item_count: Optional[int] = None) -> Tuple[str, ...]:
+        # ``item_count`` overrides ``self.items`` once the items live in ``ItemColumns``.
+        has_items = bool(self.items) if item_count is None else item_count > 0
+        return (
+            self.encounter_no,
+            self.patient.encounter_no if self.patient else "",
+            self.encounter_date.isoformat() if self.encounter_date else "",
+            self.license_no,
+            "Y" if self.dx_list else "N",
+            "Y" if has_items else "N",
+            str(self.treatment_days) if self.treatment_days is not None else "",
+            str(self.inpatient_days) if self.inpatient_days is not None else "",
+            self.result_code,
+            "Y" if self.is_gongsang else "N",
+            self.copay_type_code,
+        )
+
+    def to_row(self, *, item_count: Optional[int] = None) -> Dict[str, str]:
+        return dict(zip(self.COLUMNS, self.to_tuple(item_count=item_count)))
+
+
+class ItemColumns:
+    """Columnar store for encounter items, grouped by ``encounter_no`` in sorted order.
+
+    Amounts and day counts live in parallel ``array('q')`` columns (``None`` is
+    stored as ``NULL``), ``line_no`` and ``item_code`` are interned into code
+    tables referenced by ``array('i')`` columns, and ``offsets`` maps the i-th
+    encounter of ``encounter_nos`` to the item range
+    ``offsets[i]:offsets[i + 1]``.  Detail texts are rare and kept sparsely by
+    row.  Build it with ``from_encounters`` once parsing is complete.
+    """
+
+    NULL = -(2**63)
+
+    def __init__(self) -> None:
+        self.encounter_nos: List[str] = []
+        self.offsets = array("q", [0])
+        self.line_no_codes = array("i")
+        self.item_code_codes = array("i")
+        self.amount_cents = array("q")
+        self.days = array("q")
+        self.detail_texts: Dict[int, str] = {}
+        self.line_no_table: List[str] = []
+        self.item_code_table: List[str] = []
+        self._line_no_lookup: Dict[str, int] = {}
+        self._item_code_lookup: Dict[str, int] = {}
+        self._encounter_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_encounters(
+        cls,
+        encounters: Dict[str, EncounterRecord],
+        *,
+        release: bool = True,
+    ) -> "ItemColumns":
+        """Copy every encounter's items into columns.
+
+        With ``release`` (the default) each ``EncounterRecord.items`` list is
+        emptied afterwards so the per-line objects can be garbage collected;
+        pass the store to ``export_results`` to keep ``has_items`` correct.
+        """
+        columns = cls()
+        for key in sorted(encounters.keys()):
+            record = encounters[key]
+            columns._append_encounter(key, record.items)
+            if release:
+                record.items = []
+        return columns
+
+    def _append_encounter(self, encounter_no: str, items: Sequence[EncounterItemRecord]) -> None:
+        null = self.NULL
+        for item in items:
+            row = len(self.amount_cents)
+            self.line_no_codes.append(self._intern(item.line_no, self.line_no_table, self._line_no_lookup))
+            self.item_code_codes.append(self._intern(item.item_code, self.item_code_table, self._item_code_lookup))
+            self.amount_cents.append(null if item.daily_amount_cents is None else item.daily_amount_cents)
+            self.days.append(null if item.days is None else item.days)
+            if item.detail_texts:
+                self.detail_texts[row] = " | ".join(item.detail_texts)
+        self._encounter_index[encounter_no] = len(self.encounter_nos)
+        self.encounter_nos.append(encounter_no)
+        self.offsets.append(len(self.amount_cents))
+
+    @staticmethod
+    def _intern(value: str, table: List[str], lookup: Dict[str, int]) -> int:
+        code = lookup.get(value)
+        if code is None:
+            code = len(table)
+            table.append(value)
+            lookup[value] = code
+        return code
+
+    def __len__(self) -> int:
+        return len(self.amount_cents)
+
+    def item_range(self, encounter_no: str) -> range:
+        index = self._encounter_index.get(encounter_no)
+        if index is None:
+            return range(0)
+        return range(self.offsets[index], self.offsets[index + 1])
+
+    def item_count(self, encounter_no: str) -> int:
+        return len(self.item_range(encounter_no))
+
+    def _row_tuples(self, encounter_no: str, rows: range) -> Iterator[Tuple[str, ...]]:
+        null = self.NULL
+        line_nos = self.line_no_table
+        item_codes = self.item_code_table
+        for row in rows:
+            line_no = line_nos[self.line_no_codes[row]]
+            amount = self.amount_cents[row]
+            days = self.days[row]
+            yield (
+                encounter_no,
+                line_no,
+                f"{encounter_no}{line_no}",
+                item_codes[self.item_code_codes[row]],
+                "" if amount == null else _format_scaled_int(amount, 2),
+                "" if days == null else str(days),
+                self.detail_texts.get(row, ""),
+            )
+
+    def iter_tuples(self, encounter_no: Optional[str] = None) -> Iterator[Tuple[str, ...]]:
+        """Yield ``EncounterItemRecord.COLUMNS`` rows, for one encounter or the whole table."""
+        if encounter_no is not None:
+            yield from self._row_tuples(encounter_no, self.item_range(encounter_no))
+            return
+        offsets = self.offsets
+        for index, key in enumerate(self.encounter_nos):
+            yield from self._row_tuples(key, range(offsets[index], offsets[index + 1]))
+
+    def iter_rows(self, encounter_no: Optional[str] = None) -> Iterator[Dict[str, str]]:
+        """``iter_tuples`` as ``encounter_items.csv`` row dicts."""
+        names = EncounterItemRecord.COLUMNS
+        for values in self.iter_tuples(encounter_no):
+            yield dict(zip(names, values))
+
+    def total_amount_cents(self) -> int:
+        null = self.NULL
+        return sum(amount for amount in self.amount_cents if amount != null)
+
+    def amount_cents_by_item_code(self) -> Dict[str, int]:
+        """Sum of ``daily_amount`` (in cents) per item code, scanning the columns only."""
+        null = self.NULL
+        totals = [0] * len(self.item_code_table)
+        for code, amount in zip(self.item_code_codes, self.amount_cents):
+            if amount != null:
+                totals[code] += amount
+        return {self.item_code_table[code]: total for code, total in enumerate(totals) if total}
+
+    def count_by_item_code(self) -> Dict[str, int]:
+        counts = [0] * len(self.item_code_table)
+        for code in self.item_code_codes:
+            counts[code] += 1
+        return {self.item_code_table[code]: count for code, count in enumerate(counts) if count}
+
+
+def file_digest(path: Path) -> Tuple[int, str]:
+    """Byte length and SHA-256 of one file (or zip member)."""
+    digest = hashlib.sha256()
+    size = 0
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def claim_set_digest(
+    claim_dir: Path,
+    layout: ClaimFileLayout,
+    known: Optional[Mapping[str, Tuple[int, str]]] = None,
+) -> str:
+    """SHA-256 over the layout's four claim files, each as name, length and content hash.
+
+    ``known`` maps file paths (as ``str``) to an already computed
+    ``file_digest``, such as the hashes of a batch manifest; other files are
+    read and hashed.  Missing files hash as absent.
+    """
+    digest = hashlib.sha256()
+    for filename in (layout.patient_file, layout.dx_file, layout.item_file, layout.detail_file):
+        path = claim_dir / filename
+        if path.is_file():
+            size, content = (known or {}).get(str(path)) or file_digest(path)
+            digest.update(f"{filename}\0{size}\0{content}\0".encode("ascii"))
+        else:
+            digest.update(f"{filename}\0missing\0".encode("ascii"))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _read_archive_names(archive: str, mtime_ns: int, size: int) -> Tuple[frozenset, Dict[str, str]]:
+    # Keyed by mtime and size so a rewritten archive is listed again.
+    with zipfile.ZipFile(archive) as handle:
+        names = frozenset(handle.namelist())
+    return names, {os.path.normcase(name): name for name in names}
+
+
+def _archive_names(archive: Path) -> Tuple[frozenset, Dict[str, str]]:
+    stat = archive.stat()
+    return _read_archive_names(str(archive), stat.st_mtime_ns, stat.st_size)
+
+
+def is_archive(path: Path) -> bool:
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+@dataclass(frozen=True)
+class ArchivePath:
+    """A file or folder inside a zip archive, usable where the parser takes a ``Path``.
+
+    It offers the subset of ``pathlib`` the parser and the parse cache use
+    (``/``, ``name``, ``exists``, ``is_file``, ``open``, ``read_bytes``,
+    ``resolve``, ``relative_to``).  Members are decompressed as they are read;
+    nothing is extracted to disk.  Unlike ``zipfile.Path`` it holds no open
+    archive, so it pickles into worker processes.  Member names are matched
+    case-insensitively where the platform's file names are.
+    """
+
+    archive: Path
+    # POSIX path inside the archive; "" is the archive root.
+    member: str = ""
+
+    def __truediv__(self, name: str) -> "ArchivePath":
+        return ArchivePath(self.archive, posixpath.join(self.member, name) if self.member else name)
+
+    def __str__(self) -> str:
+        return os.path.join(str(self.archive), *self.member.split("/")) if self.member else str(self.archive)
+
+    @property
+    def name(self) -> str:
+        return posixpath.basename(self.member) or self.archive.name
+
+    def _lookup(self) -> Optional[str]:
+        try:
+            names, folded = _archive_names(self.archive)
+        except (OSError, zipfile.BadZipFile):
+            return None
+        if self.member in names:
+            return self.member
+        return folded.get(os.path.normcase(self.member))
+
+    def is_file(self) -> bool:
+        member = self._lookup()
+        return member is not None and not member.endswith("/")
+
+    def is_dir(self) -> bool:
+        if not self.member:
+            return self.archive.is_file()
+        try:
+            names, _ = _archive_names(self.archive)
+        except (OSError, zipfile.BadZipFile):
+            return False
+        prefix = os.path.normcase(self.member.rstrip("/") + "/")
+        return any(os.path.normcase(name).startswith(prefix) for name in names)
+
+    def exists(self) -> bool:
+        return self.is_file() or self.is_dir()
+
+    def open(self, mode: str = "rb") -> Any:
+        if mode != "rb":
+            raise ValueError(f"{self} can only be opened for binary reading")
+        member = self._lookup()
+        if member is None:
+            raise FileNotFoundError(str(self))
+        # The member stream keeps the archive file open until it is closed.
+        with zipfile.ZipFile(self.archive) as handle:
+            return handle.open(member)
+
+    def read_bytes(self) -> bytes:
+        with self.open() as handle:
+            return handle.read()
+
+    def resolve(self) -> "ArchivePath":
+        return ArchivePath(self.archive.resolve(), self.member)
+
+    def relative_to(self, other: Path) -> Path:
+        return self.archive.relative_to(other).joinpath(*filter(None, self.member.split("/")))
+
+
+@dataclass
+class ClaimDiscovery:
+    claim_dirs: List[Tuple[Path, ClaimFileLayout]]
+    empty_children: List[Path]
+    # Skipped byte-identical claim folder -> the folder that is parsed instead.
+    duplicates: Dict[Path, Path] = field(default_factory=dict)
+
+
+class ClaimParseCache:
+    """On-disk cache of parsed encounters, one pickle per claim directory.
+
+    Entries are keyed by the resolved claim directory, its layout, the source
+    encoding, ``PARSER_VERSION`` and the SHA-256 of the four claim files, so any
+    edit to the inputs or the parser produces a new key.  The file mtime of an
+    entry doubles as its last-used timestamp: hits touch it and ``evict`` (run
+    after every parse) drops the least recently used entries once the cache
+    exceeds ``max_bytes``.
+    """
+
+    SUFFIX = ".pickle"
+
+    def __init__(self, cache_dir: Path, *, max_bytes: int = PARSE_CACHE_MAX_BYTES_DEFAULT) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key_for(
+        self,
+        claim_dir: Path,
+        layout: ClaimFileLayout,
+        encoding: str,
+        content_digest: Optional[str] = None,
+    ) -> str:
+        digest = hashlib.sha256()
+        content_digest = content_digest or claim_set_digest(claim_dir, layout)
+        for part in (PARSER_VERSION, encoding, layout.patient_file, str(claim_dir.resolve()), content_digest):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def contains(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[Dict[str, EncounterRecord]]:
+        path = self._path(key)
+        try:
+            with path.open("rb") as handle:
+                encounters = pickle.load(handle)
+        except FileNotFoundError:
+            return None
+        except Exception:  # noqa: BLE001
+            logging.warning("Discarding unreadable parse cache entry %s", path)
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return encounters
+
+    def put(self, key: str, encounters: Dict[str, EncounterRecord], *, claim_dir: Optional[Path] = None) -> None:
+        self.misses += 1
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        temp_path = path.with_suffix(".tmp")
+        try:
+            with temp_path.open("wb") as handle:
+                pickle.dump(encounters, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            temp_path.replace(path)
+        except OSError as exc:
+            logging.warning("Could not store parse cache entry for %s: %s", claim_dir or key, exc)
+            temp_path.unlink(missing_ok=True)
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+            total += stat.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def summary(self) -> str:
+        return f"{self.hits} hit(s), {self.misses} miss(es), {self.evictions} eviction(s)"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
 
 
 class EDIClaimParser:
-    def __init__(self, base_path: Path, encoding: str = ENCODING_DEFAULT) -> None:
+    def __init__(
+        self,
+        base_path: Path,
+        encoding: str = ENCODING_DEFAULT,
+        *,
+        decode_once: bool = True,
+        workers: int = 1,
+        cache: Optional[ClaimParseCache] = None,
+        prune_dirs: Iterable[str] = (),
+        dedupe: bool = False,
+        intern_strings: bool = True,
+        intern_max_entries: Optional[int] = None,
+        use_mmap: bool = False,
+        engine: str = "python",
+        file_digests: Optional[Mapping[str, Tuple[int, str]]] = None,
+    ) -> None:
         self.base_path = base_path
         self.encoding = encoding
+        self.decode_once = decode_once
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.cache = cache
+        self.prune_dirs = tuple(prune_dirs)
+        self.dedupe = dedupe
+        self.intern_pool = StringInternPool(intern_max_entries) if intern_strings else None
+        self.use_mmap = use_mmap
+        if engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine {engine!r}; expected one of {', '.join(PARSER_ENGINES)}")
+        if engine == "numpy" and np is None:
+            logging.warning("NumPy is not installed; using the python engine")
+            engine = "python"
+        self.engine = engine
+        # ``file_digest`` results the caller already has (see ``claim_set_digest``).
+        self.file_digests: Dict[str, Tuple[int, str]] = dict(file_digests or {})
+        self._claim_digests: Dict[Path, str] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters collected while parsing (string intern pool, parse cache)."""
+        stats: Dict[str, Any] = {}
+        if self.intern_pool is not None:
+            pool = self.intern_pool
+            stats["intern_entries"] = pool.entries
+            stats["intern_hits"] = pool.hits
+            stats["intern_misses"] = pool.misses
+            stats["intern_hit_rate"] = pool.hit_rate
+            stats["intern_saved_bytes"] = pool.saved_bytes
+        if self.cache is not None:
+            stats["cache_hits"] = self.cache.hits
+            stats["cache_misses"] = self.cache.misses
+            stats["cache_evictions"] = self.cache.evictions
+        return stats
 
     def discover_claim_dirs(self) -> List[Tuple[Path, ClaimFileLayout]]:
         """Return every directory that contains a supported claim file."""
@@ -376,39 +1335,165 @@ class EDIClaimParser:
 
     def parse_with_status(
         self,
+        *,
+        sink: Optional[Callable[[Path, Dict[str, EncounterRecord]], None]] = None,
     ) -> Tuple[
         Dict[str, EncounterRecord],
         List[Path],
         Dict[Path, str],
         Dict[str, List[str]],
     ]:
-        encounters: Dict[str, EncounterRecord] = {}
+        """Parse every claim directory and report per-folder status.
+
+        When ``sink`` is given, each directory's encounters are handed to it as
+        ``sink(claim_dir, encounters)`` as soon as that directory is parsed
+        instead of being merged into the returned dict (which then stays
+        empty); see ``export_streaming``.
+        """
         claim_dirs = self._discover_claim_dirs()
         if not claim_dirs:
             raise FileNotFoundError(f"Could not find any claim directories under {self.base_path}")
+        return self.parse_claim_dirs(claim_dirs, sink=sink)
+
+    def parse_claim_dirs(
+        self,
+        claim_dirs: List[Tuple[Path, ClaimFileLayout]],
+        *,
+        sink: Optional[Callable[[Path, Dict[str, EncounterRecord]], None]] = None,
+    ) -> Tuple[
+        Dict[str, EncounterRecord],
+        List[Path],
+        Dict[Path, str],
+        Dict[str, List[str]],
+    ]:
+        """Parse an explicit list of ``(claim_dir, layout)`` pairs; see ``parse_with_status``."""
+        encounters: Dict[str, EncounterRecord] = {}
         successes: List[Path] = []
         failures: Dict[Path, str] = {}
         month_map: Dict[str, List[str]] = {"건보": [], "자보": []}
-        for claim_dir, layout in claim_dirs:
-            try:
-                logging.info("Parsing claim folder %s", claim_dir)
-                claim_encounters = self._parse_claim_dir(claim_dir, layout)
-            except Exception as exc:  # noqa: BLE001
-                logging.exception("Failed to parse claim folder %s", claim_dir)
-                failures[claim_dir] = str(exc)
+        for claim_dir, layout, claim_encounters, error in self._iter_claim_results(claim_dirs):
+            if claim_encounters is None:
+                failures[claim_dir] = error
                 continue
             successes.append(claim_dir)
             month = self._extract_claim_month(claim_dir / layout.patient_file)
             month_key = self._format_month(month) if month else "알수없음"
             bucket = "건보" if layout is MI_LAYOUT else "자보"
             month_map.setdefault(bucket, []).append(month_key)
-            for encounter_no, record in claim_encounters.items():
-                if encounter_no in encounters:
-                    self._merge_records(encounters[encounter_no], record)
-                else:
-                    encounters[encounter_no] = record
+            if sink is not None:
+                sink(claim_dir, claim_encounters)
+                continue
+            self.merge_encounters(encounters, claim_encounters)
         return encounters, successes, failures, month_map
 
+    def merge_encounters(self, target: Dict[str, EncounterRecord], source: Dict[str, EncounterRecord]) -> None:
+        """Fold ``source`` into ``target``; encounters already in ``target`` take precedence."""
+        for encounter_no, record in source.items():
+            if encounter_no in target:
+                self._merge_records(target[encounter_no], record)
+            else:
+                target[encounter_no] = record
+
+    def _iter_claim_results(
+        self,
+        claim_dirs: List[Tuple[Path, ClaimFileLayout]],
+    ) -> Iterator[Tuple[Path, ClaimFileLayout, Optional[Dict[str, EncounterRecord]], str]]:
+        """Parse every claim directory, yielding results in ``claim_dirs`` order.
+
+        With ``workers > 1`` the directories are fanned out over a process pool;
+        results still come back in the sorted discovery order so merging stays
+        deterministic.  Directories found in the parse cache are loaded instead
+        of parsed, and freshly parsed ones are stored in it.
+        """
+        cache = self.cache
+        if cache is None:
+            yield from self._parse_claim_dirs(claim_dirs)
+            return
+        keys = {
+            claim_dir: cache.key_for(claim_dir, layout, self.encoding, self._claim_digests.get(claim_dir))
+            for claim_dir, layout in claim_dirs
+        }
+        misses = [(claim_dir, layout) for claim_dir, layout in claim_dirs if not cache.contains(keys[claim_dir])]
+        parsed = self._parse_claim_dirs(misses)
+        pending = {claim_dir for claim_dir, _ in misses}
+        for claim_dir, layout in claim_dirs:
+            if claim_dir in pending:
+                result = next(parsed)
+            else:
+                cached = cache.get(keys[claim_dir])
+                if cached is not None:
+                    logging.info("Loaded claim folder %s from the parse cache", claim_dir)
+                    yield claim_dir, layout, cached, ""
+                    continue
+                # Evicted or unreadable since the lookup: parse it in-line.
+                result = self._parse_one_claim_dir(claim_dir, layout)
+            if result[2] is not None:
+                cache.put(keys[claim_dir], result[2], claim_dir=claim_dir)
+            yield result
+        cache.evict()
+
+    def _parse_claim_dirs(
+        self,
+        claim_dirs: List[Tuple[Path, ClaimFileLayout]],
+    ) -> Iterator[Tuple[Path, ClaimFileLayout, Optional[Dict[str, EncounterRecord]], str]]:
+        if self.workers <= 1 or len(claim_dirs) <= 1:
+            for claim_dir, layout in claim_dirs:
+                yield self._parse_one_claim_dir(claim_dir, layout)
+            return
+        intern_pool = self.intern_pool
+        options = self._worker_options()
+        tasks = [(options, claim_dir, SUPPORTED_LAYOUTS.index(layout)) for claim_dir, layout in claim_dirs]
+        max_workers = min(self.workers, len(tasks))
+        logging.info("Parsing %d claim folders with %d worker processes", len(tasks), max_workers)
+        window = max_workers * PARSE_WINDOW_PER_WORKER
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending: deque = deque()
+            submitted = 0
+            for claim_dir, layout in claim_dirs:
+                # Refill the window before waiting so workers stay busy, then
+                # hand results over in folder order.
+                while submitted < len(tasks) and len(pending) < window:
+                    pending.append(executor.submit(_parse_claim_dir_worker, tasks[submitted]))
+                    submitted += 1
+                claim_encounters, error, details, intern_counts = pending.popleft().result()
+                if intern_pool is not None and intern_counts is not None:
+                    intern_pool.add_counts(*intern_counts)
+                if claim_encounters is None:
+                    logging.error("Failed to parse claim folder %s\n%s", claim_dir, details)
+                else:
+                    logging.info("Parsed claim folder %s", claim_dir)
+                try:
+                    yield claim_dir, layout, claim_encounters, error
+                except GeneratorExit:
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+    def _worker_options(self) -> Dict[str, Any]:
+        """Keyword arguments that rebuild this parser's line handling in a worker."""
+        pool = self.intern_pool
+        return {
+            "encoding": self.encoding,
+            "decode_once": self.decode_once,
+            "intern_strings": pool is not None,
+            "intern_max_entries": pool.max_entries if pool is not None else None,
+            "use_mmap": self.use_mmap,
+            "engine": self.engine,
+        }
+
+    def _parse_one_claim_dir(
+        self,
+        claim_dir: Path,
+        layout: ClaimFileLayout,
+    ) -> Tuple[Path, ClaimFileLayout, Optional[Dict[str, EncounterRecord]], str]:
+        try:
+            logging.info("Parsing claim folder %s", claim_dir)
+            claim_encounters = self._parse_claim_dir(claim_dir, layout)
+        except Exception as exc:  # noqa: BLE001
+            logging.exception("Failed to parse claim folder %s", claim_dir)
+            return claim_dir, layout, None, str(exc)
+        return claim_dir, layout, claim_encounters, ""
+
     def parse(self) -> Dict[str, EncounterRecord]:
         encounters, successes, failures, _ = self.parse_with_status()
         if failures:
@@ -468,15 +1553,112 @@ class EDIClaimParser:
             target.invoice = source.invoice
 
     def _discover_claim_dirs(self) -> List[Tuple[Path, ClaimFileLayout]]:
-        base = self.base_path
-        candidates: Dict[Path, ClaimFileLayout] = {}
-        for layout in SUPPORTED_LAYOUTS:
-            direct_file = base / layout.patient_file
-            if direct_file.exists():
-                candidates[base] = layout
-            for path in base.rglob(layout.patient_file):
-                candidates.setdefault(path.parent, layout)
-        return sorted(candidates.items(), key=lambda item: str(item[0]))
+        return self.discover().claim_dirs
+
+    def discover(self) -> ClaimDiscovery:
+        """Walk ``base_path`` once with ``os.scandir`` and classify every folder.
+
+        Each directory listing is checked for the marker files of every layout
+        at the same time (the first match in ``SUPPORTED_LAYOUTS`` wins), the
+        immediate children of ``base_path`` without any claim folder beneath
+        them are reported as empty, and folders named in ``prune_dirs`` are
+        skipped entirely.  Like ``Path.rglob`` the walk does not descend into
+        symlinked directories.  Zip archives (``base_path`` itself or any
+        ``*.zip`` met on the walk) are searched the same way, and their claim
+        folders come back as ``ArchivePath`` entries.
+        """
+        markers: Dict[str, int] = {}
+        for index, layout in enumerate(SUPPORTED_LAYOUTS):
+            markers.setdefault(os.path.normcase(layout.patient_file), index)
+        pruned = {os.path.normcase(name) for name in self.prune_dirs}
+        claim_dirs: List[Tuple[Path, ClaimFileLayout]] = []
+        children: List[str] = []
+        children_with_claims = set()
+        if self.base_path.is_file() and is_archive(self.base_path):
+            claim_dirs.extend(self._archive_claim_dirs(self.base_path, markers, pruned))
+        stack: List[Tuple[str, Optional[str]]] = [(str(self.base_path), None)]
+        while stack:
+            current, top_child = stack.pop()
+            try:
+                scanner = os.scandir(current)
+            except OSError:
+                continue
+            layout_index: Optional[int] = None
+            with scanner:
+                for entry in scanner:
+                    name = os.path.normcase(entry.name)
+                    marker = markers.get(name)
+                    if marker is not None and (layout_index is None or marker < layout_index):
+                        layout_index = marker
+                    if name in pruned:
+                        continue
+                    try:
+                        if top_child is None and entry.is_dir():
+                            children.append(entry.path)
+                        if not entry.is_dir(follow_symlinks=False):
+                            if is_archive(Path(entry.name)) and entry.is_file():
+                                found = self._archive_claim_dirs(Path(entry.path), markers, pruned)
+                                claim_dirs.extend(found)
+                                if found and top_child is not None:
+                                    children_with_claims.add(top_child)
+                            continue
+                    except OSError:
+                        continue
+                    stack.append((entry.path, top_child or entry.path))
+            if layout_index is not None:
+                claim_dirs.append((Path(current), SUPPORTED_LAYOUTS[layout_index]))
+                if top_child is not None:
+                    children_with_claims.add(top_child)
+        discovery = ClaimDiscovery(
+            claim_dirs=sorted(claim_dirs, key=lambda item: str(item[0])),
+            empty_children=[Path(child) for child in sorted(children) if child not in children_with_claims],
+        )
+        if self.dedupe:
+            self._drop_duplicate_claim_sets(discovery)
+        return discovery
+
+    @staticmethod
+    def _archive_claim_dirs(
+        archive: Path,
+        markers: Dict[str, int],
+        pruned: set,
+    ) -> List[Tuple[Path, ClaimFileLayout]]:
+        """Claim folders inside one zip archive, found from its member list alone."""
+        try:
+            names, _ = _archive_names(archive)
+        except (OSError, zipfile.BadZipFile) as exc:
+            logging.warning("Skipping unreadable archive %s: %s", archive, exc)
+            return []
+        found: Dict[str, int] = {}
+        for name in names:
+            folder, _, base = name.rpartition("/")
+            marker = markers.get(os.path.normcase(base))
+            if marker is None or any(os.path.normcase(part) in pruned for part in folder.split("/")):
+                continue
+            if folder not in found or marker < found[folder]:
+                found[folder] = marker
+        return [(ArchivePath(archive, folder), SUPPORTED_LAYOUTS[index]) for folder, index in found.items()]
+
+    def _drop_duplicate_claim_sets(self, discovery: ClaimDiscovery) -> None:
+        """Keep only the first (in sorted order) of byte-identical claim folders."""
+        seen: Dict[Tuple[str, str], Path] = {}
+        unique: List[Tuple[Path, ClaimFileLayout]] = []
+        for claim_dir, layout in discovery.claim_dirs:
+            digest = claim_set_digest(claim_dir, layout, self.file_digests)
+            self._claim_digests[claim_dir] = digest
+            original = seen.setdefault((layout.patient_file, digest), claim_dir)
+            if original is claim_dir:
+                unique.append((claim_dir, layout))
+            else:
+                discovery.duplicates[claim_dir] = original
+        discovery.claim_dirs = unique
+        if discovery.duplicates:
+            logging.info(
+                "Skipping %d duplicate claim folder(s) with byte-identical content:",
+                len(discovery.duplicates),
+            )
+            for duplicate, original in discovery.duplicates.items():
+                logging.info(" - %s (same as %s)", duplicate, original)
 
     def _parse_claim_dir(self, claim_dir: Path, layout: ClaimFileLayout) -> Dict[str, EncounterRecord]:
         encounters: Dict[str, EncounterRecord] = {}
@@ -497,76 +1679,156 @@ class EDIClaimParser:
                 insurance=insurance_map.get(encounter_no),
                 invoice=invoice_map.get(encounter_no),
             )
-        self._attach_dx(encounters, claim_dir / layout.dx_file)
-        self._attach_items(encounters, claim_dir / layout.item_file)
-        self._attach_details(encounters, claim_dir / layout.detail_file)
+        self._attach_dx(encounters, claim_dir / layout.dx_file, layout.dx_fields)
+        item_index = self._attach_items(encounters, claim_dir / layout.item_file, layout.item_fields)
+        self._attach_details(encounters, claim_dir / layout.detail_file, layout.detail_fields, item_index)
         return encounters
 
-    def _attach_dx(self, encounters: Dict[str, EncounterRecord], path: Path) -> None:
+    def _extractor(self, fields: Tuple[FieldSpec, ...]) -> RecordExtractor:
+        return compile_extractor(fields, self.encoding, self.decode_once)
+
+    def _line_extractor(self, fields: Tuple[FieldSpec, ...]) -> Callable[[bytes], Any]:
+        extractor = self._extractor(fields)
+        pool = self.intern_pool
+        if pool is None:
+            return extractor.extract
+        return lambda line: extractor.extract(line, pool)
+
+    def _attach_dx(
+        self,
+        encounters: Dict[str, EncounterRecord],
+        path: Path,
+        fields: Tuple[FieldSpec, ...] = DX_FIELDS,
+    ) -> None:
+        extract = self._line_extractor(fields)
         for line in self._iter_lines(path):
-            encounter_no = self._slice_text(line, 1, 15)
+            row = extract(line)
+            encounter_no = row.encounter_no
             if not encounter_no:
                 continue
-            dx_type_code = self._slice_text(line, 16, 1)
-            kcd_code = self._slice_text(line, 17, 6)
-            department_code = self._slice_text(line, 23, 2)
-            encounter_date_str = self._slice_text(line, 25, 8)
-            license_type_code = self._slice_text(line, 33, 1)
-            license_no = self._slice_text(line, 34, 10)
             encounter_record = encounters.setdefault(encounter_no, EncounterRecord(encounter_no=encounter_no))
-            encounter_date = _parse_date(encounter_date_str)
+            encounter_date = _parse_date(row.encounter_date)
             if encounter_date and not encounter_record.encounter_date:
                 encounter_record.encounter_date = encounter_date
-            if department_code and not encounter_record.department_code:
-                encounter_record.department_code = department_code
-            if license_type_code and not encounter_record.license_type_code:
-                encounter_record.license_type_code = license_type_code
-            if license_no and not encounter_record.license_no:
-                encounter_record.license_no = license_no
+            if row.department_code and not encounter_record.department_code:
+                encounter_record.department_code = row.department_code
+            if row.license_type_code and not encounter_record.license_type_code:
+                encounter_record.license_type_code = row.license_type_code
+            if row.license_no and not encounter_record.license_no:
+                encounter_record.license_no = row.license_no
             dx_row = EncounterDxRecord(
                 encounter_no=encounter_no,
-                dx_type_code=dx_type_code,
-                kcd_code=kcd_code,
+                dx_type_code=row.dx_type_code,
+                kcd_code=row.kcd_code,
             )
             encounter_record.dx_list.append(dx_row)
 
-    def _attach_items(self, encounters: Dict[str, EncounterRecord], path: Path) -> None:
-        for line in self._iter_lines(path):
-            encounter_no = self._slice_text(line, 1, 15)
+    def _attach_items(
+        self,
+        encounters: Dict[str, EncounterRecord],
+        path: Path,
+        fields: Tuple[FieldSpec, ...] = ITEM_FIELDS,
+    ) -> Dict[str, Dict[str, EncounterItemRecord]]:
+        """Attach item rows and return the per-encounter ``line_no -> item`` index."""
+        item_index: Dict[str, Dict[str, EncounterItemRecord]] = {}
+        rows: Optional[Iterable[Tuple[str, str, str, Optional[int], Optional[int]]]] = None
+        if self.engine == "numpy":
+            rows = self._item_rows_numpy(path, fields)
+        if rows is None:
+            rows = self._item_rows(path, fields)
+        for encounter_no, line_no, item_code, daily_amount_cents, days in rows:
             if not encounter_no:
                 continue
-            line_no = self._slice_text(line, 20, 4)
-            item_code = self._slice_text(line, 25, 9)
-            daily_amount = _parse_decimal(self._slice_text(line, 46, 7, strip=False), 2)
-            days_str = self._slice_text(line, 53, 3)
-            days = int(days_str) if days_str.isdigit() else None
             encounter_record = encounters.setdefault(encounter_no, EncounterRecord(encounter_no=encounter_no))
             item_record = EncounterItemRecord(
                 encounter_no=encounter_no,
                 line_no=line_no,
                 item_code=item_code,
-                daily_amount=daily_amount,
+                daily_amount_cents=daily_amount_cents,
                 days=days,
             )
             encounter_record.items.append(item_record)
+            # Details attach to the first item carrying a given line number.
+            item_index.setdefault(encounter_no, {}).setdefault(item_record.line_no, item_record)
+        return item_index
 
-    def _attach_details(self, encounters: Dict[str, EncounterRecord], path: Path) -> None:
+    def _item_rows(
+        self,
+        path: Path,
+        fields: Tuple[FieldSpec, ...],
+    ) -> Iterator[Tuple[str, str, str, Optional[int], Optional[int]]]:
+        """Yield ``(encounter_no, line_no, item_code, daily_amount_cents, days)`` per line."""
+        extract = self._line_extractor(fields)
         for line in self._iter_lines(path):
-            encounter_no = self._slice_text(line, 1, 15)
+            row = extract(line)
+            encounter_no = row.encounter_no
             if not encounter_no:
                 continue
-            occurrence_scope = self._slice_text(line, 16, 1)
-            if occurrence_scope != "2":
+            days_str = row.days
+            yield (
+                encounter_no,
+                row.line_no,
+                row.item_code,
+                _parse_scaled_int(row.daily_amount, 2),
+                int(days_str) if days_str.isdigit() else None,
+            )
+
+    def _item_rows_numpy(
+        self,
+        path: Path,
+        fields: Tuple[FieldSpec, ...],
+    ) -> Optional[Iterable[Tuple[str, str, str, Optional[int], Optional[int]]]]:
+        """``_item_rows`` cut column-wise with NumPy; ``None`` means use the Python path."""
+        if codecs.lookup(self.encoding).name not in DECODE_ONCE_CODECS:
+            return None
+        if not {"encounter_no", "line_no", "item_code", "daily_amount", "days"} <= {spec.name for spec in fields}:
+            return None
+        if not path.exists():
+            logging.info("Skipping missing file %s", path)
+            return ()
+        columns = _item_columns_numpy(
+            path.read_bytes(),
+            fields,
+            self._line_extractor(fields),
+            self.intern_pool,
+            self.encoding,
+        )
+        return zip(*columns)
+
+    def _attach_details(
+        self,
+        encounters: Dict[str, EncounterRecord],
+        path: Path,
+        fields: Tuple[FieldSpec, ...] = DETAIL_FIELDS,
+        item_index: Optional[Dict[str, Dict[str, EncounterItemRecord]]] = None,
+    ) -> None:
+        if item_index is None:
+            item_index = self._index_items(encounters)
+        extract = self._line_extractor(fields)
+        for line in self._iter_lines(path):
+            row = extract(line)
+            encounter_no = row.encounter_no
+            if not encounter_no:
+                continue
+            if row.occurrence_scope != "2":
                 # Only line-level details are required.
                 continue
-            line_no = self._slice_text(line, 17, 4)
-            detail_text = self._slice_text(line, 26, 700, strip=False).rstrip()
-            encounter_record = encounters.setdefault(encounter_no, EncounterRecord(encounter_no=encounter_no))
-            target_item = next((item for item in encounter_record.items if item.line_no == line_no), None)
+            line_no = row.line_no
+            encounters.setdefault(encounter_no, EncounterRecord(encounter_no=encounter_no))
+            target_item = item_index.get(encounter_no, {}).get(line_no)
             if not target_item:
                 logging.warning("Detail found without matching item: encounter=%s line=%s", encounter_no, line_no)
                 continue
-            target_item.add_detail_text(detail_text)
+            target_item.add_detail_text(row.detail_text.rstrip())
+
+    @staticmethod
+    def _index_items(encounters: Dict[str, EncounterRecord]) -> Dict[str, Dict[str, EncounterItemRecord]]:
+        item_index: Dict[str, Dict[str, EncounterItemRecord]] = {}
+        for encounter_no, record in encounters.items():
+            by_line = item_index.setdefault(encounter_no, {})
+            for item in record.items:
+                by_line.setdefault(item.line_no, item)
+        return item_index
 
     def _parse_patient_file(
         self,
@@ -582,28 +1844,34 @@ class EDIClaimParser:
         insurances: Dict[str, InsuranceRecord] = {}
         invoices: Dict[str, InvoiceRecord] = {}
         encounter_meta: Dict[str, Dict[str, Any]] = {}
+        extract = self._line_extractor(layout.patient_fields)
         for line in self._iter_lines(path):
-            claim_no = self._slice_text(line, 1, 10)
-            statement_no = self._slice_text(line, 11, 5)
+            row = extract(line)
+            claim_no = row.claim_no
+            statement_no = row.statement_no
             encounter_no = f"{claim_no}{statement_no}"
-            patient_name = self._slice_text(line, layout.patient_name_start, layout.patient_name_length)
-            identity_raw = self._slice_text(line, layout.patient_identity_start, layout.patient_identity_length)
-            identity = identity_raw.replace("-", "")
+            patient_name = row.patient_name
+            identity = row.identity.replace("-", "")
             identity_prefix = identity[:6]
             identity_suffix = identity[6:]
-            extra_fields: Dict[str, str] = {}
+            extra_fields: Optional[Dict[str, str]] = None
             if layout is AUTO_LAYOUT:
-                extra_fields = {
-                    "auto_accident_no": self._slice_text(line, 51, 30),
-                    "auto_guarantee_no": self._slice_text(line, 81, 17),
-                    "auto_visit_days": self._slice_text(line, 131, 3),
-                    "auto_inpatient_days": self._slice_text(line, 134, 3),
-                    "auto_result_code": self._slice_text(line, 137, 1),
-                    "auto_total_cost": self._slice_text(line, 138, 10),
-                    "auto_patient_payment": self._slice_text(line, 148, 10),
-                    "auto_claim_amount": self._slice_text(line, 158, 10),
-                    "auto_insurer_code": self._slice_text(line, 168, 2),
-                }
+                extra_fields = dict(
+                    zip(
+                        AUTO_PATIENT_EXTRA_COLUMNS,
+                        (
+                            row.accident_no,
+                            row.guarantee_no,
+                            row.visit_days,
+                            row.inpatient_days,
+                            row.result_code,
+                            row.total_cost,
+                            row.patient_payment,
+                            row.claim_amount,
+                            row.insurer_code,
+                        ),
+                    )
+                )
             patient = PatientRecord(
                 encounter_no=encounter_no,
                 claim_no=claim_no,
@@ -616,19 +1884,19 @@ class EDIClaimParser:
             )
             patients[encounter_no] = patient
             if layout is MI_LAYOUT:
-                medical_aid_code = self._slice_text(line, 39, 1)
-                special_code = self._slice_text(line, 40, 1)
-                copay_code = self._slice_text(line, 41, 1)
+                medical_aid_code = row.medical_aid_code
+                special_code = row.special_code
+                copay_code = row.copay_code
                 insurance_record = InsuranceRecord(
                     encounter_no=encounter_no,
                     insurance_type_code=medical_aid_code,
                     insurance_nhis_type=_derive_insurance_nhis_type(medical_aid_code, special_code),
-                    insurance_nhis_no=self._slice_text(line, 85, 20),
-                    insurance_form_no=self._slice_text(line, 16, 4),
-                    insurance_provider_code=self._slice_text(line, 20, 8),
-                    insurance_payer_code=self._slice_text(line, 28, 11),
-                    insurance_claim_type=self._slice_text(line, 42, 23),
-                    insurance_subscriber_name=self._slice_text(line, 65, 20),
+                    insurance_nhis_no=row.nhis_no,
+                    insurance_form_no=row.form_no,
+                    insurance_provider_code=row.provider_code,
+                    insurance_payer_code=row.payer_code,
+                    insurance_claim_type=row.claim_type,
+                    insurance_subscriber_name=row.subscriber_name,
                     insurance_medical_aid_code=medical_aid_code,
                     insurance_special_code=special_code,
                     insurance_copay_code=copay_code,
@@ -638,36 +1906,36 @@ class EDIClaimParser:
                 insurances[encounter_no] = insurance_record
                 invoice_record = InvoiceRecord(
                     encounter_no=encounter_no,
-                    invoice_sum=_parse_amount(self._slice_text(line, 176, 10)),
-                    invoice_insurance_sum=_parse_amount(self._slice_text(line, 176, 10)),
-                    invoice_insurance_patient_burden=_parse_amount(self._slice_text(line, 186, 10)),
-                    invoice_insurance_nhis_burden=_parse_amount(self._slice_text(line, 206, 10)),
-                    invoice_subsidy=_parse_amount(self._slice_text(line, 216, 10)),
+                    invoice_sum=_parse_amount(row.invoice_sum),
+                    invoice_insurance_sum=_parse_amount(row.invoice_sum),
+                    invoice_insurance_patient_burden=_parse_amount(row.patient_burden),
+                    invoice_insurance_nhis_burden=_parse_amount(row.nhis_burden),
+                    invoice_subsidy=_parse_amount(row.subsidy),
                     invoice_is_fixed_patient_burden=copay_code == "2",
-                    invoice_patient_max_excess=_parse_amount(self._slice_text(line, 196, 10)),
-                    invoice_disabled_support=_parse_amount(self._slice_text(line, 226, 10)),
+                    invoice_patient_max_excess=_parse_amount(row.patient_max_excess),
+                    invoice_disabled_support=_parse_amount(row.disabled_support),
                 )
                 invoices[encounter_no] = invoice_record
                 encounter_meta[encounter_no] = {
-                    "treatment_days": _parse_int(self._slice_text(line, 138, 3)),
-                    "inpatient_days": _parse_int(self._slice_text(line, 141, 3)),
-                    "result_code": self._slice_text(line, 175, 1),
+                    "treatment_days": _parse_int(row.treatment_days),
+                    "inpatient_days": _parse_int(row.inpatient_days),
+                    "result_code": row.result_code,
                     "is_gongsang": special_code == "1",
                     "copay_type_code": copay_code,
                 }
             elif layout is AUTO_LAYOUT:
-                auto_insurer_code = self._slice_text(line, 168, 2)
+                auto_insurer_code = row.insurer_code
                 auto_company_name = AUTO_INSURER_COMPANIES.get(auto_insurer_code, "")
                 insurance_record = InsuranceRecord(
                     encounter_no=encounter_no,
                     insurance_type_code="2",
-                    insurance_form_no=self._slice_text(line, 16, 4),
-                    insurance_provider_code=self._slice_text(line, 20, 8),
+                    insurance_form_no=row.form_no,
+                    insurance_provider_code=row.provider_code,
                     insurance_payer_code=auto_insurer_code,
-                    insurance_claim_type=self._slice_text(line, 28, 23),
+                    insurance_claim_type=row.claim_type,
                     insurance_subscriber_name=patient_name,
-                    insurance_ta_reg_no=self._slice_text(line, 51, 30),
-                    insurance_ta_ins_no=self._slice_text(line, 81, 17),
+                    insurance_ta_reg_no=row.accident_no,
+                    insurance_ta_ins_no=row.guarantee_no,
                     insurance_ta_company_code=auto_insurer_code,
                     insurance_ta_company_name=auto_company_name,
                     claim_no=claim_no,
@@ -676,18 +1944,18 @@ class EDIClaimParser:
                 insurances[encounter_no] = insurance_record
                 invoice_record = InvoiceRecord(
                     encounter_no=encounter_no,
-                    invoice_sum=_parse_amount(self._slice_text(line, 138, 10)),
-                    invoice_insurance_sum=_parse_amount(self._slice_text(line, 138, 10)),
-                    invoice_insurance_patient_burden=_parse_amount(self._slice_text(line, 148, 10)),
-                    invoice_insurance_nhis_burden=_parse_amount(self._slice_text(line, 158, 10)),
+                    invoice_sum=_parse_amount(row.total_cost),
+                    invoice_insurance_sum=_parse_amount(row.total_cost),
+                    invoice_insurance_patient_burden=_parse_amount(row.patient_payment),
+                    invoice_insurance_nhis_burden=_parse_amount(row.claim_amount),
                     invoice_subsidy=0,
                     invoice_is_fixed_patient_burden=False,
                 )
                 invoices[encounter_no] = invoice_record
                 encounter_meta[encounter_no] = {
-                    "treatment_days": _parse_int(self._slice_text(line, 131, 3)),
-                    "inpatient_days": _parse_int(self._slice_text(line, 134, 3)),
-                    "result_code": self._slice_text(line, 137, 1),
+                    "treatment_days": _parse_int(row.visit_days),
+                    "inpatient_days": _parse_int(row.inpatient_days),
+                    "result_code": row.result_code,
                     "is_gongsang": False,
                     "copay_type_code": "",
                 }
@@ -702,30 +1970,485 @@ class EDIClaimParser:
             return text.strip()
         return text
 
-    def _iter_lines(self, path: Path) -> Iterable[bytes]:
+    def _iter_lines(self, path: Path) -> Iterable[Line]:
+        """Yield every line of ``path`` without its line terminator.
+
+        With ``use_mmap`` files are memory-mapped: ASCII lines are then handed
+        out as ``memoryview`` slices of the mapping, valid only until the next
+        line is requested, so bytes are only copied for the fields the
+        extractor keeps.  Lines with non-ASCII bytes are yielded as ``bytes``.
+        Empty files and platforms where ``mmap`` fails use the buffered reader,
+        which is also the default: CPython's C-level line iteration still
+        outruns the per-line ``memoryview`` bookkeeping on typical claim files.
+        """
         if not path.exists():
             logging.info("Skipping missing file %s", path)
             return []
         with path.open("rb") as handle:
-            for raw_line in handle:
-                yield raw_line.rstrip(b"\r\n")
+            if isinstance(path, ArchivePath):
+                # A decompressed stream: nothing to map, and ``ZipExtFile``
+                # line iteration runs in Python, so split whole chunks instead.
+                yield from _iter_chunked_lines(handle)
+                return
+            mapped = self._map_file(handle) if self.use_mmap else None
+            if mapped is None:
+                for raw_line in handle:
+                    yield raw_line.rstrip(b"\r\n")
+                return
+            yield from _iter_mapped_lines(mapped)
+
+    @staticmethod
+    def _map_file(handle: Any) -> Optional[mmap.mmap]:
+        try:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            logging.debug("Falling back to buffered reads for %s: %s", handle.name, exc)
+            return None
+
+
+def _iter_chunked_lines(handle: Any, chunk_size: int = ARCHIVE_READ_CHUNK) -> Iterator[bytes]:
+    """Same lines as iterating ``handle``, read ``chunk_size`` bytes at a time."""
+    carry = b""
+    while True:
+        chunk = handle.read(chunk_size)
+        if not chunk:
+            break
+        lines = (carry + chunk).split(b"\n")
+        carry = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if carry:
+        yield carry.rstrip(b"\r\n")
+
+
+def _find_non_ascii(mapped: mmap.mmap, start: int, size: int) -> int:
+    # ``bytes.isascii`` on a copied block is far faster than a regex scan of
+    # the mapping; the regex only pinpoints the byte inside a mixed block.
+    position = start
+    while position < size:
+        block_end = min(position + MMAP_ASCII_BLOCK, size)
+        if not mapped[position:block_end].isascii():
+            return _NON_ASCII_BYTE.search(mapped, position, block_end).start()
+        position = block_end
+    return size
+
+
+def _iter_mapped_lines(mapped: mmap.mmap) -> Iterator[Line]:
+    view = memoryview(mapped)
+    size = len(mapped)
+    find = mapped.find
+    start = 0
+    # Offset of the next non-ASCII byte at or after ``start``; recomputed only
+    # once a line has passed it.
+    non_ascii_at = -1
+    try:
+        while start < size:
+            newline = find(b"\n", start)
+            end = size if newline < 0 else newline
+            next_start = end + 1
+            while end > start and mapped[end - 1] == 0x0D:
+                end -= 1
+            if non_ascii_at < start:
+                non_ascii_at = _find_non_ascii(mapped, start, size)
+            if non_ascii_at >= end:
+                line = view[start:end]
+                yield line
+                line.release()
+            else:
+                yield mapped[start:end]
+            start = next_start
+    finally:
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # A caller still holds a slice of the mapping; it is unmapped once
+            # that view is garbage collected.
+            pass
+
+
+def _item_columns_numpy(
+    data: bytes,
+    fields: Tuple[FieldSpec, ...],
+    extract: Callable[[bytes], Any],
+    pool: Optional[StringInternPool],
+    encoding: str,
+) -> Tuple[List[str], List[str], List[str], List[Optional[int]], List[Optional[int]]]:
+    """Cut a whole item file into ``_item_rows`` columns with NumPy.
+
+    Lines are split exactly like ``_iter_lines``.  Every line of the most
+    common width whose bytes are all printable ASCII becomes a row of a
+    ``uint8`` matrix; string fields are decoded once per distinct value (so
+    rows share their ``str`` objects) and the amount and day fields are
+    converted from their digit columns.  Every other line - ragged, non-ASCII,
+    or with control bytes - goes through ``extract`` like the Python engine.
+    Lines without an ``encounter_no`` come back with an empty one.
+    """
+    specs = {spec.name: spec for spec in fields}
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buffer == 0x0A)
+    starts = np.concatenate(([0], newlines + 1))
+    raw_ends = np.concatenate((newlines, [buffer.size]))
+    if starts[-1] == buffer.size:
+        # A trailing newline does not start another line.
+        starts = starts[:-1]
+        raw_ends = raw_ends[:-1]
+    line_count = starts.size
+    empty: Tuple[List[str], List[str], List[str], List[Optional[int]], List[Optional[int]]] = ([], [], [], [], [])
+    if not line_count:
+        return empty
+    ends = raw_ends - ((raw_ends > starts) & (buffer[np.maximum(raw_ends - 1, 0)] == 0x0D))
+    lengths = ends - starts
+    width = int(np.bincount(lengths).argmax())
+    is_regular = lengths == width if width else np.zeros(line_count, dtype=bool)
+    # Control and non-ASCII bytes inside a line (not its terminator) send the
+    # line to the Python path.
+    unusual = np.flatnonzero(((buffer < 0x20) & (buffer != 0x0A)) | (buffer >= 0x80))
+    if unusual.size:
+        owners = np.searchsorted(starts, unusual, side="right") - 1
+        is_regular[owners[unusual < ends[owners]]] = False
+    regular = np.flatnonzero(is_regular)
+    regular_starts = starts[regular]
+    stride = int(regular_starts[1] - regular_starts[0]) if regular.size > 1 else width
+    if regular.size and (regular.size == 1 or (np.diff(regular_starts) == stride).all()):
+        # Evenly spaced lines (the usual fixed-width file): a strided view, no copy.
+        matrix = np.lib.stride_tricks.as_strided(
+            buffer[int(regular_starts[0]) :],
+            shape=(regular.size, width),
+            strides=(stride, 1),
+            writeable=False,
+        )
+    else:
+        matrix = buffer[regular_starts[:, None] + np.arange(width)]
+
+    def text_column(spec: FieldSpec) -> List[str]:
+        begin = min(max(spec.start - 1, 0), width)
+        end = min(begin + spec.length, width)
+        if begin == end:
+            raw = [b""] * len(regular)
+        else:
+            raw = np.ascontiguousarray(matrix[:, begin:end]).view(f"S{end - begin}").ravel().tolist()
+        if pool is not None and spec.intern and spec.strip:
+            values = {value: pool.intern_repeated(value, encoding, count) for value, count in Counter(raw).items()}
+        elif spec.strip:
+            values = {value: value.decode("ascii").strip() for value in set(raw)}
+        else:
+            values = {value: value.decode("ascii") for value in set(raw)}
+        return list(map(values.__getitem__, raw))
+
+    def digit_column(spec: FieldSpec) -> Tuple[List[int], Any, Any]:
+        # Value, "plain digits after stripping" mask and "only blanks" mask.
+        begin = min(max(spec.start - 1, 0), width)
+        end = min(begin + spec.length, width)
+        if begin == end:
+            return [0] * len(regular), np.zeros(len(regular), dtype=bool), np.ones(len(regular), dtype=bool)
+        block = matrix[:, begin:end].astype(np.int64)
+        digits = (block >= 0x30) & (block <= 0x39)
+        blanks = block == 0x20
+        digit_count = digits.sum(axis=1)
+        positions = np.arange(end - begin)
+        first = np.where(digits, positions, end - begin).min(axis=1)
+        last = np.where(digits, positions, -1).max(axis=1)
+        plain = (digits | blanks).all(axis=1) & (digit_count > 0) & (last - first + 1 == digit_count)
+        exponents = np.clip(last[:, None] - positions, 0, None)
+        values = np.where(digits, (block - 0x30) * 10**exponents, 0).sum(axis=1)
+        return values.tolist(), plain, blanks.all(axis=1)
+
+    encounter_nos = text_column(specs["encounter_no"])
+    line_nos = text_column(specs["line_no"])
+    item_codes = text_column(specs["item_code"])
+    amounts, amount_plain, amount_blank = digit_column(specs["daily_amount"])
+    days, days_plain, _ = digit_column(specs["days"])
+    for row in np.flatnonzero(~days_plain).tolist():
+        days[row] = None
+    amount_spec = specs["daily_amount"]
+    for row in np.flatnonzero(~amount_plain).tolist():
+        if amount_blank[row] or not encounter_nos[row]:
+            amounts[row] = None
+            continue
+        # Signs, decimal points and other oddities keep the Decimal-based path.
+        begin = max(amount_spec.start - 1, 0)
+        raw_amount = matrix[row, begin : begin + amount_spec.length].tobytes().decode("ascii")
+        amounts[row] = _parse_scaled_int(raw_amount, 2)
+
+    columns = (encounter_nos, line_nos, item_codes, amounts, days)
+    if len(regular) == line_count:
+        return columns
+    # Place the regular rows at their line positions and extract the rest.
+    merged = []
+    for column in columns:
+        placed = np.empty(line_count, dtype=object)
+        placed[regular] = np.array(column, dtype=object)
+        merged.append(placed)
+    irregular = np.ones(line_count, dtype=bool)
+    irregular[regular] = False
+    for position in np.flatnonzero(irregular).tolist():
+        line = data[int(starts[position]) : int(raw_ends[position])].rstrip(b"\r\n")
+        row = extract(line)
+        encounter_no = row.encounter_no
+        merged[0][position] = encounter_no
+        merged[1][position] = row.line_no
+        merged[2][position] = row.item_code
+        merged[3][position] = _parse_scaled_int(row.daily_amount, 2) if encounter_no else None
+        merged[4][position] = int(row.days) if row.days.isdigit() else None
+    return tuple(column.tolist() for column in merged)  # type: ignore[return-value]
+
+
+def _parse_claim_dir_worker(
+    task: Tuple[Dict[str, Any], Path, int],
+) -> Tuple[Optional[Dict[str, EncounterRecord]], str, str, Optional[Tuple[int, int, int, int]]]:
+    """Process-pool entry point: parse one claim directory.
+
+    The layout travels as an index into ``SUPPORTED_LAYOUTS`` because the
+    parser relies on identity checks (``layout is MI_LAYOUT``) that an
+    unpickled copy would fail.  Returns ``(encounters, error, traceback,
+    intern_counts)``; the worker's string intern pool counters are folded into
+    the parent's pool.
+    """
+    options, claim_dir, layout_index = task
+    parser = EDIClaimParser(claim_dir, **options)
+    encounters: Optional[Dict[str, EncounterRecord]] = None
+    error = details = ""
+    try:
+        encounters = parser._parse_claim_dir(claim_dir, SUPPORTED_LAYOUTS[layout_index])
+    except Exception as exc:  # noqa: BLE001
+        error, details = str(exc), traceback.format_exc().rstrip()
+    pool = parser.intern_pool
+    return encounters, error, details, pool.counts() if pool is not None else None
+
+
+class _CountingWriter(io.RawIOBase):
+    """Binary sink that counts the bytes passed on to a compressor.
 
+    Closing it closes ``closables`` in order (the compressor, then the file
+    underneath when the compressor does not own it).
+    """
 
-def _export_csv(rows: List[Dict[str, str]], path: Path, *, encoding: str) -> None:
-    if not rows:
-        logging.info("No rows for %s, skipping", path.name)
+    def __init__(self, target: Any, closables: Sequence[Any]) -> None:
+        self.target = target
+        self.closables = list(closables)
+        self.count = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.target.write(data)
+        size = len(data) if isinstance(data, bytes) else memoryview(data).nbytes
+        self.count += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            for closable in self.closables:
+                closable.close()
+        super().close()
+
+
+def check_compression(compression: Optional[str]) -> None:
+    """Raise ``ValueError`` for an unknown codec or a missing ``zstandard``."""
+    if compression is None:
         return
-    fieldnames: List[str] = []
-    for row in rows:
-        for key in row.keys():
-            if key not in fieldnames:
-                fieldnames.append(key)
-    with path.open("w", newline="", encoding=encoding) as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
-    logging.info("Wrote %s (%d rows)", path, len(rows))
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression {compression!r}; expected one of {', '.join(COMPRESSION_SUFFIXES)}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the zstandard package (pip install zstandard)")
+
+
+def compressed_name(name: str, compression: Optional[str]) -> str:
+    """Output file name of ``name`` (e.g. ``patients.csv``) under ``compression``."""
+    return name + COMPRESSION_SUFFIXES[compression] if compression else name
+
+
+class _CSVTableWriter:
+    """One output CSV with a declared header, written in ``writerows`` batches.
+
+    Rows are tuples in ``columns`` order.  The file is created on the first
+    flush, so a table without rows is skipped like before.  With
+    ``compression`` (``gzip`` or ``zstd``) the text is streamed through the
+    compressor as the batches are written, ``path`` gets the codec suffix
+    and ``raw_bytes`` counts the uncompressed CSV bytes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[str],
+        *,
+        encoding: str,
+        batch_rows: int = CSV_WRITE_BATCH_ROWS,
+        compression: Optional[str] = None,
+        compression_level: Optional[int] = None,
+    ) -> None:
+        check_compression(compression)
+        self.path = path.with_name(compressed_name(path.name, compression))
+        self.columns = tuple(columns)
+        self.encoding = encoding
+        self.batch_rows = max(batch_rows, 1)
+        self.compression = compression
+        self.compression_level = (
+            compression_level
+            if compression_level is not None or compression is None
+            else COMPRESSION_DEFAULT_LEVELS[compression]
+        )
+        self.rows = 0
+        self._pending: List[Sequence[str]] = []
+        self._handle: Any = None
+        self._writer: Any = None
+        self._counter: Optional[_CountingWriter] = None
+
+    @property
+    def raw_bytes(self) -> int:
+        if self._counter is not None:
+            return self._counter.count
+        return self.path.stat().st_size if self._handle is not None and self._handle.closed else 0
+
+    def _open(self) -> Any:
+        if self.compression is None:
+            return self.path.open("w", newline="", encoding=self.encoding, buffering=CSV_WRITE_BUFFER_BYTES)
+        raw = self.path.open("wb")
+        if self.compression == "gzip":
+            # No file name or timestamp in the header: identical rows give identical files.
+            compressor = gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=self.compression_level, mtime=0)
+            closables = [compressor, raw]
+        else:
+            compressor = zstandard.ZstdCompressor(level=self.compression_level).stream_writer(raw)
+            closables = [compressor]
+        self._counter = _CountingWriter(compressor, closables)
+        buffered = io.BufferedWriter(self._counter, CSV_WRITE_BUFFER_BYTES)
+        return io.TextIOWrapper(buffered, encoding=self.encoding, newline="")
+
+    def write(self, row: Sequence[str]) -> None:
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_rows:
+            self._flush()
+
+    def write_many(self, rows: Iterable[Sequence[str]]) -> None:
+        iterator = iter(rows)
+        while True:
+            chunk = list(islice(iterator, self.batch_rows - len(self._pending)))
+            if not chunk:
+                return
+            self._pending.extend(chunk)
+            if len(self._pending) >= self.batch_rows:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if self._writer is None:
+            self._handle = self._open()
+            self._writer = csv.writer(self._handle)
+            self._writer.writerow(self.columns)
+        self._writer.writerows(self._pending)
+        self.rows += len(self._pending)
+        self._pending = []
+
+    def close(self) -> None:
+        self._flush()
+        if self._handle is None:
+            logging.info("No rows for %s, skipping", self.path.name)
+            return
+        self._handle.close()
+        logging.info("Wrote %s (%d rows)", self.path, self.rows)
+
+
+def _patient_extra_columns(encounters: Iterable[EncounterRecord]) -> Tuple[str, ...]:
+    for record in encounters:
+        if record.patient and record.patient.extra_fields:
+            return AUTO_PATIENT_EXTRA_COLUMNS
+    return ()
+
+
+@dataclass(frozen=True)
+class ExportTableStats:
+    # CSV file name, or SQLite table name (whose ``bytes`` is always 0).
+    name: str
+    rows: int
+    # Size on disk; ``raw_bytes`` is the CSV text before compression.
+    bytes: int
+    seconds: float
+    raw_bytes: int = 0
+
+
+def _table_rows(
+    table: str,
+    encounters: Sequence[EncounterRecord],
+    patient_extra_columns: Tuple[str, ...],
+    item_columns: Optional[ItemColumns],
+) -> Tuple[Tuple[str, ...], Iterator[Sequence[str]]]:
+    """Declared columns and row generator of one ``EXPORT_TABLES`` entry."""
+    if table == "patients.csv":
+        return PatientRecord.COLUMNS + patient_extra_columns, (
+            record.patient.to_tuple(patient_extra_columns) for record in encounters if record.patient
+        )
+    if table == "encounters.csv":
+        if item_columns is None:
+            return EncounterRecord.COLUMNS, (record.to_tuple() for record in encounters)
+        return EncounterRecord.COLUMNS, (
+            record.to_tuple(item_count=item_columns.item_count(record.encounter_no)) for record in encounters
+        )
+    if table == "encounter_dx.csv":
+        return EncounterDxRecord.COLUMNS, (dx.to_tuple() for record in encounters for dx in record.dx_list)
+    if table == "encounter_items.csv":
+        if item_columns is None:
+            return EncounterItemRecord.COLUMNS, (item.to_tuple() for record in encounters for item in record.items)
+        return EncounterItemRecord.COLUMNS, (
+            row for record in encounters for row in item_columns.iter_tuples(record.encounter_no)
+        )
+    if table == "insurances.csv":
+        return InsuranceRecord.COLUMNS, (record.insurance.to_tuple() for record in encounters if record.insurance)
+    if table == "invoices.csv":
+        return InvoiceRecord.COLUMNS, (record.invoice.to_tuple() for record in encounters if record.invoice)
+    raise ValueError(f"Unknown export table {table!r}")
+
+
+def _write_table(
+    table: str,
+    output_dir: Path,
+    encounters: Sequence[EncounterRecord],
+    *,
+    encoding: str,
+    patient_extra_columns: Tuple[str, ...],
+    item_columns: Optional[ItemColumns],
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> ExportTableStats:
+    started = time.perf_counter()
+    columns, rows = _table_rows(table, encounters, patient_extra_columns, item_columns)
+    writer = _CSVTableWriter(
+        output_dir / table,
+        columns,
+        encoding=encoding,
+        compression=compression,
+        compression_level=compression_level,
+    )
+    try:
+        writer.write_many(rows)
+    finally:
+        writer.close()
+    size = writer.path.stat().st_size if writer.rows else 0
+    return ExportTableStats(
+        writer.path.name,
+        writer.rows,
+        size,
+        time.perf_counter() - started,
+        writer.raw_bytes if writer.rows else 0,
+    )
+
+
+# Set by ``export_results`` right before it forks the table writers in
+# ``processes`` mode, so the children inherit the encounters instead of
+# receiving a pickled copy: ``(output_dir, encounters, _write_table options)``.
+_FORKED_EXPORT: Optional[Tuple[Path, Sequence[EncounterRecord], Dict[str, Any]]] = None
+
+
+def _write_forked_table(table: str) -> ExportTableStats:
+    assert _FORKED_EXPORT is not None
+    output_dir, encounters, options = _FORKED_EXPORT
+    return _write_table(table, output_dir, encounters, **options)
 
 
 def export_results(
@@ -733,33 +2456,628 @@ def export_results(
     output_dir: Path,
     *,
     output_encoding: str = OUTPUT_ENCODING_DEFAULT,
-) -> None:
+    item_columns: Optional[ItemColumns] = None,
+    mode: str = "serial",
+    target: str = "csv",
+    sqlite_path: Optional[Path] = None,
+    partitioned: bool = False,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> List[ExportTableStats]:
+    """Write the six CSV files and return per-file row, byte and timing stats.
+
+    ``mode`` is one of ``EXPORT_MODES``: ``threads`` writes every table from its
+    own thread (overlapping file I/O), ``processes`` from its own forked
+    process (parallel row formatting and encoding).  Forking is needed so the
+    workers inherit the encounters; where it is unavailable (Windows, macOS
+    defaults aside) ``processes`` falls back to ``threads``.
+
+    With ``target="sqlite"`` the same tables are upserted into the SQLite
+    database ``sqlite_path`` (default ``output_dir / SQLITE_DEFAULT_NAME``)
+    instead, see ``export_sqlite``; ``mode`` does not apply there.
+    ``partitioned`` splits the CSVs by claim month and insurance kind, see
+    ``export_partitioned``.  ``compression`` (``gzip`` or, with the optional
+    ``zstandard`` package, ``zstd``) streams every CSV through that codec at
+    ``compression_level`` (default ``COMPRESSION_DEFAULT_LEVELS``).
+    """
+    global _FORKED_EXPORT
+    if target not in EXPORT_TARGETS:
+        raise ValueError(f"Unknown export target {target!r}; expected one of {', '.join(EXPORT_TARGETS)}")
+    if target == "sqlite":
+        if partitioned:
+            raise ValueError("Partitioned output is only available for CSV files")
+        return export_sqlite(encounters, sqlite_path or output_dir / SQLITE_DEFAULT_NAME, item_columns=item_columns)
+    if partitioned:
+        return export_partitioned(
+            encounters,
+            output_dir,
+            output_encoding=output_encoding,
+            item_columns=item_columns,
+            mode=mode,
+            compression=compression,
+            compression_level=compression_level,
+        )
+    check_compression(compression)
+    if mode not in EXPORT_MODES:
+        raise ValueError(f"Unknown export mode {mode!r}; expected one of {', '.join(EXPORT_MODES)}")
+    if mode == "processes" and "fork" not in multiprocessing.get_all_start_methods():
+        logging.info("Forked export workers are not available on this platform; using threads")
+        mode = "threads"
     output_dir.mkdir(parents=True, exist_ok=True)
     sorted_encounters = [encounters[key] for key in sorted(encounters.keys())]
-    patient_rows: List[Dict[str, str]] = []
-    encounter_rows: List[Dict[str, str]] = []
-    dx_rows: List[Dict[str, str]] = []
-    item_rows: List[Dict[str, str]] = []
-    insurance_rows: List[Dict[str, str]] = []
-    invoice_rows: List[Dict[str, str]] = []
-
-    for record in sorted_encounters:
-        if record.patient:
-            patient_rows.append(record.patient.to_row())
-        encounter_rows.append(record.to_row())
-        dx_rows.extend(dx.to_row() for dx in record.dx_list)
-        item_rows.extend(item.to_row() for item in record.items)
-        if record.insurance:
-            insurance_rows.append(record.insurance.to_row())
-        if record.invoice:
-            invoice_rows.append(record.invoice.to_row())
-
-    _export_csv(patient_rows, output_dir / "patients.csv", encoding=output_encoding)
-    _export_csv(encounter_rows, output_dir / "encounters.csv", encoding=output_encoding)
-    _export_csv(dx_rows, output_dir / "encounter_dx.csv", encoding=output_encoding)
-    _export_csv(item_rows, output_dir / "encounter_items.csv", encoding=output_encoding)
-    _export_csv(insurance_rows, output_dir / "insurances.csv", encoding=output_encoding)
-    _export_csv(invoice_rows, output_dir / "invoices.csv", encoding=output_encoding)
+    options: Dict[str, Any] = {
+        "encoding": output_encoding,
+        "patient_extra_columns": _patient_extra_columns(sorted_encounters),
+        "item_columns": item_columns,
+        "compression": compression,
+        "compression_level": compression_level,
+    }
+    started = time.perf_counter()
+    if mode == "serial":
+        stats = [_write_table(table, output_dir, sorted_encounters, **options) for table in EXPORT_TABLES]
+    elif mode == "threads":
+        with ThreadPoolExecutor(max_workers=len(EXPORT_TABLES), thread_name_prefix="csv-export") as executor:
+            futures = [
+                executor.submit(_write_table, table, output_dir, sorted_encounters, **options)
+                for table in EXPORT_TABLES
+            ]
+            stats = [future.result() for future in futures]
+    else:
+        _FORKED_EXPORT = (output_dir, sorted_encounters, options)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=len(EXPORT_TABLES),
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                stats = list(executor.map(_write_forked_table, EXPORT_TABLES))
+        finally:
+            _FORKED_EXPORT = None
+    elapsed = time.perf_counter() - started
+    logging.info(
+        "Exported %d files in %.2fs (%s): %s",
+        sum(1 for stat in stats if stat.rows),
+        elapsed,
+        mode,
+        ", ".join(_format_export_stat(stat) for stat in stats),
+    )
+    return stats
+
+
+def _format_export_stat(stat: ExportTableStats) -> str:
+    if stat.raw_bytes and stat.raw_bytes != stat.bytes:
+        return (
+            f"{stat.name} {stat.seconds:.2f}s {stat.raw_bytes / 1048576:.1f} MiB -> "
+            f"{stat.bytes / 1048576:.1f} MiB ({stat.bytes / stat.raw_bytes:.0%})"
+        )
+    return f"{stat.name} {stat.seconds:.2f}s"
+
+
+def encounter_partition(record: EncounterRecord) -> Tuple[str, str]:
+    """``(claim month, kind)`` output partition of one encounter.
+
+    The month is the ``YYYYMM`` prefix of the claim number (the value
+    ``EDIClaimParser._extract_claim_month`` reads per folder, and the start of
+    every ``encounter_no``); the kind is ``mi`` for 건보 (K020) and ``ta`` for
+    자보 (C110, whose patients carry the AUTO extra columns).
+    """
+    month = record.encounter_no[:6]
+    if len(month) != 6 or not month.isdigit():
+        month = PARTITION_UNKNOWN
+    if record.patient is None:
+        kind = PARTITION_UNKNOWN
+    else:
+        kind = "mi" if record.patient.extra_fields is None else "ta"
+    return month, kind
+
+
+def _partition_digest(
+    encounters: Sequence[EncounterRecord],
+    item_columns: Optional[ItemColumns],
+    output_encoding: str,
+    suffix: str = "",
+) -> str:
+    """Digest of everything one partition's CSV files would contain."""
+    digest = hashlib.sha256(f"{output_encoding}{suffix}".encode("ascii", "replace"))
+    patient_extra_columns = _patient_extra_columns(encounters)
+    for table in EXPORT_TABLES:
+        columns, rows = _table_rows(table, encounters, patient_extra_columns, item_columns)
+        digest.update("\x1d".join((table, *columns)).encode("utf-8"))
+        for row in rows:
+            digest.update(("\x1e" + "\x1f".join(row)).encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def _load_partition_manifest(output_dir: Path) -> Dict[str, Any]:
+    path = output_dir / PARTITION_MANIFEST_NAME
+    empty: Dict[str, Any] = {"version": PARTITION_MANIFEST_VERSION, "partitions": {}}
+    if not path.exists():
+        return empty
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logging.warning("Ignoring unreadable partition manifest %s", path)
+        return empty
+    if manifest.get("version") != PARTITION_MANIFEST_VERSION:
+        return empty
+    return manifest
+
+
+def _save_partition_manifest(output_dir: Path, manifest: Dict[str, Any]) -> None:
+    path = output_dir / PARTITION_MANIFEST_NAME
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    temp_path.replace(path)
+
+
+def export_partitioned(
+    encounters: Dict[str, EncounterRecord],
+    output_dir: Path,
+    *,
+    output_encoding: str = OUTPUT_ENCODING_DEFAULT,
+    item_columns: Optional[ItemColumns] = None,
+    mode: str = "serial",
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> List[ExportTableStats]:
+    """Write the six CSVs once per ``encounter_partition``, e.g. ``202509/mi/``.
+
+    Each partition's content digest is compared with the one recorded in
+    ``PARTITION_MANIFEST_NAME`` by the previous run; partitions whose digest
+    and files are unchanged are left alone, the others are rewritten with
+    ``export_results``.  Partitions that this run has no encounters for are
+    kept as they are.  The returned stats name files relative to
+    ``output_dir`` and only cover the rewritten partitions.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    grouped: Dict[Tuple[str, str], Dict[str, EncounterRecord]] = {}
+    for encounter_no, record in encounters.items():
+        grouped.setdefault(encounter_partition(record), {})[encounter_no] = record
+    manifest = _load_partition_manifest(output_dir)
+    recorded: Dict[str, Any] = manifest["partitions"]
+    stats: List[ExportTableStats] = []
+    unchanged = 0
+    for month, kind in sorted(grouped):
+        partition = f"{month}/{kind}"
+        partition_dir = output_dir / month / kind
+        partition_encounters = grouped[(month, kind)]
+        ordered = [partition_encounters[key] for key in sorted(partition_encounters)]
+        digest = _partition_digest(ordered, item_columns, output_encoding, compressed_name("", compression))
+        previous = recorded.get(partition)
+        if (
+            previous is not None
+            and previous.get("digest") == digest
+            and all((partition_dir / name).exists() for name in previous.get("files", []))
+        ):
+            unchanged += 1
+            continue
+        logging.info("Writing partition %s (%d encounters)", partition, len(ordered))
+        for name in EXPORT_TABLES:
+            # A table that is empty now, or written with another codec, must
+            # not leave the previous run's file behind.
+            for codec in (None, *COMPRESSION_SUFFIXES):
+                (partition_dir / compressed_name(name, codec)).unlink(missing_ok=True)
+        partition_stats = export_results(
+            partition_encounters,
+            partition_dir,
+            output_encoding=output_encoding,
+            item_columns=item_columns,
+            mode=mode,
+            compression=compression,
+            compression_level=compression_level,
+        )
+        recorded[partition] = {
+            "digest": digest,
+            "files": [stat.name for stat in partition_stats if stat.rows],
+        }
+        stats.extend(
+            ExportTableStats(f"{partition}/{stat.name}", stat.rows, stat.bytes, stat.seconds, stat.raw_bytes)
+            for stat in partition_stats
+        )
+        # Save after every partition so an interrupted run keeps what it wrote.
+        _save_partition_manifest(output_dir, manifest)
+    logging.info(
+        "Partitioned export: %d partition(s) rewritten, %d unchanged",
+        len(grouped) - unchanged,
+        unchanged,
+    )
+    return stats
+
+
+def _sqlite_integer(value: str) -> Optional[int]:
+    return int(value) if value else None
+
+
+def _sqlite_flag(value: str) -> int:
+    return 1 if value == "Y" else 0
+
+
+def _sqlite_cents(value: str) -> Optional[int]:
+    # ``_format_scaled_int`` always renders exactly two decimals.
+    return int(value.replace(".", "")) if value else None
+
+
+_SQLITE_CONVERTERS: Dict[str, Callable[[str], Any]] = {
+    "integer": _sqlite_integer,
+    "flag": _sqlite_flag,
+    "cents": _sqlite_cents,
+}
+
+
+def _sqlite_columns(columns: Sequence[str]) -> List[Tuple[str, str, Optional[Callable[[str], Any]]]]:
+    """``(name, declared type, converter)`` for every export column."""
+    result = []
+    for column in columns:
+        kind = SQLITE_COLUMN_KINDS.get(column)
+        if kind is None:
+            result.append((column, "TEXT", None))
+        elif kind == "cents":
+            result.append((f"{column}_cents", "INTEGER", _SQLITE_CONVERTERS[kind]))
+        else:
+            result.append((column, "INTEGER", _SQLITE_CONVERTERS[kind]))
+    return result
+
+
+def _sqlite_prepare_table(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: Sequence[Tuple[str, str, Optional[Callable[[str], Any]]]],
+    key: Tuple[str, ...],
+) -> None:
+    definitions = [f'"{name}" {sql_type}' + (" NOT NULL" if name in key else "") for name, sql_type, _ in columns]
+    definitions.append(f"PRIMARY KEY ({', '.join(key)})")
+    connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(definitions)})')
+    existing = {row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')}
+    for name, sql_type, _ in columns:
+        if name not in existing:
+            # Only the AUTO patient columns appear after the table was created.
+            connection.execute(f'ALTER TABLE "{table}" ADD COLUMN "{name}" {sql_type}')
+
+
+def _sqlite_insert_sql(table: str, names: Sequence[str], key: Tuple[str, ...]) -> str:
+    quoted = ", ".join(f'"{name}"' for name in names)
+    sql = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" for _ in names)})'
+    updates = ", ".join(f'"{name}" = excluded."{name}"' for name in names if name not in key)
+    return f"{sql} ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}"
+
+
+def _sqlite_sequenced(
+    rows: Iterable[Sequence[str]],
+    encounter_index: int,
+    counts: Dict[str, int],
+) -> Iterator[Tuple[Any, ...]]:
+    """Append each row's ``SQLITE_SEQUENCE_COLUMN`` value, counting rows per encounter."""
+    for row in rows:
+        encounter_no = row[encounter_index]
+        seq = counts.get(encounter_no, 0) + 1
+        counts[encounter_no] = seq
+        yield (*row, seq)
+
+
+def export_sqlite(
+    encounters: Dict[str, EncounterRecord],
+    db_path: Path,
+    *,
+    item_columns: Optional[ItemColumns] = None,
+) -> List[ExportTableStats]:
+    """Upsert the six export tables into the SQLite database ``db_path``.
+
+    Tables are created on first use with declared column types
+    (``SQLITE_COLUMN_KINDS``) and keys (``SQLITE_TABLE_KEYS``).  Rows are the
+    CSV rows converted to those types and are loaded with ``executemany`` in a
+    single transaction on a WAL-mode database.  Encounter-level tables upsert
+    by ``encounter_no``, diagnoses and items by ``(encounter_no, seq)``; rows
+    past an exported encounter's new diagnosis or item count are deleted, so
+    re-running a batch leaves one copy while earlier batches stay in place.
+    The reported row counts are the rows stored for the exported encounters,
+    counted after the load.
+    """
+    if not encounters:
+        logging.info("No encounters to export to %s", db_path)
+        return []
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    sorted_encounters = [encounters[key] for key in sorted(encounters.keys())]
+    patient_extra_columns = _patient_extra_columns(sorted_encounters)
+    encounter_nos = [(record.encounter_no,) for record in sorted_encounters]
+    stats: List[ExportTableStats] = []
+    started = time.perf_counter()
+    connection = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SQLITE_SCHEMA_VERSION):
+            raise ValueError(f"{db_path} has schema version {version}; expected {SQLITE_SCHEMA_VERSION}")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute('CREATE TEMP TABLE "exported" (encounter_no TEXT PRIMARY KEY)')
+            connection.executemany('INSERT INTO temp."exported" VALUES (?)', encounter_nos)
+            for table in EXPORT_TABLES:
+                table_started = time.perf_counter()
+                csv_columns, rows = _table_rows(table, sorted_encounters, patient_extra_columns, item_columns)
+                name = Path(table).stem
+                key = SQLITE_TABLE_KEYS[name]
+                columns = _sqlite_columns(csv_columns)
+                counts: Dict[str, int] = {}
+                if SQLITE_SEQUENCE_COLUMN in key:
+                    columns.append((SQLITE_SEQUENCE_COLUMN, "INTEGER", None))
+                    rows = _sqlite_sequenced(rows, csv_columns.index("encounter_no"), counts)
+                _sqlite_prepare_table(connection, name, columns, key)
+                converters = [(index, convert) for index, (_, _, convert) in enumerate(columns) if convert]
+                if converters:
+                    rows = (_sqlite_row(row, converters) for row in rows)
+                cursor = connection.executemany(
+                    _sqlite_insert_sql(name, [column[0] for column in columns], key),
+                    rows,
+                )
+                if SQLITE_SEQUENCE_COLUMN in key:
+                    # Drop the rows an exported encounter no longer has.
+                    connection.executemany(
+                        f'DELETE FROM "{name}" WHERE encounter_no = ? AND "{SQLITE_SEQUENCE_COLUMN}" > ?',
+                        [(encounter_no, counts.get(encounter_no, 0)) for (encounter_no,) in encounter_nos],
+                    )
+                stored = connection.execute(
+                    f'SELECT count(*) FROM "{name}" WHERE encounter_no IN (SELECT encounter_no FROM temp."exported")'
+                ).fetchone()[0]
+                if stored != cursor.rowcount:
+                    logging.warning("%s: %d rows loaded but %d stored", name, cursor.rowcount, stored)
+                stats.append(ExportTableStats(name, stored, 0, time.perf_counter() - table_started))
+            connection.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    finally:
+        connection.close()
+    logging.info(
+        "Upserted %d encounters into %s in %.2fs: %s",
+        len(sorted_encounters),
+        db_path,
+        time.perf_counter() - started,
+        ", ".join(f"{stat.name} {stat.rows} rows {stat.seconds:.2f}s" for stat in stats),
+    )
+    return stats
+
+
+def _sqlite_row(row: Sequence[str], converters: Sequence[Tuple[int, Callable[[str], Any]]]) -> List[Any]:
+    values = list(row)
+    for index, convert in converters:
+        values[index] = convert(values[index])
+    return values
+
+
+class EncounterRunSorter:
+    """Bounded, disk-spilling sort of per-directory encounters by ``encounter_no``.
+
+    Directories are merged into an in-memory buffer in parse order; once the
+    buffer holds ``max_buffered_encounters`` encounters it is written to a
+    temporary file as a sorted run.  ``iter_sorted`` k-way merges the runs and
+    combines encounters that appear in several directories with ``merge`` in
+    their original order, so the result matches the fully in-memory parse.
+    """
+
+    def __init__(
+        self,
+        merge: Callable[[EncounterRecord, EncounterRecord], None],
+        *,
+        max_buffered_encounters: int = STREAM_BUFFER_DEFAULT,
+        spill_dir: Optional[Path] = None,
+    ) -> None:
+        self.merge = merge
+        self.max_buffered_encounters = max(max_buffered_encounters, 1)
+        self.patient_extra_columns: Tuple[str, ...] = ()
+        self.spilled_runs = 0
+        self._buffer: Dict[str, EncounterRecord] = {}
+        self._runs: List[Path] = []
+        self._temp_dir = tempfile.TemporaryDirectory(prefix="edi_runs_", dir=spill_dir)
+
+    def add(self, encounters: Dict[str, EncounterRecord]) -> None:
+        buffer = self._buffer
+        for encounter_no, record in encounters.items():
+            if record.patient and record.patient.extra_fields:
+                self.patient_extra_columns = AUTO_PATIENT_EXTRA_COLUMNS
+            if encounter_no in buffer:
+                self.merge(buffer[encounter_no], record)
+            else:
+                buffer[encounter_no] = record
+        if len(buffer) >= self.max_buffered_encounters:
+            self._spill()
+
+    def iter_sorted(self) -> Iterator[EncounterRecord]:
+        runs: List[Iterable[EncounterRecord]] = [self._read_run(path) for path in self._collapse_runs()]
+        runs.append(self._buffer[key] for key in sorted(self._buffer))
+        yield from self._combine(heapq.merge(*runs, key=lambda record: record.encounter_no))
+
+    def close(self) -> None:
+        self._buffer = {}
+        self._temp_dir.cleanup()
+
+    def _spill(self) -> None:
+        records = (self._buffer[key] for key in sorted(self._buffer))
+        self._runs.append(self._write_run(records))
+        logging.debug("Spilled %d encounters to sorted run %d", len(self._buffer), len(self._runs))
+        self._buffer = {}
+
+    def _collapse_runs(self) -> List[Path]:
+        # Keep the number of simultaneously open run files bounded by merging
+        # neighbouring runs first; neighbours keep the original merge order.
+        runs = self._runs
+        while len(runs) > STREAM_MERGE_FAN_IN:
+            collapsed: List[Path] = []
+            for index in range(0, len(runs), STREAM_MERGE_FAN_IN):
+                group = runs[index : index + STREAM_MERGE_FAN_IN]
+                merged = heapq.merge(*(self._read_run(path) for path in group), key=lambda record: record.encounter_no)
+                collapsed.append(self._write_run(self._combine(merged)))
+                for path in group:
+                    path.unlink()
+            runs = collapsed
+        self._runs = runs
+        return runs
+
+    def _combine(self, records: Iterable[EncounterRecord]) -> Iterator[EncounterRecord]:
+        current: Optional[EncounterRecord] = None
+        for record in records:
+            if current is not None and current.encounter_no == record.encounter_no:
+                self.merge(current, record)
+                continue
+            if current is not None:
+                yield current
+            current = record
+        if current is not None:
+            yield current
+
+    def _write_run(self, records: Iterable[EncounterRecord]) -> Path:
+        self.spilled_runs += 1
+        path = Path(self._temp_dir.name) / f"run_{self.spilled_runs:06d}.pickle"
+        with path.open("wb") as handle:
+            for record in records:
+                pickle.dump(record, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[EncounterRecord]:
+        with path.open("rb") as handle:
+            while True:
+                try:
+                    yield pickle.load(handle)
+                except EOFError:
+                    return
+
+
+def export_encounter_stream(
+    encounters: Iterable[EncounterRecord],
+    output_dir: Path,
+    *,
+    output_encoding: str = OUTPUT_ENCODING_DEFAULT,
+    patient_extra_columns: Sequence[str] = (),
+    item_columns: Optional[ItemColumns] = None,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> int:
+    """Write already-sorted encounters to the six CSVs; returns the encounter count.
+
+    ``patient_extra_columns`` extends the declared ``patients.csv`` schema
+    (``AUTO_PATIENT_EXTRA_COLUMNS`` when AUTO patients are present).  With
+    ``item_columns`` the item rows and ``has_items`` come from that store.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    patient_extra_columns = tuple(patient_extra_columns)
+
+    def table_writer(name: str, columns: Sequence[str]) -> _CSVTableWriter:
+        return _CSVTableWriter(
+            output_dir / name,
+            columns,
+            encoding=output_encoding,
+            compression=compression,
+            compression_level=compression_level,
+        )
+
+    patients = table_writer("patients.csv", PatientRecord.COLUMNS + patient_extra_columns)
+    encounter_rows = table_writer("encounters.csv", EncounterRecord.COLUMNS)
+    dx_rows = table_writer("encounter_dx.csv", EncounterDxRecord.COLUMNS)
+    item_rows = table_writer("encounter_items.csv", EncounterItemRecord.COLUMNS)
+    insurance_rows = table_writer("insurances.csv", InsuranceRecord.COLUMNS)
+    invoice_rows = table_writer("invoices.csv", InvoiceRecord.COLUMNS)
+    writers = [patients, encounter_rows, dx_rows, item_rows, insurance_rows, invoice_rows]
+    count = 0
+    try:
+        for record in encounters:
+            count += 1
+            if record.patient:
+                patients.write(record.patient.to_tuple(patient_extra_columns))
+            if item_columns is None:
+                encounter_rows.write(record.to_tuple())
+                item_rows.write_many(item.to_tuple() for item in record.items)
+            else:
+                encounter_rows.write(record.to_tuple(item_count=item_columns.item_count(record.encounter_no)))
+                item_rows.write_many(item_columns.iter_tuples(record.encounter_no))
+            dx_rows.write_many(dx.to_tuple() for dx in record.dx_list)
+            if record.insurance:
+                insurance_rows.write(record.insurance.to_tuple())
+            if record.invoice:
+                invoice_rows.write(record.invoice.to_tuple())
+    finally:
+        for writer in writers:
+            writer.close()
+    return count
+
+
+def export_streaming(
+    claim_parser: EDIClaimParser,
+    output_dir: Path,
+    *,
+    output_encoding: str = OUTPUT_ENCODING_DEFAULT,
+    max_buffered_encounters: int = STREAM_BUFFER_DEFAULT,
+    spill_dir: Optional[Path] = None,
+    strict: bool = True,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> Tuple[int, List[Path], Dict[Path, str], Dict[str, List[str]]]:
+    """Parse and export without materializing the full encounter dict.
+
+    Each claim directory is pushed into an ``EncounterRunSorter`` as soon as it
+    is parsed, and the sorted, merged encounters are streamed straight into the
+    CSV writers.  With ``strict`` a failed folder raises before anything is
+    written, mirroring ``EDIClaimParser.parse``.  Returns the number of exported
+    encounters together with the ``parse_with_status`` bookkeeping.
+    """
+    sorter = EncounterRunSorter(
+        claim_parser._merge_records,
+        max_buffered_encounters=max_buffered_encounters,
+        spill_dir=spill_dir,
+    )
+    try:
+        _, successes, failures, month_map = claim_parser.parse_with_status(
+            sink=lambda _claim_dir, encounters: sorter.add(encounters),
+        )
+        if strict and failures:
+            failed_list = ", ".join(str(path) for path in failures.keys())
+            raise RuntimeError(f"Failed to parse claim folders: {failed_list}")
+        count = export_encounter_stream(
+            sorter.iter_sorted(),
+            output_dir,
+            output_encoding=output_encoding,
+            patient_extra_columns=sorter.patient_extra_columns,
+            compression=compression,
+            compression_level=compression_level,
+        )
+        logging.info("Streamed %d encounters (%d spilled runs)", count, sorter.spilled_runs)
+    finally:
+        sorter.close()
+    return count, successes, failures, month_map
+
+
+def export_encounter_batches(
+    claim_parser: EDIClaimParser,
+    batches: Iterable[Dict[str, EncounterRecord]],
+    output_dir: Path,
+    *,
+    output_encoding: str = OUTPUT_ENCODING_DEFAULT,
+    max_buffered_encounters: int = STREAM_BUFFER_DEFAULT,
+    spill_dir: Optional[Path] = None,
+    compression: Optional[str] = None,
+    compression_level: Optional[int] = None,
+) -> int:
+    """Stream-export encounter dicts produced one batch at a time (in merge order)."""
+    sorter = EncounterRunSorter(
+        claim_parser._merge_records,
+        max_buffered_encounters=max_buffered_encounters,
+        spill_dir=spill_dir,
+    )
+    try:
+        for batch in batches:
+            sorter.add(batch)
+        count = export_encounter_stream(
+            sorter.iter_sorted(),
+            output_dir,
+            output_encoding=output_encoding,
+            patient_extra_columns=sorter.patient_extra_columns,
+            compression=compression,
+            compression_level=compression_level,
+        )
+        logging.info("Streamed %d encounters (%d spilled runs)", count, sorter.spilled_runs)
+    finally:
+        sorter.close()
+    return count
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -772,19 +3090,175 @@ def build_arg_parser() -> argparse.ArgumentParser:
         default=OUTPUT_ENCODING_DEFAULT,
         help="Encoding for generated CSV files (default: cp949, use utf-8 for cross-platform)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for parsing claim folders (default: 1, 0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream encounters to the CSV files through a disk-spilling sort instead of holding them all in memory",
+    )
+    parser.add_argument(
+        "--max-buffered-encounters",
+        type=int,
+        default=STREAM_BUFFER_DEFAULT,
+        help=f"Encounters kept in memory before spilling a sorted run in --stream mode (default: {STREAM_BUFFER_DEFAULT})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help=f"Reuse parsed claim folders from this parse cache (e.g. {PARSE_CACHE_DIR_DEFAULT}); disabled by default",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=PARSE_CACHE_MAX_BYTES_DEFAULT // (1024 * 1024),
+        help="Size cap for --cache-dir; least recently used entries are evicted beyond it (default: 512)",
+    )
+    parser.add_argument(
+        "--prune-dir",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help=f"Folder name to skip while discovering claim folders (repeatable, e.g. {' '.join(sorted(NON_CLAIM_DIR_NAMES))})",
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Skip claim folders whose claim files are byte-identical to an earlier folder",
+    )
+    parser.add_argument(
+        "--item-store",
+        choices=("objects", "columnar"),
+        default="objects",
+        help="Hold parsed items as one object per line or in compact columns before export (default: objects)",
+    )
+    parser.add_argument(
+        "--target",
+        choices=EXPORT_TARGETS,
+        default="csv",
+        help="Write CSV files, or upsert the same tables into a SQLite database",
+    )
+    parser.add_argument(
+        "--sqlite-db",
+        default=None,
+        help=f"SQLite database for --target sqlite (default: <output-dir>/{SQLITE_DEFAULT_NAME})",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=tuple(COMPRESSION_SUFFIXES),
+        default=None,
+        help="Compress the CSV files while writing them (zstd needs the zstandard package)",
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        default=None,
+        help="Compression level (default: gzip 6, zstd 3)",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Write one set of CSV files per claim month and insurance kind (<output-dir>/YYYYMM/mi|ta/)",
+    )
+    parser.add_argument(
+        "--export-mode",
+        choices=EXPORT_MODES,
+        default="serial",
+        help="Write the six CSV files one after another, from one thread each, or from one forked process each",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="Memory-map claim files and extract ASCII lines from memoryview slices instead of copied lines",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=PARSER_ENGINES,
+        default="python",
+        help="Item file extraction engine; numpy cuts K020.3/C110.3 column-wise and needs NumPy (default: python)",
+    )
+    parser.add_argument(
+        "--intern-max-entries",
+        type=int,
+        default=None,
+        help="Bound on the string intern pool for repeated code fields (default: unbounded, 0 = disable interning)",
+    )
     parser.add_argument("--log-level", default="INFO", help="Python logging level (default: INFO)")
     return parser
 
 
+def _log_parser_stats(claim_parser: EDIClaimParser) -> None:
+    if claim_parser.intern_pool is not None:
+        logging.info("String intern pool: %s", claim_parser.intern_pool.summary())
+    if claim_parser.cache is not None:
+        logging.info("Parse cache: %s", claim_parser.cache.summary())
+
+
 def main() -> None:
     parser = build_arg_parser()
     args = parser.parse_args()
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO), format="%(levelname)s: %(message)s")
     source_path = Path(args.source)
     output_dir = Path(args.output_dir)
-    claim_parser = EDIClaimParser(source_path, encoding=args.encoding)
+    cache = None
+    if args.cache_dir:
+        cache = ClaimParseCache(Path(args.cache_dir), max_bytes=args.cache_max_mb * 1024 * 1024)
+    claim_parser = EDIClaimParser(
+        source_path,
+        encoding=args.encoding,
+        workers=args.workers,
+        cache=cache,
+        prune_dirs=args.prune_dir,
+        dedupe=args.dedupe,
+        intern_strings=args.intern_max_entries != 0,
+        intern_max_entries=args.intern_max_entries,
+        use_mmap=args.mmap,
+        engine=args.engine,
+    )
+    if args.stream and args.target != "csv":
+        parser.error("--stream only writes CSV files; drop it to use --target sqlite")
+    if args.stream and args.item_store != "objects":
+        parser.error("--item-store columnar cannot be combined with --stream, which writes rows as folders are merged")
+    if args.stream and args.export_mode != "serial":
+        parser.error("--export-mode cannot be combined with --stream, which writes the six files in one merge pass")
+    if args.partition and (args.stream or args.target != "csv"):
+        parser.error("--partition cannot be combined with --stream or --target sqlite")
+    if args.compress and args.target != "csv":
+        parser.error("--compress only applies to CSV files")
+    try:
+        check_compression(args.compress)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.stream:
+        export_streaming(
+            claim_parser,
+            output_dir,
+            output_encoding=args.output_encoding,
+            max_buffered_encounters=args.max_buffered_encounters,
+            compression=args.compress,
+            compression_level=args.compress_level,
+        )
+        _log_parser_stats(claim_parser)
+        return
     encounters = claim_parser.parse()
-    export_results(encounters, output_dir, output_encoding=args.output_encoding)
+    item_columns = ItemColumns.from_encounters(encounters) if args.item_store == "columnar" else None
+    export_results(
+        encounters,
+        output_dir,
+        output_encoding=args.output_encoding,
+        item_columns=item_columns,
+        mode=args.export_mode,
+        target=args.target,
+        sqlite_path=Path(args.sqlite_db) if args.sqlite_db else None,
+        partitioned=args.partition,
+        compression=args.compress,
+        compression_level=args.compress_level,
+    )
+    _log_parser_stats(claim_parser)
 
 
 if __name__ == "__main__":
@@ -10,28 +10,49 @@ The script automates the following workflow:
    (auto-insurance) files out of ``sam\in`` and store them under
    ``decoded_batches/<batch_id>`` inside this repository.
 4. Once all new batches are copied locally, reuse ``edi_parser.EDIClaimParser``
-   to rebuild the patients / encounters CSV snapshots.
+   to rebuild the patients / encounters CSV snapshots.  A manifest under
+   ``parse_cache`` records every batch's file sizes, mtimes and content hashes
+   next to its cached parse result, so only new or changed batches are parsed.
+   By default steps 2-3 run in a background thread and every decoded batch is
+   parsed into that cache while the next one is being decrypted (see
+   ``decode_and_parse_batches``), so the rebuild mostly merges cached results.
 
 Re-running the script is safe: batches that already exist under
 ``decoded_batches`` are skipped, which means only newly-arrived directories in
-``data\DMD`` trigger additional decode operations.
+``data\DMD`` trigger additional decode operations.  With ``--watch`` the
+script stays running after the first pass and repeats steps 2-4 for every
+batch folder that appears under ``data\DMD`` (see ``BatchWatcher``).
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import logging
+import os
+import pickle
+import queue
 import shutil
+import signal
 import subprocess
+import sys
+import threading
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from edi_parser import (
     ENCODING_DEFAULT,
     OUTPUT_ENCODING_DEFAULT,
+    PARSER_VERSION,
+    ClaimFileLayout,
     EDIClaimParser,
+    EncounterRecord,
+    export_encounter_batches,
     export_results,
+    export_streaming,
 )
 
 DDMD_DATA_ROOT = Path(r"C:\hira\DDMD\data\DMD")
@@ -49,6 +70,23 @@ SUPPORTED_OUTPUTS = (
     "C110.3",
     "C110.4",
 )
+# Kept in the decoded-batches folder; see load_batch_index().
+BATCH_INDEX_NAME = "batch_index.json"
+BATCH_INDEX_VERSION = 1
+PARSE_MANIFEST_NAME = "manifest.json"
+PARSE_MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+# Decoded batches that may wait for the parser before decoding pauses.
+PIPELINE_QUEUE_SIZE = 4
+# ``--watch``: seconds between polls of data_root, and how long a new batch
+# folder's payload listing must stay unchanged before it is decoded.
+WATCH_POLL_SECONDS = 2.0
+WATCH_DEBOUNCE_SECONDS = 5.0
+# First retry delay for a batch --watch failed to decode; it doubles with
+# every further failure up to the maximum.
+WATCH_RETRY_SECONDS = 30.0
+WATCH_MAX_RETRY_SECONDS = 600.0
 
 
 @dataclass(frozen=True)
@@ -65,38 +103,120 @@ def _pick_staging_name(path: Path) -> str:
     return f"{path.name}.enc"
 
 
-def discover_batches(data_root: Path, *, use_enc_fallback: bool = True) -> List[BatchInfo]:
-    batches: List[BatchInfo] = []
-    for child in data_root.iterdir():
-        if not child.is_dir():
-            continue
-        payload: Path | None = None
-        staging_name: str | None = None
+def load_batch_index(decoded_root: Path, data_root: Path) -> Dict[str, Any]:
+    """Load the batch index kept in ``decoded_root``.
+
+    The index maps each batch folder's doc id to the payload found in it
+    (path relative to ``data_root``, mtime, size, whether it came from
+    ``zip`` or ``enc``) and whether the batch has been decoded, so that
+    ``discover_batches`` need not look inside folders it has already handled.
+    An index written for another ``data_root`` or index version is discarded.
+    """
+    empty: Dict[str, Any] = {"version": BATCH_INDEX_VERSION, "data_root": str(data_root), "batches": {}}
+    index_path = decoded_root / BATCH_INDEX_NAME
+    if not index_path.exists():
+        return empty
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logging.warning("Ignoring unreadable batch index %s", index_path)
+        return empty
+    if index.get("version") != BATCH_INDEX_VERSION or index.get("data_root") != str(data_root):
+        logging.info("Batch index %s belongs to another data root or version; rescanning every batch", index_path)
+        return empty
+    return index
 
-        zip_dir = child / "zip"
-        enc_dir = child / "enc"
 
-        if zip_dir.exists():
-            candidates = list(zip_dir.glob("*.enc"))
-            if candidates:
-                payload = sorted(candidates, key=lambda p: p.stat().st_mtime)[0]
-                staging_name = payload.name
+def save_batch_index(decoded_root: Path, index: Dict[str, Any]) -> None:
+    decoded_root.mkdir(parents=True, exist_ok=True)
+    index_path = decoded_root / BATCH_INDEX_NAME
+    temp_path = index_path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(index, indent=1, sort_keys=True), encoding="utf-8")
+    temp_path.replace(index_path)
 
-        if payload is None and use_enc_fallback and enc_dir.exists():
-            candidates = [p for p in enc_dir.iterdir() if p.is_file() and not p.suffix.lower() == ".sig"]
-            if candidates:
-                payload = sorted(candidates, key=lambda p: p.stat().st_mtime)[0]
-                staging_name = _pick_staging_name(payload)
 
-        if payload is None or staging_name is None:
-            continue
+def _oldest_payload(folder: str, *, enc_fallback: bool) -> Optional[Tuple[str, float, int]]:
+    """``(name, mtime, size)`` of the oldest payload in ``folder``, one stat per candidate.
+
+    ``zip`` folders hold ``*.enc`` payloads; in an ``enc`` folder every file
+    but the ``.sig`` signatures is a candidate.
+    """
+    oldest: Optional[Tuple[str, float, int]] = None
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if enc_fallback:
+                    if os.path.splitext(entry.name)[1].lower() == ".sig":
+                        continue
+                elif not os.path.normcase(entry.name).endswith(".enc"):
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if oldest is None or stat.st_mtime < oldest[1]:
+                    oldest = (entry.name, stat.st_mtime, stat.st_size)
+    except OSError:
+        return None
+    return oldest
 
+
+def _index_batch_folder(folder: str, doc_id: str, *, use_enc_fallback: bool) -> Optional[Dict[str, Any]]:
+    """Find the payload of one batch folder and describe it as a batch index entry."""
+    for source in ("zip", "enc") if use_enc_fallback else ("zip",):
+        found = _oldest_payload(os.path.join(folder, source), enc_fallback=source == "enc")
+        if found is not None:
+            name, mtime, size = found
+            return {
+                "payload": f"{doc_id}/{source}/{name}",
+                "source": source,
+                "mtime": mtime,
+                "size": size,
+                "decoded": False,
+            }
+    return None
+
+
+def discover_batches(
+    data_root: Path,
+    *,
+    use_enc_fallback: bool = True,
+    doc_ids: Optional[Collection[str]] = None,
+    index: Optional[Dict[str, Any]] = None,
+) -> List[BatchInfo]:
+    """Find each batch folder's payload; ``doc_ids`` limits the search to those folders.
+
+    With a batch ``index`` (see ``load_batch_index``) folders recorded as
+    decoded are taken from it without touching the disk; every other folder
+    is scanned and its entry refreshed.  Entries for folders that have gone
+    from ``data_root`` are dropped.
+    """
+    entries: Dict[str, Dict[str, Any]] = index["batches"] if index is not None else {}
+    if doc_ids is None:
+        try:
+            with os.scandir(data_root) as scanner:
+                children = [entry.name for entry in scanner if entry.is_dir()]
+        except FileNotFoundError:
+            children = []
+        for doc_id in set(entries) - set(children):
+            del entries[doc_id]
+    else:
+        children = [doc_id for doc_id in doc_ids if (data_root / doc_id).is_dir()]
+    batches: List[BatchInfo] = []
+    for doc_id in children:
+        entry = entries.get(doc_id)
+        if entry is None or not entry["decoded"] or (entry["source"] == "enc" and not use_enc_fallback):
+            entry = _index_batch_folder(os.path.join(data_root, doc_id), doc_id, use_enc_fallback=use_enc_fallback)
+            if entry is None:
+                entries.pop(doc_id, None)
+                continue
+            entries[doc_id] = entry
+        payload = data_root / entry["payload"]
         batches.append(
             BatchInfo(
-                doc_id=child.name,
+                doc_id=doc_id,
                 source_path=payload,
-                staging_name=staging_name,
-                sort_key=payload.stat().st_mtime,
+                staging_name=payload.name if entry["source"] == "zip" else _pick_staging_name(payload),
+                sort_key=entry["mtime"],
             ),
         )
     return sorted(batches, key=lambda info: info.sort_key)
@@ -125,6 +245,9 @@ def cleanup_staging_payloads(sam_in: Path) -> None:
 
 def run_decoding(dec_executable: Path, sam_in: Path) -> bool:
     command = f'"{dec_executable}" cipherdec default'
+    if dec_executable.suffix.lower() == ".py":
+        # A stand-in decryptor such as scripts/stub_dec.py.
+        command = f'"{sys.executable}" {command}'
     result = subprocess.run(command, shell=True, capture_output=True, text=True)
     if result.returncode != 0:
         logging.warning("dec.exe exited with code %s; validating via DecResult.txt", result.returncode)
@@ -151,22 +274,79 @@ def process_batches(
     decoded_root: Path,
     max_batches: int | None = None,
     use_enc_fallback: bool = True,
+    on_decoded: Optional[Callable[[Path, float], None]] = None,
+    doc_ids: Optional[Collection[str]] = None,
 ) -> Sequence[Path]:
+    """Decode every new batch into ``decoded_root/<doc_id>``, one at a time.
+
+    ``on_decoded(batch_dir, seconds)`` is called as soon as a batch's claim
+    files have been copied out of ``sam_in``.  ``doc_ids`` restricts the run
+    to those batch folders (``--watch`` passes the ones that just arrived).
+    Discovery goes through the batch index in ``decoded_root``, which is
+    saved again when the run ends.
+    """
     decoded_root.mkdir(parents=True, exist_ok=True)
-    batches = discover_batches(data_root, use_enc_fallback=use_enc_fallback)
-    logging.info("Found %d batch directories under %s", len(batches), data_root)
-    new_batch_dirs: List[Path] = []
+    index = load_batch_index(decoded_root, data_root)
+    indexed = {doc_id for doc_id, entry in index["batches"].items() if entry["decoded"]}
+    started = time.perf_counter()
+    batches = discover_batches(data_root, use_enc_fallback=use_enc_fallback, doc_ids=doc_ids, index=index)
+    logging.info(
+        "Found %d batch directories under %s in %.3fs (%d scanned, %d from the batch index)",
+        len(batches),
+        data_root,
+        time.perf_counter() - started,
+        sum(batch.doc_id not in indexed for batch in batches),
+        sum(batch.doc_id in indexed for batch in batches),
+    )
+    with os.scandir(decoded_root) as scanner:
+        decoded_dirs = {entry.name for entry in scanner if entry.is_dir()}
+    try:
+        return _decode_batches(
+            batches,
+            index["batches"],
+            decoded_dirs,
+            sam_in=sam_in,
+            dec_exe=dec_exe,
+            decoded_root=decoded_root,
+            max_batches=max_batches,
+            on_decoded=on_decoded,
+        )
+    finally:
+        save_batch_index(decoded_root, index)
+
 
+def _decode_batches(
+    batches: Sequence[BatchInfo],
+    index_entries: Dict[str, Dict[str, Any]],
+    decoded_dirs: Collection[str],
+    *,
+    sam_in: Path,
+    dec_exe: Path,
+    decoded_root: Path,
+    max_batches: int | None,
+    on_decoded: Optional[Callable[[Path, float], None]],
+) -> List[Path]:
+    new_batch_dirs: List[Path] = []
     cleanup_staging_payloads(sam_in)
     processed = 0
     for batch in batches:
         if max_batches and processed >= max_batches:
             break
         batch_dest = decoded_root / batch.doc_id
-        if (batch_dest / "K020.1").exists() or (batch_dest / "C110.1").exists():
+        entry = index_entries[batch.doc_id]
+        # An indexed batch counts as decoded while its output folder exists;
+        # deleting the folder makes the next run decode it again.
+        if entry["decoded"] and batch.doc_id in decoded_dirs:
+            continue
+        if batch.doc_id in decoded_dirs and (
+            (batch_dest / "K020.1").exists() or (batch_dest / "C110.1").exists()
+        ):
             logging.debug("Skipping already-decoded batch %s", batch.doc_id)
+            entry["decoded"] = True
             continue
+        entry["decoded"] = False
         logging.info("Decoding batch %s", batch.doc_id)
+        started = time.perf_counter()
         inbound_payload = sam_in / batch.staging_name
         if inbound_payload.exists():
             inbound_payload.unlink()
@@ -181,15 +361,568 @@ def process_batches(
         if not copied_files:
             logging.warning("No claim files were copied for batch %s", batch.doc_id)
         else:
-            logging.info("Copied %d claim files for batch %s", len(copied_files), batch.doc_id)
+            elapsed = time.perf_counter() - started
+            logging.info("Copied %d claim files for batch %s (%.2fs)", len(copied_files), batch.doc_id, elapsed)
+            entry["decoded"] = True
             new_batch_dirs.append(batch_dest)
+            if on_decoded is not None:
+                on_decoded(batch_dest, elapsed)
         processed += 1
     return new_batch_dirs
 
 
-def rebuild_csv_exports(decoded_root: Path, output_dir: Path, *, encoding: str, output_encoding: str) -> None:
-    claim_parser = EDIClaimParser(decoded_root, encoding=encoding)
-    encounters = claim_parser.parse()
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_batch(
+    batch_dir: Path,
+    previous: Dict[str, Dict[str, Any]] | None = None,
+    *,
+    previous_taken_ns: int = 0,
+) -> Dict[str, Dict[str, Any]]:
+    """Return ``{relative path: {size, mtime_ns, sha256}}`` for every file of a batch.
+
+    A batch kept as a zip archive is fingerprinted as that single file.
+
+    Content hashes from ``previous`` (taken at ``previous_taken_ns``) are reused
+    when size and mtime still match, so unchanged batches are verified with a
+    ``stat`` per file.  Files modified shortly before the previous fingerprint
+    are always re-hashed because a same-size rewrite within the filesystem's
+    timestamp granularity would otherwise go unnoticed.
+    """
+    previous = previous or {}
+    trusted_before_ns = previous_taken_ns - RACY_MTIME_WINDOW_NS
+    files: Dict[str, Dict[str, Any]] = {}
+    paths = [batch_dir] if batch_dir.is_file() else sorted(batch_dir.rglob("*"))
+    for path in paths:
+        if not path.is_file():
+            continue
+        relative = path.relative_to(batch_dir).as_posix() if path != batch_dir else path.name
+        stat = path.stat()
+        known = previous.get(relative)
+        if (
+            known
+            and known.get("size") == stat.st_size
+            and known.get("mtime_ns") == stat.st_mtime_ns
+            and stat.st_mtime_ns < trusted_before_ns
+        ):
+            digest = known["sha256"]
+        else:
+            digest = _hash_file(path)
+        files[relative] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    return files
+
+
+def _same_content(previous: Dict[str, Dict[str, Any]] | None, current: Dict[str, Dict[str, Any]]) -> bool:
+    # A touched-but-identical file only refreshes its mtime; compare content.
+    if previous is None or previous.keys() != current.keys():
+        return False
+    return all(previous[name]["sha256"] == info["sha256"] for name, info in current.items())
+
+
+def load_parse_manifest(cache_dir: Path, *, encoding: str) -> Dict[str, Any]:
+    """Load the parsed-batch manifest, discarding it when the parser or encoding changed."""
+    empty: Dict[str, Any] = {
+        "version": PARSE_MANIFEST_VERSION,
+        "parser_version": PARSER_VERSION,
+        "encoding": encoding,
+        "batches": {},
+    }
+    manifest_path = cache_dir / PARSE_MANIFEST_NAME
+    if not manifest_path.exists():
+        return empty
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        logging.warning("Ignoring unreadable parse manifest %s", manifest_path)
+        return empty
+    if (
+        manifest.get("version") != PARSE_MANIFEST_VERSION
+        or manifest.get("parser_version") != PARSER_VERSION
+        or manifest.get("encoding") != encoding
+    ):
+        logging.info("Parse manifest was built by a different parser version or encoding; re-parsing all batches")
+        return empty
+    return manifest
+
+
+def save_parse_manifest(cache_dir: Path, manifest: Dict[str, Any]) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / PARSE_MANIFEST_NAME
+    temp_path = manifest_path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    temp_path.replace(manifest_path)
+
+
+def _save_batch_result(path: Path, encounters: Dict[str, EncounterRecord]) -> None:
+    temp_path = path.with_suffix(".tmp")
+    with temp_path.open("wb") as handle:
+        pickle.dump(encounters, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    temp_path.replace(path)
+
+
+def _load_batch_result(path: Path) -> Dict[str, EncounterRecord]:
+    with path.open("rb") as handle:
+        return pickle.load(handle)
+
+
+def _claim_dir_names(claim_dirs: Sequence[Tuple[Path, ClaimFileLayout]], decoded_root: Path) -> List[str]:
+    # Recorded per batch: a cached result only stands for the same claim folders
+    # (``dedupe`` may drop some of a batch's folders in a full run).
+    return [claim_dir.relative_to(decoded_root).as_posix() for claim_dir, _ in claim_dirs]
+
+
+def cache_batch_result(
+    claim_parser: EDIClaimParser,
+    batch_dir: Path,
+    decoded_root: Path,
+    cache_dir: Path,
+    manifest: Dict[str, Any],
+) -> int:
+    """Parse one decoded batch and record it in ``manifest``, which the caller saves.
+
+    ``claim_parser`` supplies the encoding and worker settings.  The cached
+    result is picked up by ``iter_batch_encounters`` as long as the batch's
+    files and claim folders are unchanged.  Returns the number of encounters.
+    """
+    batch_parser = EDIClaimParser(batch_dir, encoding=claim_parser.encoding, workers=claim_parser.workers)
+    claim_dirs = batch_parser.discover_claim_dirs()
+    encounters, _, failures, _ = batch_parser.parse_claim_dirs(claim_dirs)
+    if failures:
+        failed_list = ", ".join(str(path) for path in failures.keys())
+        raise RuntimeError(f"Failed to parse claim folders: {failed_list}")
+    batch_id = batch_dir.relative_to(decoded_root).parts[0]
+    known = manifest["batches"].get(batch_id) or {}
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _save_batch_result(cache_dir / f"{batch_id}.pickle", encounters)
+    # "fingerprinted_ns" stays as it is: it dates the other batches' hashes.
+    manifest["batches"][batch_id] = {
+        "files": fingerprint_batch(
+            batch_dir,
+            known.get("files"),
+            previous_taken_ns=manifest.get("fingerprinted_ns", 0),
+        ),
+        "claim_dirs": _claim_dir_names(claim_dirs, decoded_root),
+        "result": f"{batch_id}.pickle",
+    }
+    return len(encounters)
+
+
+@dataclass
+class PipelineStats:
+    decoded: int = 0
+    parsed: int = 0
+    failed: int = 0
+    decode_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    # Time the parser spent waiting for the decoder to hand over a batch.
+    parse_idle_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.decoded} batch(es) decoded in {self.decode_seconds:.2f}s, "
+            f"{self.parsed} parsed in {self.parse_seconds:.2f}s ({self.failed} failed, "
+            f"{self.parse_idle_seconds:.2f}s idle), {self.wall_seconds:.2f}s wall"
+        )
+
+
+def decode_and_parse_batches(
+    claim_parser: EDIClaimParser,
+    *,
+    data_root: Path,
+    sam_in: Path,
+    dec_exe: Path,
+    decoded_root: Path,
+    cache_dir: Path,
+    max_batches: int | None = None,
+    use_enc_fallback: bool = True,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    doc_ids: Optional[Collection[str]] = None,
+) -> Tuple[Sequence[Path], PipelineStats]:
+    """Run ``process_batches`` in a thread and parse each batch as it lands.
+
+    Decoding stays serial because ``sam_in`` is a single staging folder, but
+    while ``dec.exe`` works on batch N+1 the calling thread parses batch N
+    into the parse cache (``cache_batch_result``).  At most ``queue_size``
+    decoded batches wait for the parser before the decoder blocks.  A batch
+    that fails to parse is logged and left to ``rebuild_csv_exports``.  The
+    parse manifest is loaded once and saved once the loop ends.
+    """
+    handoff: "queue.Queue[Optional[Tuple[Path, float]]]" = queue.Queue(maxsize=max(queue_size, 1))
+    stats = PipelineStats()
+    outcome: Dict[str, Any] = {}
+    started = time.perf_counter()
+
+    def decode() -> None:
+        try:
+            outcome["dirs"] = process_batches(
+                data_root=data_root,
+                sam_in=sam_in,
+                dec_exe=dec_exe,
+                decoded_root=decoded_root,
+                max_batches=max_batches,
+                use_enc_fallback=use_enc_fallback,
+                on_decoded=lambda batch_dir, seconds: handoff.put((batch_dir, seconds)),
+                doc_ids=doc_ids,
+            )
+        except BaseException as exc:  # noqa: BLE001 - re-raised in the calling thread
+            outcome["error"] = exc
+        finally:
+            handoff.put(None)
+
+    manifest = load_parse_manifest(cache_dir, encoding=claim_parser.encoding)
+    decoder = threading.Thread(target=decode, name="ddmd-decode", daemon=True)
+    decoder.start()
+    try:
+        while True:
+            waited = time.perf_counter()
+            item = handoff.get()
+            stats.parse_idle_seconds += time.perf_counter() - waited
+            if item is None:
+                break
+            batch_dir, decode_seconds = item
+            stats.decoded += 1
+            stats.decode_seconds += decode_seconds
+            parse_started = time.perf_counter()
+            try:
+                count = cache_batch_result(claim_parser, batch_dir, decoded_root, cache_dir, manifest)
+            except Exception:  # noqa: BLE001
+                stats.failed += 1
+                logging.exception("Could not pre-parse batch %s; the rebuild will retry it", batch_dir.name)
+                continue
+            finally:
+                stats.parse_seconds += time.perf_counter() - parse_started
+            stats.parsed += 1
+            logging.info(
+                "Parsed batch %s (%d encounters) in %.2fs",
+                batch_dir.name,
+                count,
+                time.perf_counter() - parse_started,
+            )
+    finally:
+        if stats.parsed:
+            save_parse_manifest(cache_dir, manifest)
+    decoder.join()
+    stats.wall_seconds = time.perf_counter() - started
+    if "error" in outcome:
+        raise outcome["error"]
+    logging.info("Decode/parse pipeline: %s", stats.summary())
+    return outcome["dirs"], stats
+
+
+def _payload_signature(batch_dir: Path) -> Tuple[Tuple[str, str, int, int], ...]:
+    """Name, size and mtime of every file in a batch's ``zip``/``enc`` folders."""
+    signature = []
+    for sub in ("zip", "enc"):
+        try:
+            with os.scandir(batch_dir / sub) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        signature.append((sub, entry.name, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            continue
+    return tuple(sorted(signature))
+
+
+class BatchWatcher:
+    """Cheap arrival detection for batch folders under ``data_root``.
+
+    Each ``poll`` costs one ``stat`` of ``data_root`` while nothing arrives:
+    its listing is only re-read (one ``os.scandir``) when the folder's mtime
+    changes, or while that mtime is within ``RACY_MTIME_WINDOW_NS`` of the
+    previous listing (a folder created in the same timestamp tick would not
+    move it), and the difference against the previous listing yields the new
+    batch folders.  Only those are inspected further.  A new folder is
+    reported once its ``zip``/``enc`` payload listing is non-empty and has
+    stayed unchanged for ``debounce`` seconds, so a payload that is still being
+    copied in is not picked up half-written.
+
+    Folders present when the watcher is created are left to the caller, which
+    hands back the ones it could not decode through ``retry``, as it does for
+    every failed update.  A retried folder is reported again after a backoff
+    that doubles with each failure, or as soon as its payload has changed and
+    settled again.
+    """
+
+    def __init__(
+        self,
+        data_root: Path,
+        *,
+        debounce: float = WATCH_DEBOUNCE_SECONDS,
+        retry_delay: float = WATCH_RETRY_SECONDS,
+    ) -> None:
+        self.data_root = data_root
+        self.debounce = debounce
+        self.retry_delay = retry_delay
+        self._root_mtime_ns: Optional[int] = None
+        self._listed_ns = 0
+        self._children: set = set()
+        # doc_id -> (payload signature, monotonic time it was last seen
+        # changing, monotonic time before which it is not reported)
+        self._pending: Dict[str, Tuple[Optional[Tuple[Any, ...]], float, float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._refresh(time.monotonic(), initial=True)
+
+    @property
+    def children(self) -> List[str]:
+        """Batch folders seen in the latest listing of ``data_root``."""
+        return sorted(self._children)
+
+    def _refresh(self, now: float, *, initial: bool = False) -> None:
+        try:
+            mtime_ns = os.stat(self.data_root).st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns == self._root_mtime_ns and mtime_ns < self._listed_ns - RACY_MTIME_WINDOW_NS:
+            return
+        self._root_mtime_ns = mtime_ns
+        self._listed_ns = time.time_ns()
+        try:
+            with os.scandir(self.data_root) as entries:
+                current = {entry.name for entry in entries if entry.is_dir()}
+        except OSError:
+            return
+        if not initial:
+            for name in current - self._children:
+                logging.info("New batch folder %s; waiting for its payload to settle", name)
+                self._pending[name] = (None, now, now)
+        for name in self._children - current:
+            self._pending.pop(name, None)
+            self._failures.pop(name, None)
+        self._children = current
+
+    def poll(self, now: Optional[float] = None) -> List[str]:
+        """Return the doc ids of new or retried batch folders whose payload has settled."""
+        now = time.monotonic() if now is None else now
+        self._refresh(now)
+        ready: List[str] = []
+        for name, (signature, since, not_before) in list(self._pending.items()):
+            current = _payload_signature(self.data_root / name)
+            if current != signature:
+                # A new or replaced payload is worth a try as soon as it settles.
+                self._pending[name] = (current, now, now)
+            elif current and now - since >= self.debounce and now >= not_before:
+                del self._pending[name]
+                ready.append(name)
+        return sorted(ready)
+
+    def retry(self, doc_ids: Iterable[str], now: Optional[float] = None) -> float:
+        """Report ``doc_ids`` again after the backoff; returns the longest delay chosen."""
+        now = time.monotonic() if now is None else now
+        longest = 0.0
+        for name in doc_ids:
+            if name not in self._children:
+                continue
+            failures = self._failures.get(name, 0)
+            self._failures[name] = failures + 1
+            delay = min(self.retry_delay * 2**failures, WATCH_MAX_RETRY_SECONDS)
+            longest = max(longest, delay)
+            self._pending[name] = (_payload_signature(self.data_root / name), now, now + delay)
+        return longest
+
+    def done(self, doc_ids: Iterable[str]) -> None:
+        """Forget the failures of batch folders that have been decoded."""
+        for name in doc_ids:
+            self._failures.pop(name, None)
+
+
+def undecoded_batches(decoded_root: Path, data_root: Path, doc_ids: Iterable[str]) -> List[str]:
+    """The ``doc_ids`` the batch index does not record as decoded."""
+    entries = load_batch_index(decoded_root, data_root)["batches"]
+    return sorted(doc_id for doc_id in doc_ids if not entries.get(doc_id, {}).get("decoded"))
+
+
+def watch_batches(
+    on_ready: Callable[[List[str]], Collection[str]],
+    watcher: BatchWatcher,
+    *,
+    poll_interval: float = WATCH_POLL_SECONDS,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Call ``on_ready(doc_ids)`` for settled batch folders until ``stop`` is set.
+
+    ``on_ready`` returns the doc ids it could not decode; those, or all of
+    them when it raises, are retried with backoff.  Ctrl+C ends the watch.
+    """
+    stop = stop or threading.Event()
+    logging.info(
+        "Watching %s for new batches (poll every %.1fs, debounce %.1fs)",
+        watcher.data_root,
+        poll_interval,
+        watcher.debounce,
+    )
+    try:
+        while not stop.wait(poll_interval):
+            ready = watcher.poll()
+            if not ready:
+                continue
+            logging.info("Batch folder(s) ready: %s", ", ".join(ready))
+            try:
+                failed = sorted(on_ready(ready))
+            except Exception:  # noqa: BLE001 - keep the daemon alive
+                logging.exception("Update for batch(es) %s failed", ", ".join(ready))
+                failed = ready
+            watcher.done(set(ready) - set(failed))
+            if failed:
+                delay = watcher.retry(failed)
+                logging.warning("Batch(es) %s not decoded; retrying within %.0fs", ", ".join(failed), delay)
+    except KeyboardInterrupt:
+        pass
+
+
+def iter_batch_encounters(
+    claim_parser: EDIClaimParser,
+    decoded_root: Path,
+    cache_dir: Path,
+    *,
+    full_rebuild: bool = False,
+) -> Iterator[Dict[str, EncounterRecord]]:
+    """Yield each batch's encounters in sorted batch order, parsing only new or changed batches.
+
+    Every ``decoded_root/<batch_id>`` folder is fingerprinted against the
+    manifest in ``cache_dir``.  Unchanged batches are loaded from their cached
+    parse result; the rest are parsed (in parallel when the parser has
+    ``workers > 1``), cached and recorded in the manifest.  Merging the yielded
+    dicts in order reproduces a full parse of ``decoded_root``.  The
+    fingerprints are taken before claim folder discovery so that a parser
+    with ``dedupe`` compares claim folders by their recorded hashes instead of
+    reading every claim file again.
+    """
+    fingerprinted_ns = time.time_ns()
+    manifest = load_parse_manifest(cache_dir, encoding=claim_parser.encoding)
+    recorded_batches: Dict[str, Any] = manifest["batches"]
+    previous_batches: Dict[str, Any] = {} if full_rebuild else recorded_batches
+    # Batch folders without claim folders of their own (none, or only
+    # duplicates): only their fingerprints are kept.
+    previous_skipped: Dict[str, Any] = {} if full_rebuild else manifest.get("skipped_batches", {})
+    fingerprints: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for batch_dir in sorted(path for path in decoded_root.iterdir() if path.is_dir()):
+        known = previous_batches.get(batch_dir.name) or previous_skipped.get(batch_dir.name) or {}
+        files = fingerprint_batch(
+            batch_dir,
+            known.get("files"),
+            previous_taken_ns=manifest.get("fingerprinted_ns", 0),
+        )
+        fingerprints[batch_dir.name] = files
+        claim_parser.file_digests.update(
+            (str(batch_dir / relative), (entry["size"], entry["sha256"])) for relative, entry in files.items()
+        )
+    claim_dirs = claim_parser.discover_claim_dirs()
+    if not claim_dirs:
+        raise FileNotFoundError(f"Could not find any claim directories under {decoded_root}")
+
+    batch_claim_dirs: Dict[str, List[Tuple[Path, ClaimFileLayout]]] = {}
+    for claim_dir, layout in claim_dirs:
+        relative = claim_dir.relative_to(decoded_root)
+        # Claim files sitting directly in decoded_root do not belong to a batch
+        # folder; they are parsed on every run under the "" key.
+        batch_id = relative.parts[0] if relative.parts else ""
+        batch_claim_dirs.setdefault(batch_id, []).append((claim_dir, layout))
+
+    batches: Dict[str, Any] = {}
+    changed: List[str] = []
+    to_parse: List[Tuple[Path, ClaimFileLayout]] = []
+    for batch_id, dirs in batch_claim_dirs.items():
+        if batch_id:
+            known = previous_batches.get(batch_id) or {}
+            files = fingerprints.get(batch_id)
+            if files is None:
+                # A batch kept as a zip archive.
+                files = fingerprint_batch(
+                    decoded_root / batch_id,
+                    known.get("files"),
+                    previous_taken_ns=manifest.get("fingerprinted_ns", 0),
+                )
+            claim_dir_names = _claim_dir_names(dirs, decoded_root)
+            batches[batch_id] = {"files": files, "claim_dirs": claim_dir_names, "result": f"{batch_id}.pickle"}
+            if (
+                _same_content(known.get("files"), files)
+                and known.get("claim_dirs") == claim_dir_names
+                and (cache_dir / known["result"]).exists()
+            ):
+                continue
+            changed.append(batch_id)
+        to_parse.extend(dirs)
+    logging.info(
+        "Reusing %d cached batch(es); parsing %d new or changed batch(es)",
+        len(batches) - len(changed),
+        len(changed),
+    )
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    fresh: Dict[str, Dict[str, EncounterRecord]] = {}
+
+    def collect(claim_dir: Path, encounters: Dict[str, EncounterRecord]) -> None:
+        relative = claim_dir.relative_to(decoded_root)
+        batch_id = relative.parts[0] if relative.parts else ""
+        claim_parser.merge_encounters(fresh.setdefault(batch_id, {}), encounters)
+
+    if to_parse:
+        _, _, failures, _ = claim_parser.parse_claim_dirs(to_parse, sink=collect)
+        if failures:
+            failed_list = ", ".join(str(path) for path in failures.keys())
+            raise RuntimeError(f"Failed to parse claim folders: {failed_list}")
+
+    for batch_id in changed:
+        _save_batch_result(cache_dir / batches[batch_id]["result"], fresh.pop(batch_id, {}))
+    # Taken from the manifest even on a full rebuild, which ignores its contents.
+    for stale in set(recorded_batches) - set(batches):
+        (cache_dir / recorded_batches[stale]["result"]).unlink(missing_ok=True)
+    manifest["batches"] = batches
+    manifest["skipped_batches"] = {
+        batch_id: {"files": files} for batch_id, files in fingerprints.items() if batch_id not in batches
+    }
+    manifest["fingerprinted_ns"] = fingerprinted_ns
+    save_parse_manifest(cache_dir, manifest)
+
+    for batch_id in sorted(batch_claim_dirs, key=lambda name: str(decoded_root / name)):
+        if not batch_id:
+            yield fresh.get("", {})
+        else:
+            yield _load_batch_result(cache_dir / batches[batch_id]["result"])
+
+
+def rebuild_csv_exports(
+    decoded_root: Path,
+    output_dir: Path,
+    *,
+    encoding: str,
+    output_encoding: str,
+    workers: int = 1,
+    stream: bool = False,
+    cache_dir: Path | None = None,
+    full_rebuild: bool = False,
+    dedupe: bool = True,
+) -> None:
+    """Regenerate the CSV snapshots from ``decoded_root``.
+
+    With ``cache_dir`` the rebuild is incremental: only batches whose files
+    changed since the last run are parsed (see ``iter_batch_encounters``).
+    With ``dedupe`` batches whose claim files are byte-identical to an earlier
+    batch (re-downloads, resubmissions) are skipped instead of merged twice.
+    """
+    claim_parser = EDIClaimParser(decoded_root, encoding=encoding, workers=workers, dedupe=dedupe)
+    if cache_dir is None:
+        if stream:
+            export_streaming(claim_parser, output_dir, output_encoding=output_encoding)
+            return
+        encounters = claim_parser.parse()
+        export_results(encounters, output_dir, output_encoding=output_encoding)
+        return
+    batch_results = iter_batch_encounters(claim_parser, decoded_root, cache_dir, full_rebuild=full_rebuild)
+    if stream:
+        export_encounter_batches(claim_parser, batch_results, output_dir, output_encoding=output_encoding)
+        return
+    encounters: Dict[str, EncounterRecord] = {}
+    for batch_encounters in batch_results:
+        claim_parser.merge_encounters(encounters, batch_encounters)
     export_results(encounters, output_dir, output_encoding=output_encoding)
 
 
@@ -217,22 +950,103 @@ def build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Only consider payloads that already have .enc files under the zip directory",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for parsing decoded batches (default: 1, 0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--parse-cache-dir",
+        default=Path("parse_cache"),
+        type=Path,
+        help="Folder holding the parsed-batch manifest and cached per-batch parse results",
+    )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Ignore the parsed-batch manifest and re-parse every decoded batch",
+    )
+    parser.add_argument(
+        "--keep-duplicates",
+        action="store_true",
+        help="Parse batches whose claim files are byte-identical to an earlier batch instead of skipping them",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the CSV rebuild through a disk-spilling sort instead of holding every encounter in memory",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running after the first pass and process every new batch folder that appears under --data-root "
+            "(each arrival re-exports all CSVs; only the new batches are parsed)"
+        ),
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=WATCH_POLL_SECONDS,
+        help=f"Seconds between --watch polls (default: {WATCH_POLL_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=WATCH_DEBOUNCE_SECONDS,
+        help=f"Seconds a new batch's payload must stay unchanged before --watch decodes it (default: {WATCH_DEBOUNCE_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--retry-delay",
+        type=float,
+        default=WATCH_RETRY_SECONDS,
+        help=(
+            f"Seconds before --watch retries a batch it could not decode, doubling per failure up to "
+            f"{WATCH_MAX_RETRY_SECONDS:g} (default: {WATCH_RETRY_SECONDS:g})"
+        ),
+    )
+    parser.add_argument(
+        "--no-pipeline",
+        action="store_true",
+        help="Decode every new batch first and parse afterwards instead of overlapping the two",
+    )
     parser.add_argument("--log-level", default="INFO", help="Logging level (default: INFO)")
     return parser
 
 
-def main() -> None:
-    parser = build_arg_parser()
-    args = parser.parse_args()
-    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO), format="%(levelname)s: %(message)s")
-    new_dirs = process_batches(
-        data_root=args.data_root,
-        sam_in=args.sam_in,
-        dec_exe=args.dec_exe,
-        decoded_root=args.decoded_root,
-        max_batches=args.max_batches or None,
-        use_enc_fallback=not args.zip_only,
-    )
+def run_update(
+    args: argparse.Namespace,
+    *,
+    doc_ids: Optional[Collection[str]] = None,
+    full_rebuild: bool = False,
+) -> None:
+    """Decode new batches (only ``doc_ids`` when given) and refresh the CSV exports."""
+    started = time.perf_counter()
+    if args.no_pipeline or full_rebuild:
+        # A full rebuild re-parses every batch anyway; nothing to overlap.
+        new_dirs = process_batches(
+            data_root=args.data_root,
+            sam_in=args.sam_in,
+            dec_exe=args.dec_exe,
+            decoded_root=args.decoded_root,
+            max_batches=args.max_batches or None,
+            use_enc_fallback=not args.zip_only,
+            doc_ids=doc_ids,
+        )
+    else:
+        new_dirs, _ = decode_and_parse_batches(
+            EDIClaimParser(args.decoded_root, encoding=args.encoding, workers=args.workers),
+            data_root=args.data_root,
+            sam_in=args.sam_in,
+            dec_exe=args.dec_exe,
+            decoded_root=args.decoded_root,
+            cache_dir=args.parse_cache_dir,
+            max_batches=args.max_batches or None,
+            use_enc_fallback=not args.zip_only,
+            doc_ids=doc_ids,
+        )
+    decoded_at = time.perf_counter()
     if new_dirs:
         logging.info("Decoded %d new batch(es)", len(new_dirs))
     else:
@@ -242,8 +1056,62 @@ def main() -> None:
         output_dir=args.output_dir,
         encoding=args.encoding,
         output_encoding=args.output_encoding,
+        workers=args.workers,
+        stream=args.stream,
+        cache_dir=args.parse_cache_dir,
+        full_rebuild=full_rebuild,
+        dedupe=not args.keep_duplicates,
+    )
+    finished = time.perf_counter()
+    logging.info(
+        "Finished in %.2fs: decode%s %.2fs, rebuild %.2fs",
+        finished - started,
+        "" if args.no_pipeline or full_rebuild else "+parse",
+        decoded_at - started,
+        finished - decoded_at,
     )
 
 
+def update_batches(args: argparse.Namespace, doc_ids: Collection[str]) -> List[str]:
+    """Decode ``doc_ids`` and refresh the exports; return the ids still not decoded.
+
+    The refresh is a full ``rebuild_csv_exports``: only the new batches are
+    parsed, but every CSV is rewritten from all cached batches.
+    """
+    run_update(args, doc_ids=doc_ids)
+    return undecoded_batches(args.decoded_root, args.data_root, doc_ids)
+
+
+def watch(args: argparse.Namespace, stop: Optional[threading.Event] = None) -> None:
+    """Run the first pass, then keep processing new batch folders until ``stop`` is set.
+
+    The watcher takes its snapshot of ``data_root`` before the first pass, so
+    folders arriving while it runs are picked up afterwards.  Folders the
+    first pass left undecoded (a failed decode or a payload still being copied)
+    are retried.  Every batch of arrivals re-exports the CSVs in full
+    (``update_batches``).
+    """
+    watcher = BatchWatcher(args.data_root, debounce=args.debounce, retry_delay=args.retry_delay)
+    try:
+        run_update(args, full_rebuild=args.full_rebuild)
+    except Exception:  # noqa: BLE001 - the watch retries what is missing
+        logging.exception("First pass failed")
+    watcher.retry(undecoded_batches(args.decoded_root, args.data_root, watcher.children))
+    watch_batches(lambda doc_ids: update_batches(args, doc_ids), watcher, poll_interval=args.poll_interval, stop=stop)
+
+
+def main() -> None:
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO), format="%(levelname)s: %(message)s")
+    if not args.watch:
+        run_update(args, full_rebuild=args.full_rebuild)
+        return
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    watch(args, stop)
+    logging.info("Stopped watching %s", args.data_root)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,102 @@
+"""Stand-in for the DDMD ``dec.exe`` decryptor, for running the batch pipeline locally.
+
+It lays out a fake DDMD installation from decoded fixture batches and then
+behaves like ``dec.exe cipherdec default`` inside it::
+
+    python scripts/stub_dec.py init /tmp/ddmd --from data/decoded_batches
+    python process_ddmd_batches.py --data-root /tmp/ddmd/data/DMD \\
+        --sam-in /tmp/ddmd/sam/in --dec-exe /tmp/ddmd/bin/dec.py \\
+        --decoded-root /tmp/ddmd/decoded_batches --output-dir /tmp/ddmd/out \\
+        --parse-cache-dir /tmp/ddmd/parse_cache
+
+``init`` zips each fixture batch folder into ``data/DMD/<id>/zip/<id>.enc``
+and copies this script to ``bin/dec.py``.  ``cipherdec default`` then
+"decrypts" every ``*.enc`` in ``sam/in`` (next to ``bin``, as in the real
+installation, or ``$DDMD_STUB_SAM_IN``) by extracting the claim files it holds
+and writes ``DecResult.txt``.  ``$DDMD_STUB_DELAY`` adds seconds of simulated
+decryption time per call.  When ``$DDMD_STUB_FAIL_ONCE`` names an existing
+file, the call deletes that file and reports failure, like a transient
+``dec.exe`` error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+
+def default_sam_in() -> Path:
+    override = os.environ.get("DDMD_STUB_SAM_IN")
+    if override:
+        return Path(override)
+    return Path(__file__).resolve().parent.parent / "sam" / "in"
+
+
+def cipherdec(sam_in: Path) -> int:
+    delay = float(os.environ.get("DDMD_STUB_DELAY", "0") or 0)
+    if delay:
+        time.sleep(delay)
+    payloads = sorted(path for path in sam_in.iterdir() if path.name.lower().endswith(".enc"))
+    status = "1" if payloads else "0"
+    fail_marker = os.environ.get("DDMD_STUB_FAIL_ONCE")
+    if fail_marker and os.path.exists(fail_marker):
+        os.unlink(fail_marker)
+        print("simulated decryption failure", file=sys.stderr)
+        payloads, status = [], "0"
+    for payload in payloads:
+        try:
+            with zipfile.ZipFile(payload) as archive:
+                for member in archive.infolist():
+                    if member.is_dir():
+                        continue
+                    target = sam_in / Path(member.filename).name
+                    with archive.open(member) as source, target.open("wb") as handle:
+                        shutil.copyfileobj(source, handle)
+        except (OSError, zipfile.BadZipFile) as exc:
+            print(f"cannot decode {payload.name}: {exc}", file=sys.stderr)
+            status = "0"
+    (sam_in / "DecResult.txt").write_text(status, encoding="cp949")
+    return 0 if status == "1" else 1
+
+
+def init(root: Path, fixtures: Path) -> int:
+    dmd = root / "data" / "DMD"
+    (root / "sam" / "in").mkdir(parents=True, exist_ok=True)
+    (root / "bin").mkdir(parents=True, exist_ok=True)
+    shutil.copy2(Path(__file__), root / "bin" / "dec.py")
+    batches = 0
+    for batch in sorted(path for path in fixtures.iterdir() if path.is_dir()):
+        files = sorted(path for path in batch.iterdir() if path.is_file())
+        if not files:
+            continue
+        zip_dir = dmd / batch.name / "zip"
+        zip_dir.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(zip_dir / f"{batch.name}.enc", "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in files:
+                archive.write(path, path.name)
+        batches += 1
+    print(f"Created {batches} stub batch(es) under {dmd}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stub DDMD dec.exe for local pipeline runs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    decode = commands.add_parser("cipherdec", help="Decode the payloads staged in sam/in")
+    decode.add_argument("profile", nargs="?", default="default")
+    setup = commands.add_parser("init", help="Create a fake DDMD tree from decoded fixture batches")
+    setup.add_argument("root", type=Path)
+    setup.add_argument("--from", dest="fixtures", type=Path, default=Path("data/decoded_batches"))
+    args = parser.parse_args()
+    if args.command == "init":
+        return init(args.root, args.fixtures)
+    return cipherdec(default_sam_in())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Regression tests for ``edi_parser``: fast paths must match the plain ones."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import importlib.util
+import io
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from edi_parser import (  # noqa: E402
+    AUTO_PATIENT_FIELDS,
+    COMPRESSION_SUFFIXES,
+    DETAIL_FIELDS,
+    DX_FIELDS,
+    ITEM_FIELDS,
+    MI_LAYOUT,
+    MI_PATIENT_FIELDS,
+    OUTPUT_ENCODING_DEFAULT,
+    ClaimParseCache,
+    EDIClaimParser,
+    RecordExtractor,
+    _format_scaled_int,
+    _parse_decimal,
+    _parse_scaled_int,
+    claim_set_digest,
+    encounter_partition,
+    export_partitioned,
+    export_results,
+    export_sqlite,
+    export_streaming,
+    file_digest,
+)
+
+SOURCE = REPO_ROOT / "data" / "test_source"
+
+LAYOUTS = (DX_FIELDS, ITEM_FIELDS, DETAIL_FIELDS, MI_PATIENT_FIELDS, AUTO_PATIENT_FIELDS)
+# KS X 1001 composed-jamo sequences: a fill character followed by three jamo,
+# one well-formed and one malformed.
+COMPOSED_JAMO = (b"\xa4\xd4\xa4\xa1\xa4\xbf\xa4\xd4", b"\xa4\xd4\xa4\xb9\xa4\xd3\xa4\xbe")
+
+
+def _random_line(rng: random.Random, encoding: str, length: int) -> bytes:
+    parts = []
+    size = 0
+    while size < length:
+        kind = rng.random()
+        if kind < 0.5:
+            part = rng.choice(b"0123456789ABC    ").to_bytes(1, "big")
+        elif kind < 0.8:
+            part = chr(rng.randint(0xAC00, 0xD7A3)).encode(encoding, "ignore")
+        elif kind < 0.9:
+            part = rng.choice(COMPOSED_JAMO)
+        else:
+            part = bytes([rng.randint(0x80, 0xFF)])
+        parts.append(part)
+        size += len(part)
+    return b"".join(parts)[:length]
+
+
+def read_tree(root: Path) -> Dict[str, bytes]:
+    """Contents of every file under ``root``, keyed by relative path."""
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in sorted(root.rglob("*")) if path.is_file()}
+
+
+class ExportTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def export(self, encounters, name: str = "out", **options) -> Dict[str, bytes]:
+        output_dir = self.tmp / name
+        export_results(encounters, output_dir, **options)
+        return read_tree(output_dir)
+
+
+class RecordExtractorTest(unittest.TestCase):
+    def assert_matches_per_field(self, encoding: str, *, force_decode_once: bool = False) -> None:
+        rng = random.Random(f"{encoding}-{force_decode_once}")
+        for fields in LAYOUTS:
+            fast = RecordExtractor(fields, encoding)
+            if force_decode_once:
+                fast.decode_once = True
+            plain = RecordExtractor(fields, encoding, decode_once=False)
+            length = max(spec.start - 1 + spec.length for spec in fields) + 4
+            for _ in range(300):
+                line = _random_line(rng, encoding, rng.randint(length // 2, length))
+                self.assertEqual(fast.extract(line), plain.extract(line), (encoding, line))
+
+    def test_decode_once_codecs_match_per_field_decode(self) -> None:
+        for encoding in ("cp949", "euc_kr", "utf-8"):
+            with self.subTest(encoding=encoding):
+                self.assert_matches_per_field(encoding)
+
+    def test_offset_map_guard_handles_composed_jamo(self) -> None:
+        # euc_kr is not a decode-once codec; forcing the mapped path anyway
+        # must still fall back wherever a line's offset map does not add up.
+        self.assert_matches_per_field("euc_kr", force_decode_once=True)
+
+
+class ClaimSetDigestTest(unittest.TestCase):
+    def claim_dir(self, files: Dict[str, bytes]) -> Path:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name, data in files.items():
+            (Path(tmp.name) / name).write_bytes(data)
+        return Path(tmp.name)
+
+    def test_file_boundaries_are_part_of_the_digest(self) -> None:
+        # Concatenating names and contents made these two folders hash alike.
+        moved = self.claim_dir({"K020.1": b"AK020.2B"})
+        kept = self.claim_dir({"K020.1": b"A", "K020.2": b"BK020.2\0missing"})
+        self.assertNotEqual(claim_set_digest(moved, MI_LAYOUT), claim_set_digest(kept, MI_LAYOUT))
+
+    def test_known_file_digests_are_reused(self) -> None:
+        claim_dir = self.claim_dir({"K020.1": b"patient", "K020.2": b"dx"})
+        known = {str(claim_dir / name): file_digest(claim_dir / name) for name in ("K020.1", "K020.2")}
+        self.assertEqual(claim_set_digest(claim_dir, MI_LAYOUT, known), claim_set_digest(claim_dir, MI_LAYOUT))
+        stale = {str(claim_dir / "K020.2"): (2, "0" * 64)}
+        self.assertNotEqual(claim_set_digest(claim_dir, MI_LAYOUT, stale), claim_set_digest(claim_dir, MI_LAYOUT))
+
+
+class StreamingExportTest(ExportTestCase):
+    def test_stream_matches_in_memory_export(self) -> None:
+        expected = self.export(EDIClaimParser(SOURCE).parse())
+        output_dir = self.tmp / "stream"
+        # A tiny buffer forces several spilled runs through the k-way merge.
+        exported, *_ = export_streaming(EDIClaimParser(SOURCE), output_dir, max_buffered_encounters=5)
+        self.assertGreater(exported, 5)
+        self.assertEqual(read_tree(output_dir), expected)
+
+
+class ParseCacheTest(ExportTestCase):
+    def test_cache_hit_matches_fresh_parse(self) -> None:
+        expected = self.export(EDIClaimParser(SOURCE).parse(), "fresh")
+        cache = ClaimParseCache(self.tmp / "cache")
+        self.assertEqual(self.export(EDIClaimParser(SOURCE, cache=cache).parse(), "miss"), expected)
+        self.assertEqual(cache.hits, 0)
+        cached = self.export(EDIClaimParser(SOURCE, cache=cache).parse(), "hit")
+        self.assertGreater(cache.hits, 0)
+        self.assertEqual(cached, expected)
+
+
+class MmapReaderTest(ExportTestCase):
+    def test_mmap_matches_buffered_reads(self) -> None:
+        expected = self.export(EDIClaimParser(SOURCE).parse(), "buffered")
+        for decode_once in (True, False):
+            with self.subTest(decode_once=decode_once):
+                parser = EDIClaimParser(SOURCE, decode_once=decode_once, use_mmap=True)
+                self.assertEqual(self.export(parser.parse(), f"mmap-{decode_once}"), expected)
+
+
+@unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+class NumpyEngineTest(ExportTestCase):
+    def test_numpy_engine_matches_python_engine(self) -> None:
+        expected = self.export(EDIClaimParser(SOURCE).parse(), "python")
+        parser = EDIClaimParser(SOURCE, engine="numpy")
+        self.assertEqual(parser.engine, "numpy")
+        self.assertEqual(self.export(parser.parse(), "numpy"), expected)
+
+
+def dict_writer_csv(rows: Iterable[Dict[str, str]]) -> bytes:
+    """CSV as the pre-schema exporter wrote it: ``DictWriter`` over the union of row keys."""
+    rows = list(rows)
+    fieldnames: List[str] = []
+    for row in rows:
+        fieldnames.extend(key for key in row if key not in fieldnames)
+    buffer = io.StringIO(newline="")
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode(OUTPUT_ENCODING_DEFAULT)
+
+
+class ColumnSchemaTest(ExportTestCase):
+    def test_declared_columns_match_dict_writer_output(self) -> None:
+        encounters = EDIClaimParser(SOURCE).parse()
+        records = [encounters[key] for key in sorted(encounters)]
+        expected = {
+            "patients.csv": dict_writer_csv(record.patient.to_row() for record in records if record.patient),
+            "encounters.csv": dict_writer_csv(record.to_row() for record in records),
+            "encounter_dx.csv": dict_writer_csv(dx.to_row() for record in records for dx in record.dx_list),
+            "encounter_items.csv": dict_writer_csv(item.to_row() for record in records for item in record.items),
+            "insurances.csv": dict_writer_csv(record.insurance.to_row() for record in records if record.insurance),
+            "invoices.csv": dict_writer_csv(record.invoice.to_row() for record in records if record.invoice),
+        }
+        self.assertEqual(self.export(encounters), expected)
+
+
+class CompressedExportTest(ExportTestCase):
+    def assert_round_trips(self, compression: str, decompress) -> None:
+        encounters = EDIClaimParser(SOURCE).parse()
+        expected = self.export(encounters, "plain")
+        suffix = COMPRESSION_SUFFIXES[compression]
+        compressed = self.export(encounters, compression, compression=compression)
+        self.assertEqual(sorted(compressed), sorted(name + suffix for name in expected))
+        for name, data in expected.items():
+            self.assertEqual(decompress(compressed[name + suffix]), data, name)
+
+    def test_gzip_round_trips(self) -> None:
+        self.assert_round_trips("gzip", gzip.decompress)
+
+    @unittest.skipUnless(importlib.util.find_spec("zstandard"), "zstandard is not installed")
+    def test_zstd_round_trips(self) -> None:
+        import zstandard
+
+        # Streamed frames carry no content size, so decompress as a stream.
+        self.assert_round_trips("zstd", lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data))
+
+
+class PartitionedExportTest(ExportTestCase):
+    def file_times(self, root: Path) -> Dict[str, int]:
+        return {path.relative_to(root).as_posix(): path.stat().st_mtime_ns for path in root.rglob("*.csv")}
+
+    def test_rerun_skips_unchanged_partitions(self) -> None:
+        encounters = EDIClaimParser(SOURCE).parse()
+        output_dir = self.tmp / "partitioned"
+        self.assertTrue(export_partitioned(encounters, output_dir))
+        written = self.file_times(output_dir)
+        partitions = {"/".join(encounter_partition(record)) for record in encounters.values()}
+        self.assertGreater(len(partitions), 1)
+
+        self.assertEqual(export_partitioned(encounters, output_dir), [])
+        self.assertEqual(self.file_times(output_dir), written)
+
+        key, record = next((key, record) for key, record in sorted(encounters.items()) if len(record.items) > 1)
+        del record.items[1:]
+        changed = "/".join(encounter_partition(record))
+        stats = export_partitioned(encounters, output_dir)
+        self.assertTrue(stats)
+        self.assertEqual({stat.name.rsplit("/", 1)[0] for stat in stats}, {changed})
+        rewritten = self.file_times(output_dir)
+        for name, mtime_ns in written.items():
+            if not name.startswith(f"{changed}/"):
+                self.assertEqual(rewritten[name], mtime_ns, name)
+        in_partition = {key: value for key, value in encounters.items() if "/".join(encounter_partition(value)) == changed}
+        self.assertEqual(read_tree(output_dir / changed), self.export(in_partition))
+
+
+class SQLiteExportTest(ExportTestCase):
+    def table_counts(self, db_path: Path) -> Dict[str, int]:
+        with sqlite3.connect(str(db_path)) as connection:
+            names = [row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+            return {name: connection.execute(f'SELECT count(*) FROM "{name}"').fetchone()[0] for name in names}
+
+    def test_rerun_is_idempotent(self) -> None:
+        encounters = EDIClaimParser(SOURCE).parse()
+        csv_rows = {
+            Path(name).stem: data.decode(OUTPUT_ENCODING_DEFAULT).count("\r\n") - 1
+            for name, data in self.export(encounters).items()
+        }
+        db_path = self.tmp / "claims.sqlite3"
+        first = export_sqlite(encounters, db_path)
+        self.assertEqual(self.table_counts(db_path), csv_rows)
+        second = export_sqlite(encounters, db_path)
+        self.assertEqual(self.table_counts(db_path), csv_rows)
+        self.assertEqual([(table.name, table.rows) for table in second], [(table.name, table.rows) for table in first])
+
+    def test_shrunk_encounter_drops_stale_rows(self) -> None:
+        encounters = EDIClaimParser(SOURCE).parse()
+        db_path = self.tmp / "claims.sqlite3"
+        export_sqlite(encounters, db_path)
+        before = self.table_counts(db_path)
+        key, record = next((key, record) for key, record in sorted(encounters.items()) if len(record.items) > 1)
+        removed_items = len(record.items) - 1
+        removed_dx = len(record.dx_list)
+        del record.items[1:]
+        record.dx_list.clear()
+        export_sqlite({key: record}, db_path)
+        after = self.table_counts(db_path)
+        self.assertEqual(after["encounter_items"], before["encounter_items"] - removed_items)
+        self.assertEqual(after["encounter_dx"], before["encounter_dx"] - removed_dx)
+        self.assertEqual(after["encounters"], before["encounters"])
+
+
+class ZipSourceTest(ExportTestCase):
+    def write_zip(self, archive: Path, root: Path) -> Path:
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as handle:
+            for path in sorted(root.rglob("*")):
+                if path.is_file():
+                    handle.write(path, path.relative_to(root).as_posix())
+        return archive
+
+    def test_zip_matches_extracted_tree(self) -> None:
+        expected = self.export(EDIClaimParser(SOURCE).parse(), "tree")
+        archive = self.write_zip(self.tmp / "test_source.zip", SOURCE)
+        self.assertEqual(self.export(EDIClaimParser(archive).parse(), "archive"), expected)
+
+    def test_zip_inside_source_tree(self) -> None:
+        expected = self.export(EDIClaimParser(SOURCE).parse(), "tree")
+        mixed = self.tmp / "source"
+        shutil.copytree(SOURCE / "mi", mixed / "mi")
+        self.write_zip(mixed / "ta.zip", SOURCE / "ta")
+        self.assertEqual(self.export(EDIClaimParser(mixed).parse(), "mixed"), expected)
+
+
+class ScaledIntTest(unittest.TestCase):
+    @staticmethod
+    def decimal_cents(value: str) -> str:
+        parsed = _parse_decimal(value, 2)
+        return "" if parsed is None else format(parsed, ".2f")
+
+    def test_integer_cents_match_decimal_path(self) -> None:
+        rng = random.Random("cents")
+        values = ["", "   ", "0", "000012345", " 12 ", "-150", "+7", "12.5", "1.005", "1e3", "bad"]
+        for _ in range(2000):
+            digits = "".join(rng.choice("0123456789") for _ in range(rng.randint(1, 15)))
+            sign = rng.choice(("", "-", "+", " "))
+            if sign == "-" and not digits.strip("0"):
+                continue  # signed zero, see below
+            values.append(sign + digits)
+        for value in values:
+            self.assertEqual(_format_scaled_int(_parse_scaled_int(value, 2)), self.decimal_cents(value), value)
+
+    def test_signed_zero_and_nan_are_normalised(self) -> None:
+        # Known differences from the Decimal path, which printed "-0.00" and "NaN".
+        self.assertEqual(_format_scaled_int(_parse_scaled_int("-0", 2)), "0.00")
+        self.assertEqual(_format_scaled_int(_parse_scaled_int("NaN", 2)), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
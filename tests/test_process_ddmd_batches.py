@@ -0,0 +1,164 @@
+"""``--watch`` against a temporary DDMD tree decoded by ``scripts/stub_dec.py``."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import edi_parser  # noqa: E402
+from edi_parser import EDIClaimParser  # noqa: E402
+from process_ddmd_batches import BatchWatcher, build_arg_parser, iter_batch_encounters, watch  # noqa: E402
+
+FIXTURES = REPO_ROOT / "data" / "decoded_batches"
+FIRST = "DMDAY4XcwPp"
+LATE = "DMDAYkpFgGO"
+
+
+class BatchCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.decoded = self.root / "decoded_batches"
+        for doc_id in (FIRST, LATE):
+            shutil.copytree(FIXTURES / doc_id, self.decoded / doc_id)
+        self.cache_dir = self.root / "parse_cache"
+
+    def run_batches(self, *, full_rebuild: bool = False, dedupe: bool = False) -> int:
+        claim_parser = EDIClaimParser(self.decoded, dedupe=dedupe)
+        results = iter_batch_encounters(claim_parser, self.decoded, self.cache_dir, full_rebuild=full_rebuild)
+        return sum(len(encounters) for encounters in results)
+
+    def test_full_rebuild_removes_stale_results(self) -> None:
+        self.run_batches()
+        self.assertEqual(sorted(path.name for path in self.cache_dir.glob("*.pickle")), [f"{FIRST}.pickle", f"{LATE}.pickle"])
+        shutil.rmtree(self.decoded / LATE)
+        self.run_batches(full_rebuild=True)
+        self.assertEqual([path.name for path in self.cache_dir.glob("*.pickle")], [f"{FIRST}.pickle"])
+
+    def test_dedupe_uses_the_manifest_hashes(self) -> None:
+        shutil.copytree(FIXTURES / FIRST, self.decoded / "DMDAZzCopy")
+        with mock.patch.object(edi_parser, "file_digest", wraps=edi_parser.file_digest) as hashed:
+            encounters = self.run_batches(dedupe=True)
+            hashed.assert_not_called()
+        self.assertEqual(encounters, sum(len(EDIClaimParser(FIXTURES / doc_id).parse()) for doc_id in (FIRST, LATE)))
+        # The copy has no claim folders of its own but keeps its fingerprints,
+        # so an unchanged tree is verified without reading any file.
+        with mock.patch("process_ddmd_batches._hash_file") as rehashed:
+            self.assertEqual(self.run_batches(dedupe=True), encounters)
+            rehashed.assert_not_called()
+
+
+class BatchWatcherTest(unittest.TestCase):
+    def test_folder_created_within_the_same_mtime_is_seen(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_root = Path(tmp)
+            watcher = BatchWatcher(data_root, debounce=0)
+            mtime_ns = data_root.stat().st_mtime_ns
+            (data_root / FIRST / "zip").mkdir(parents=True)
+            (data_root / FIRST / "zip" / "payload.zip").write_bytes(b"payload")
+            # As if the folder had arrived within the previous listing's timestamp tick.
+            os.utime(data_root, ns=(mtime_ns, mtime_ns))
+            self.assertEqual(watcher.poll(1.0), [])
+            self.assertEqual(watcher.poll(2.0), [FIRST])
+
+
+class WatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        fixtures = self.root / "fixtures"
+        for doc_id in (FIRST, LATE):
+            shutil.copytree(FIXTURES / doc_id, fixtures / doc_id)
+        self.ddmd = self.root / "ddmd"
+        subprocess.run(
+            [sys.executable, str(REPO_ROOT / "scripts" / "stub_dec.py"), "init", str(self.ddmd), "--from", str(fixtures)],
+            check=True,
+            capture_output=True,
+        )
+        self.dmd = self.ddmd / "data" / "DMD"
+        self.held = self.root / "held"
+        self.held.mkdir()
+        shutil.move(str(self.dmd / LATE), str(self.held / LATE))
+        self.expected_encounters = len(EDIClaimParser(fixtures).parse())
+        self.args = build_arg_parser().parse_args(
+            [
+                "--data-root", str(self.dmd),
+                "--sam-in", str(self.ddmd / "sam" / "in"),
+                "--dec-exe", str(self.ddmd / "bin" / "dec.py"),
+                "--decoded-root", str(self.root / "decoded_batches"),
+                "--output-dir", str(self.root / "out"),
+                "--parse-cache-dir", str(self.root / "parse_cache"),
+                "--poll-interval", "0.1",
+                "--debounce", "0.3",
+                "--retry-delay", "0.5",
+            ]
+        )
+
+    def start_watch(self) -> None:
+        stop = threading.Event()
+        thread = threading.Thread(target=watch, args=(self.args, stop), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 30)
+        self.addCleanup(stop.set)
+
+    def decoded(self, doc_id: str) -> bool:
+        return (self.root / "decoded_batches" / doc_id / "K020.1").exists()
+
+    def exported_encounters(self) -> int:
+        path = self.root / "out" / "encounters.csv"
+        if not path.exists():
+            return 0
+        return len(path.read_text(encoding="cp949").splitlines()) - 1
+
+    def wait_for(self, condition, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("timed out waiting for the watch")
+            time.sleep(0.05)
+
+    def test_batch_arriving_during_first_pass_is_decoded(self) -> None:
+        with mock.patch.dict(os.environ, {"DDMD_STUB_DELAY": "1"}):
+            self.start_watch()
+            time.sleep(0.3)
+            shutil.move(str(self.held / LATE), str(self.dmd / LATE))
+            self.wait_for(lambda: self.decoded(FIRST) and self.decoded(LATE))
+            self.wait_for(lambda: self.exported_encounters() == self.expected_encounters)
+
+    def test_failed_decodes_are_retried(self) -> None:
+        marker = self.root / "fail-once"
+        marker.touch()
+        payload = next((self.held / LATE / "zip").iterdir())
+        with mock.patch.dict(os.environ, {"DDMD_STUB_FAIL_ONCE": str(marker)}), self.assertLogs(level="WARNING") as logs:
+            # The first pass hits the simulated dec.exe failure.
+            self.start_watch()
+            self.wait_for(lambda: self.decoded(FIRST))
+            self.assertFalse(marker.exists())
+            # A half-copied payload fails to decode until the copy completes.
+            (self.dmd / LATE / "zip").mkdir(parents=True)
+            data = payload.read_bytes()
+            (self.dmd / LATE / "zip" / payload.name).write_bytes(data[: len(data) // 2])
+            self.wait_for(lambda: any(f"{LATE} not decoded" in line for line in logs.output))
+            self.assertFalse(self.decoded(LATE))
+            staged = self.root / payload.name
+            staged.write_bytes(data)
+            os.replace(staged, self.dmd / LATE / "zip" / payload.name)
+            self.wait_for(lambda: self.decoded(LATE))
+            self.wait_for(lambda: self.exported_encounters() == self.expected_encounters)
+
+
+if __name__ == "__main__":
+    unittest.main()